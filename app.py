@@ -24,6 +24,10 @@ class MultiLoader(sgtk.platform.Application):
         """
         Called as the application is being initialized
         """
+        # callable receiving the progress reported by the actions hook
+        # while the loader runs an action, see report_action_progress()
+        self._action_progress_handler = None
+
         # We won't be able to do anything if there's no UI. The import
         # of our tk-multi-loader module below required some Qt components,
         # and will likely blow up.
@@ -55,6 +59,73 @@ class MultiLoader(sgtk.platform.Application):
         """
         return True
 
+    def report_action_progress(self, processed, total, item_name=None):
+        """
+        Reports the progress of the loader action currently running. This is meant
+        to be called from the ``execute_multiple_actions`` method of the actions hook
+        so that the loader can display which item is being loaded, e.g.::
+
+            self.parent.report_action_progress(index, len(actions))
+
+        Calling this method when no action is running is harmless.
+
+        If the user cancelled the action, this raises an exception to stop the hook.
+        Hooks should let it propagate and restore the scene state they changed in
+        ``finally`` blocks, so that the items already loaded are kept.
+
+        :param int processed: Number of the actions passed to the hook which have been
+                              processed so far.
+        :param int total: Number of actions passed to the hook.
+        :param str item_name: Optional name of the item being loaded. Defaults to the
+                              name of the publish of the next action.
+        """
+        if self._action_progress_handler:
+            self._action_progress_handler(processed, total, item_name)
+
+    def set_action_progress_handler(self, handler):
+        """
+        Sets the callable receiving the progress reported through
+        :meth:`report_action_progress` while an action runs.
+
+        :param handler: Callable taking the same arguments as
+                        :meth:`report_action_progress`, or None to stop
+                        routing progress.
+        """
+        self._action_progress_handler = handler
+
+    def load_latest_publishes(
+        self, entity, publish_types=None, action_name=None, filters=None
+    ):
+        """
+        Loads the latest publishes linked to an entity without any UI, e.g. from
+        farm or build scripts. This works in batch engines as well.
+
+        Publishes go through the same filters and hooks as in the loader UI and are
+        loaded by the ``execute_multiple_actions`` method of the actions hook.
+        This is a generator, publishes are loaded as results are consumed::
+
+            loader_app = engine.apps["tk-multi-loader2"]
+            for (sg_publish_data, error) in loader_app.load_latest_publishes(
+                {"type": "Shot", "id": 1234}, ["Alembic Cache"], "reference"
+            ):
+                if error:
+                    print("Could not load %s: %s" % (sg_publish_data["code"], error))
+
+        :param dict entity: Shotgun entity dictionary with keys type and id.
+        :param publish_types: Optional list of publish type names to load.
+                              Defaults to all publish types.
+        :param str action_name: Name of the action to run, e.g. "reference".
+                                Defaults to the first action configured for each
+                                publish type in the action_mappings setting.
+        :param filters: Optional list of additional Shotgun filters for the publishes.
+        :returns: Generator of (sg_publish_data, error) tuples, where error is None
+                  if the publish was loaded or the reason why it wasn't.
+        """
+        tk_multi_loader = self.import_module("tk_multi_loader")
+        return tk_multi_loader.batch_load.load_latest_publishes(
+            self, entity, publish_types, action_name, filters
+        )
+
     def open_publish(self, title="Open Publish", action="Open", publish_types=[]):
         """
         Display the loader UI in an open-file style where a publish can be selected and the
@@ -17,9 +17,16 @@ import MaxPlus
 
 HookBaseClass = sgtk.get_hook_baseclass()
 
+# Actions which can be run on several publishes with a single MaxScript
+BATCHED_ACTIONS = ("merge", "xref_scene", "texture_node")
+
 
 class MaxActions(HookBaseClass):
 
+    # list of (MaxScript statement, sg_publish_data) tuples of the actions whose
+    # MaxScript is deferred while a group of actions runs, None otherwise.
+    _deferred_statements = None
+
     ##############################################################################################################
     # public interface - to be overridden by deriving classes
 
@@ -113,6 +120,7 @@ class MaxActions(HookBaseClass):
             name: Name of the action to execute
             sg_publish_data: Publish information coming from Shotgun
             params: Parameters passed down from the generate_actions hook.
+            path: Optional path of the publish, if the loader already resolved it.
 
         .. note::
             This is the default entry point for the hook. It reuses the ``execute_action``
@@ -125,11 +133,54 @@ class MaxActions(HookBaseClass):
 
         :param list actions: Action dictionaries.
         """
+        app = self.parent
+
+        # group the consecutive actions of a type which can be run with a single
+        # MaxScript, so that Max only pays for the dialog handling and the scene
+        # redraw once per group rather than once per publish, while the actions
+        # still run in the order they were given.
+        runs = []
         for single_action in actions:
             name = single_action["name"]
-            sg_publish_data = single_action["sg_publish_data"]
-            params = single_action["params"]
-            self.execute_action(name, params, sg_publish_data)
+            path = None
+            if name in BATCHED_ACTIONS:
+                # see execute_action about the conversion to unicode
+                path = single_action.get("path") or self.get_publish_path(
+                    single_action["sg_publish_data"]
+                )
+                path = path.decode("utf-8")
+                # Alembic caches are always imported on their own
+                if path.lower().endswith(".abc"):
+                    path = None
+            batch_name = name if path else None
+            if batch_name and runs and runs[-1][0] == batch_name:
+                runs[-1][1].append((path, single_action))
+            else:
+                runs.append((batch_name, [(path, single_action)]))
+
+        processed = 0
+        error_count = 0
+        for (batch_name, items) in runs:
+            if batch_name and len(items) > 1:
+                errors = self._execute_actions_batched(
+                    batch_name, [a for (_, a) in items], processed, len(actions)
+                )
+                error_count += len(errors)
+            else:
+                # let the loader display which item is being loaded
+                app.report_action_progress(processed, len(actions))
+                (_, single_action) = items[0]
+                name = single_action["name"]
+                sg_publish_data = single_action["sg_publish_data"]
+                params = single_action["params"]
+                self.execute_action(name, params, sg_publish_data)
+            processed += len(items)
+
+        if error_count:
+            raise Exception(
+                "%d of %d items could not be loaded, see the log for details."
+                % (error_count, len(actions))
+            )
 
     def execute_action(self, name, params, sg_publish_data):
         """
@@ -171,29 +222,120 @@ class MaxActions(HookBaseClass):
     ##############################################################################################################
     # helper methods which can be subclassed in custom hooks to fine tune the behaviour of things
 
-    def _import_alembic(self, path):
+    def _execute_actions_batched(self, name, actions, processed, total):
         """
-        Imports the given Alembic cache into the scene.
+        Runs actions of the same type with a single MaxScript, with the scene
+        redraw disabled while the script runs.
+
+        The actions run through ``execute_action``, but the helper methods only
+        record their MaxScript statement, see ``_run_max_script``. The
+        statements are then evaluated at once.
+
+        Errors are caught and logged per file, by the script or while the actions
+        run, so a file failing to load doesn't prevent the other files from loading.
+
+        :param name: Name of the actions, one of BATCHED_ACTIONS.
+        :param actions: Action dictionaries.
+        :param processed: Number of actions processed before these ones.
+        :param total: Total number of actions.
+        :returns: List of (sg_publish_data, error message) tuples for the files
+                  which couldn't be loaded.
+        """
+        app = self.parent
+        app.log_debug("Running action %s on %d files in batch." % (name, len(actions)))
+
+        errors = []
+        self._deferred_statements = []
+        try:
+            for (index, single_action) in enumerate(actions):
+                # let the loader display which item is being loaded
+                app.report_action_progress(processed + index, total)
+                sg_publish_data = single_action["sg_publish_data"]
+                try:
+                    self.execute_action(
+                        single_action["name"], single_action["params"], sg_publish_data
+                    )
+                except Exception as error:
+                    errors.append((sg_publish_data, str(error)))
+        finally:
+            # run the statements recorded so far, even if the loader stopped
+            # the actions midway
+            deferred_statements = self._deferred_statements
+            self._deferred_statements = None
+            if deferred_statements:
+                errors.extend(self._run_max_statements(name, deferred_statements))
+            for (sg_publish_data, error) in errors:
+                app.log_error(
+                    "Unable to load '%s': %s" % (sg_publish_data.get("code"), error)
+                )
 
-        :param path: Path to .abc file.
+        return errors
+
+    def _run_max_statements(self, name, deferred_statements):
         """
-        # Note that this is assuming Z-Up data. That means this will
-        # work properly for .abc files exported from 3ds Max, but
-        # will likely NOT be correct when importing .abc files from
-        # DCC applications that operate in a Y-Up coordinate system.
-        # The fix for that would be to set AlembicImport.ZUp to false
-        # via maxscript prior to running the importFile.
+        Evaluates the MaxScript statements recorded for a group of actions at
+        once, see BATCH_MAXSCRIPT.
+
+        :param name: Name of the actions, one of BATCHED_ACTIONS.
+        :param deferred_statements: List of (MaxScript statement, sg_publish_data)
+                                    tuples.
+        :returns: List of (sg_publish_data, error message) tuples for the
+                  statements which failed.
+        """
+        statements = [
+            BATCH_ITEM_MAXSCRIPT % {"statement": statement, "index": index}
+            for (index, (statement, _)) in enumerate(deferred_statements)
+        ]
+
+        preamble = ""
+        if name == "texture_node":
+            # opens material editor, once for all textures
+            preamble = OPEN_MATERIAL_EDITOR_MAXSCRIPT
+
+        max_script = BATCH_MAXSCRIPT % {
+            "preamble": preamble,
+            "statements": "\n".join(statements),
+        }
+
+        results = []
         self.parent.engine.safe_dialog_exec(
-            lambda: MaxPlus.Core.EvalMAXScript('importFile @"%s" #noPrompt' % path)
+            lambda: results.append(MaxPlus.Core.EvalMAXScript(max_script))
         )
 
-    def _merge(self, path, sg_publish_data):
+        # the script returns the index and the message of each error
+        errors = []
+        result = results[0].Get() if results else ""
+        for error in (result or "").split(BATCH_ERROR_SEPARATOR):
+            if error:
+                (index, message) = error.split(":", 1)
+                (_, sg_publish_data) = deferred_statements[int(index)]
+                errors.append((sg_publish_data, message.strip()))
+
+        return errors
+
+    def _run_max_script(self, max_script, sg_publish_data):
         """
-        Merge contents of the given file into the scene.
+        Evaluates the MaxScript of an action, or records it when a group of
+        actions runs with a single MaxScript.
 
-        :param path: Path to file.
+        :param max_script: MaxScript statement.
         :param sg_publish_data: Shotgun data dictionary with all the standard publish fields.
         """
+        if self._deferred_statements is not None:
+            self._deferred_statements.append((max_script, sg_publish_data))
+            return
+
+        self.parent.engine.safe_dialog_exec(
+            lambda: MaxPlus.Core.EvalMAXScript(max_script)
+        )
+
+    def _check_max_file(self, path):
+        """
+        Checks that a file exists on disk and is a Max scene.
+
+        :param path: Path to file.
+        :raises Exception: If the file can't be merged or referenced.
+        """
         if not os.path.exists(path):
             raise Exception("File not found on disk - '%s'" % path)
 
@@ -206,42 +348,51 @@ class MaxActions(HookBaseClass):
                 "Supported file extensions are: %s" % (path, supported_file_exts)
             )
 
-        app = self.parent
+    def _import_alembic(self, path):
+        """
+        Imports the given Alembic cache into the scene.
 
-        # Note: MaxPlus.FileManager.Merge() is not equivalent as it opens a dialog.
-        app.engine.safe_dialog_exec(
+        :param path: Path to .abc file.
+        """
+        # Note that this is assuming Z-Up data. That means this will
+        # work properly for .abc files exported from 3ds Max, but
+        # will likely NOT be correct when importing .abc files from
+        # DCC applications that operate in a Y-Up coordinate system.
+        # The fix for that would be to set AlembicImport.ZUp to false
+        # via maxscript prior to running the importFile.
+        self.parent.engine.safe_dialog_exec(
             lambda: MaxPlus.Core.EvalMAXScript(
-                'mergeMAXFile("' + path.replace("\\", "/") + '")'
+                "importFile %s #noPrompt" % _to_maxscript_string(path)
             )
         )
 
-    def _xref_scene(self, path, sg_publish_data):
+    def _merge(self, path, sg_publish_data):
         """
-        Insert a reference to the given external file into the current scene.
+        Merge contents of the given file into the scene.
 
         :param path: Path to file.
         :param sg_publish_data: Shotgun data dictionary with all the standard publish fields.
         """
+        self._check_max_file(path)
 
-        if not os.path.exists(path):
-            raise Exception("File not found on disk - '%s'" % path)
+        # Note: MaxPlus.FileManager.Merge() is not equivalent as it opens a dialog.
+        self._run_max_script(
+            "mergeMAXFile(%s)" % _to_maxscript_string(path), sg_publish_data
+        )
 
-        (_, ext) = os.path.splitext(path)
+    def _xref_scene(self, path, sg_publish_data):
+        """
+        Insert a reference to the given external file into the current scene.
 
-        supported_file_exts = [".max"]
-        if ext.lower() not in supported_file_exts:
-            raise Exception(
-                "Unsupported file extension for '%s'. "
-                "Supported file extensions are: %s" % (path, supported_file_exts)
-            )
+        :param path: Path to file.
+        :param sg_publish_data: Shotgun data dictionary with all the standard publish fields.
+        """
 
-        app = self.parent
+        self._check_max_file(path)
 
         # No direct equivalent found in MaxPlus. Would potentially need to get scene root node (INode) and use addNewXRef on that otherwise.
-        app.engine.safe_dialog_exec(
-            lambda: MaxPlus.Core.EvalMAXScript(
-                'xrefs.addNewXRefFile("' + path.replace("\\", "/") + '")'
-            )
+        self._run_max_script(
+            "xrefs.addNewXRefFile(%s)" % _to_maxscript_string(path), sg_publish_data
         )
 
     def _create_texture_node(self, path, sg_publish_data):
@@ -253,24 +404,96 @@ class MaxActions(HookBaseClass):
         :returns:                The newly created file node
         """
 
-        max_script = CREATE_TEXTURE_NODE_MAXSCRIPT % (path,)
+        if self._deferred_statements is not None:
+            # spread the materials over the slots of the compact material editor,
+            # the material editor is opened once for the whole group
+            slot = (len(self._deferred_statements) % MATERIAL_EDITOR_SLOTS) + 1
+            self._run_max_script(
+                TEXTURE_NODE_MAXSCRIPT
+                % {"path": _to_maxscript_string(path), "slot": slot},
+                sg_publish_data,
+            )
+            return
+
+        max_script = CREATE_TEXTURE_NODE_MAXSCRIPT % {
+            "path": _to_maxscript_string(path),
+            "slot": 1,
+        }
         MaxPlus.Core.EvalMAXScript(max_script)
 
 
-# This maxscript creates a bitmap texture node and attaches it to a standard
-# material.
-CREATE_TEXTURE_NODE_MAXSCRIPT = """
---opens material editor
-actionMan.executeAction 0 "50048"
+def _to_maxscript_string(path):
+    """
+    Returns a path as a MaxScript string literal.
+
+    :param path: Path to file.
+    :returns: Quoted MaxScript string, with forward slashes and escaped quotes.
+    """
+    return '"%s"' % path.replace("\\", "/").replace('"', '\\"')
+
 
---creates a bitmap texture node
-bmap = Bitmaptexture fileName:"%s"
-bmap.alphaSource = 2
+# This maxscript opens the material editor.
+OPEN_MATERIAL_EDITOR_MAXSCRIPT = 'actionMan.executeAction 0 "50048"'
 
---creates a standard max material node
-mat = Standardmaterial ()
-mat.diffuseMap = bmap
+# This maxscript creates a bitmap texture node and attaches it to a standard
+# material, in the given slot of the compact material editor.
+TEXTURE_NODE_MAXSCRIPT = """
+        --creates a bitmap texture node
+        local bmap = Bitmaptexture fileName:%(path)s
+        bmap.alphaSource = 2
+
+        --creates a standard max material node
+        local mat = Standardmaterial ()
+        mat.diffuseMap = bmap
+
+        --assigns it a slot of the compact material editor
+        meditMaterials[%(slot)d] = mat
+"""
+
+# This maxscript opens the material editor and creates a texture node, see
+# TEXTURE_NODE_MAXSCRIPT.
+CREATE_TEXTURE_NODE_MAXSCRIPT = """
+(
+    %s
+    %s
+)
+""" % (
+    OPEN_MATERIAL_EDITOR_MAXSCRIPT,
+    TEXTURE_NODE_MAXSCRIPT,
+)
+
+# Number of material slots of the compact material editor
+MATERIAL_EDITOR_SLOTS = 24
+
+# Separates the errors returned by BATCH_MAXSCRIPT
+BATCH_ERROR_SEPARATOR = "<|sgtk|>"
+
+# This maxscript runs a list of statements with the scene redraw disabled, and
+# returns the index and message of the statements which failed, separated by
+# BATCH_ERROR_SEPARATOR.
+BATCH_MAXSCRIPT = """
+(
+    local errors = ""
+    disableSceneRedraw()
+    %(preamble)s
+    %(statements)s
+    enableSceneRedraw()
+    redrawViews()
+    errors
+)
+"""
 
---assigns it slot of the compact material editor
-meditMaterials[1] = mat
+# This maxscript wraps one of the statements of BATCH_MAXSCRIPT.
+BATCH_ITEM_MAXSCRIPT = (
+    """
+    try
+    (
+        %%(statement)s
+    )
+    catch
+    (
+        errors += "%%(index)d:" + (getCurrentException() as string) + "%s"
+    )
 """
+    % BATCH_ERROR_SEPARATOR
+)
@@ -15,6 +15,7 @@ Hook that loads defines all the available actions, broken down by publish type.
 import collections
 import os
 import re
+from multiprocessing.pool import ThreadPool
 
 import sgtk
 from sgtk import TankError
@@ -35,6 +36,13 @@ CLIP_ACTION = "load_clip"
 SHOT_LOAD_ACTION = "load_batch"
 SHOT_CREATE_ACTION = "create_batch"
 
+# Number of threads checking if the published files of a Shot exist on disk
+EXISTS_CHECK_THREADS = 8
+
+# Number of the most recent Versions of a Shot looked at to find a frame range
+# which can be parsed
+FRAME_RANGE_VERSIONS_LIMIT = 5
+
 
 class FlameActionError(Exception):
     pass
@@ -160,7 +168,9 @@ class FlameActions(HookBaseClass):
 
         :param list actions: Action dictionaries.
         """
-        for single_action in actions:
+        for (index, single_action) in enumerate(actions):
+            # let the loader display which item is being loaded
+            self.parent.report_action_progress(index, len(actions))
             name = single_action["name"]
             sg_publish_data = single_action["sg_publish_data"]
             params = single_action["params"]
@@ -183,6 +193,10 @@ class FlameActions(HookBaseClass):
             "Parameters: %s. Publish Data: %s" % (name, params, sg_publish_data)
         )
 
+        # Published files information is only reused within a single action, so
+        # that changes made in Shotgun in between actions are picked up.
+        self._published_files_info = {}
+
         try:
             if name == CLIP_ACTION:
                 self._import_clip(sg_publish_data)
@@ -707,12 +721,18 @@ class FlameActions(HookBaseClass):
         app.log_debug(
             "Getting path and frame range information from '%s'" % sg_published_files
         )
-        # First loop populates the list of valid published files in the shot
-        published_files = []
 
-        for published_file in sg_published_files:
-            # Gets paths to published files
-            sg_filters = [["id", "is", published_file["id"]]]
+        # The information is memoized for the duration of the action, since
+        # different steps of an action may need the published files of a Shot.
+        published_file_ids = tuple(f["id"] for f in sg_published_files)
+        published_files_info = getattr(self, "_published_files_info", {})
+        if published_file_ids in published_files_info:
+            return published_files_info[published_file_ids]
+
+        # Gets all the published files in one go
+        files_info = {}
+        if published_file_ids:
+            sg_filters = [["id", "in", list(published_file_ids)]]
             sg_fields = [
                 "path",
                 "published_file_type",
@@ -724,9 +744,18 @@ class FlameActions(HookBaseClass):
             ]
             sg_type = "PublishedFile"
 
-            file_info = self.parent.shotgun.find_one(
+            for file_info in self.parent.shotgun.find(
                 sg_type, filters=sg_filters, fields=sg_fields
-            )
+            ):
+                files_info[file_info["id"]] = file_info
+
+        # Gets paths to published files, in the order they are linked to the Shot
+        paths = []
+        for published_file_id in published_file_ids:
+            file_info = files_info.get(published_file_id)
+            if file_info is None:
+                # The published file was retired in the meantime
+                continue
 
             try:
                 # Get the local path of the published file
@@ -736,8 +765,18 @@ class FlameActions(HookBaseClass):
                 self.parent.log_warning(str(error))
                 continue
 
+            paths.append((path, file_info))
+
+        # Checks which paths exist concurrently, as every check may be a round
+        # trip to the storage
+        paths_exist = self._exists_multiple([path for (path, _) in paths])
+
+        # Populates the list of valid published files in the shot
+        published_files = []
+
+        for ((path, file_info), path_exists) in zip(paths, paths_exist):
             # Eliminates PublishedFiles with an invalid local path
-            if path and self._exists(path):
+            if path and path_exists:
                 published_files.append({"path": path, "info": file_info})
             elif "%" in path:
                 path_info = self._handle_frame_range(path)
@@ -757,6 +796,9 @@ class FlameActions(HookBaseClass):
 
         app.log_debug("PublishedFile info found: %s" % published_files)
 
+        published_files_info[published_file_ids] = published_files
+        self._published_files_info = published_files_info
+
         return published_files
 
     def _get_batch_path_from_published_files(self, sg_info):
@@ -830,37 +872,39 @@ class FlameActions(HookBaseClass):
         last_frame = None
 
         if "sg_versions" in sg_info and len(sg_info["sg_versions"]) > 0:
-            latest_update = None
-
-            for version in sg_info["sg_versions"]:
-                filters = [["id", "is", version["id"]]]
-                fields = ["frame_range", "updated_at"]
-                entity_type = "Version"
-
-                version_data = self.parent.shotgun.find_one(
-                    entity_type, filters=filters, fields=fields
-                )
+            # Only the most recent version with a valid frame range is of
+            # interest, so only fetch the few most recent ones with a frame range
+            filters = [
+                ["id", "in", [version["id"] for version in sg_info["sg_versions"]]],
+                ["frame_range", "is_not", None],
+            ]
+            fields = ["frame_range", "updated_at"]
+            order = [{"field_name": "updated_at", "direction": "desc"}]
+            entity_type = "Version"
+
+            versions_data = self.parent.shotgun.find(
+                entity_type,
+                filters=filters,
+                fields=fields,
+                order=order,
+                limit=FRAME_RANGE_VERSIONS_LIMIT,
+            )
 
+            for version_data in versions_data:
                 # Checks that we have the necessary info to proceed.
                 if not all(f in version_data for f in fields):
                     raise FlameActionError(
                         "Cannot extract frame range for \n {}".format(sg_info)
                     )
 
-                # Only if the frame_range is defined
-                if version_data["frame_range"] is not None:
-                    try:
-                        # The current sg_version is more recent that the one we use
-                        if (
-                            latest_update is None
-                            or latest_update < version_data["updated_at"]
-                        ):
-                            latest_update = version_data["updated_at"]
-                            first_frame, last_frame = list(
-                                map(int, version_data["frame_range"].split("-"))
-                            )
-                    except (AttributeError, ValueError):
-                        pass
+                try:
+                    first_frame, last_frame = list(
+                        map(int, version_data["frame_range"].split("-"))
+                    )
+                except (AttributeError, ValueError):
+                    # Malformed frame range, fall back on an older version
+                    continue
+                break
 
         app.log_debug(
             "Found first frame = %s and last frame = %s" % (first_frame, last_frame)
@@ -907,8 +951,7 @@ class FlameActions(HookBaseClass):
 
         return latest_clips.values()
 
-    @staticmethod
-    def _handle_frame_range(path):
+    def _handle_frame_range(self, path):
         """
         Takes a path and inserts formatted frame range for later use in Flame,
         using old-style Python formatting normally reserved for ints.
@@ -918,7 +961,7 @@ class FlameActions(HookBaseClass):
         :rtype: dict
         """
 
-        ranges = FlameActions._guess_frame_range(path)
+        ranges = self._guess_frame_range(path)
 
         # Cuts off everything after the position of the formatting char.
         path_end = path[path.find("%") :]
@@ -944,8 +987,7 @@ class FlameActions(HookBaseClass):
             "end_frame": end_frame,
         }
 
-    @staticmethod
-    def _guess_frame_range(path):
+    def _guess_frame_range(self, path):
         """
         Try to get the sequence's frame range from the path
 
@@ -953,54 +995,63 @@ class FlameActions(HookBaseClass):
         :return: Tuple containing the first and the last frame number of the sequence or tuple of None if failure
         :rtype: ( int, int ) or ( None, None )
         """
-        folder, file_name = os.path.split(path)
+        file_name = os.path.basename(path)
         match = re.match(r"(.*)(%\d+d)(.+)", file_name)
 
         if not match:
             raise FlameActionError("Cannot detect frame pattern for '%s'" % path)
 
-        frame_list = []
-
         # The frame numbers have to match a certain number of digits
         frame_len = int(match.group(2)[1:-1])
 
-        # Lets retrieve all the files that's in the folder of the file to match
-        try:
-            files = [
-                f for f in os.listdir(folder) if os.path.isfile(os.path.join(folder, f))
-            ]
-        except OSError as e:
-            raise FlameActionError("Unable to guess the frame range for '%s'" % path)
+        # Lets retrieve all the frames that's in the folder of the file to match.
+        # The folder listing is cached and shared with the other clips loaded
+        # from the same folder.
+        frames = self._get_sequence_scanner().find_frames(path)
+
+        if frames:
+            # Let's return the first and the last frame number, which is the
+            # same frame if only one frame matches our pattern
+            return (
+                "%0*d" % (frame_len, frames[0][0]),
+                "%0*d" % (frame_len, frames[-1][0]),
+            )
+        else:
+            # Let's return None because nothing match our pattern
+            return None, None
 
-        for f in files:
-            # It doesn't match our pattern
-            if not f.startswith(match.group(1)) or not f.endswith(match.group(3)):
-                continue
+    def _get_sequence_scanner(self):
+        """
+        Returns the sequence scanner shared by the actions hooks, which caches
+        the folder listings used to find the frames of sequences.
 
-            # Lets isolate the potential frame number from the file name
-            frame = f[len(match.group(1)) : -len(match.group(3))]
+        :return: The sequence_scanner module of the loader app
+        """
+        return self.parent.import_module("tk_multi_loader").sequence_scanner
 
-            # It's not a frame that match our pattern
-            if len(frame) != frame_len and not frame.isdigit():
-                continue
+    def _exists_multiple(self, media_paths):
+        """
+        Checks if several paths exist directly or as sequences, using a pool of threads
 
-            # Let's add the frame number of the file that match our pattern
-            frame_list.append(frame)
+        :param [str] media_paths: Potential media paths
+        :return: List telling if each media path exists
+        :rtype: [bool]
+        """
+        if len(media_paths) <= 1:
+            # Not worth spinning up threads
+            return [bool(path) and self._exists(path) for path in media_paths]
 
-        frame_list.sort()
+        # import the scanner from the calling thread, the threads then share it
+        self._get_sequence_scanner()
 
-        if len(frame_list) >= 2:
-            # We have at least 2 frame so let's return first and the last frame number
-            return frame_list[0], frame_list[-1]
-        elif len(frame_list) == 1:
-            # We only have one frame that match so let's return the same frame as begin and end frame
-            return frame_list[0], frame_list[0]
-        else:
-            # Let's return None because nothing match our pattern
-            return None, None
+        pool = ThreadPool(min(EXISTS_CHECK_THREADS, len(media_paths)))
+        try:
+            return pool.map(lambda path: bool(path) and self._exists(path), media_paths)
+        finally:
+            pool.close()
+            pool.join()
 
-    @staticmethod
-    def _exists(media_path):
+    def _exists(self, media_path):
         """
         Checks if the path exists directly or as a sequence
 
@@ -1009,18 +1060,23 @@ class FlameActions(HookBaseClass):
         :rtype: bool
         """
 
+        folder, file_name = os.path.split(media_path)
+
+        # The listing of the folder is cached and shared with the other clips
+        # loaded from the same folder, as well as with _guess_frame_range
+        files = self._get_sequence_scanner().list_files(folder)
+
         # Check if the path exists
-        if os.path.exists(media_path):
+        if file_name in files:
             return True
 
-        folder, file_name = os.path.split(media_path)
-
         # Try to check if the path is a sequence
         match = re.match(r"(.*)(\[\d+-\d+\])(.+)", file_name)
 
         if not match:
-            # The path is not a sequence
-            return False
+            # The path is not a sequence. It may be a folder, or a file created
+            # since the folder was listed, so ask the file system directly
+            return os.path.exists(media_path)
 
         # Get the first and last frame of the sequence
         first, last = match.group(2).replace("[", "").replace("]", "").split("-")
@@ -1028,19 +1084,14 @@ class FlameActions(HookBaseClass):
         # Get the frame value padding length
         frame_size = len(first)
 
-        # Check if at least one frame in the sequence exists
-        for frame in range(int(first), int(last)):
-            # Apply frame padding
-            frame = "0" * (frame_size - len(str(frame))) + str(frame)
-
-            # Build frame file name
-            file_name = match.group(1) + frame + match.group(3)
-
-            # Check if frame exists
-            if os.path.exists(os.path.join(folder, file_name)):
-                return True
+        # Build the file names of all the frames of the sequence
+        frame_names = set(
+            match.group(1) + "%0*d" % (frame_size, frame) + match.group(3)
+            for frame in range(int(first), int(last) + 1)
+        )
 
-        return False
+        # Check if at least one frame in the sequence exists
+        return not frame_names.isdisjoint(files)
 
     @staticmethod
     def _build_path_from_template(template, fields):
@@ -20,6 +20,10 @@ HookBaseClass = sgtk.get_hook_baseclass()
 
 class HoudiniActions(HookBaseClass):
 
+    # list of (node, layout node) tuples of the nodes whose reload and framing
+    # are deferred while several publishes are loaded, None otherwise.
+    _deferred_nodes = None
+
     ##############################################################################################################
     # public interface - to be overridden by deriving classes
 
@@ -124,7 +128,16 @@ class HoudiniActions(HookBaseClass):
 
         :param list actions: Action dictionaries.
         """
-        for single_action in actions:
+        # create all the nodes in one go when several caches or images are
+        # loaded, so that Houdini only cooks and redraws once.
+        node_actions = [a for a in actions if a["name"] in ("import", "file_cop")]
+        if len(node_actions) > 1:
+            self._execute_actions_batched(actions)
+            return
+
+        for (index, single_action) in enumerate(actions):
+            # let the loader display which item is being loaded
+            self.parent.report_action_progress(index, len(actions))
             name = single_action["name"]
             sg_publish_data = single_action["sg_publish_data"]
             params = single_action["params"]
@@ -161,6 +174,68 @@ class HoudiniActions(HookBaseClass):
     ##############################################################################################################
     # helper methods which can be subclassed in custom hooks to fine tune the behaviour of things
 
+    def _execute_actions_batched(self, actions):
+        """
+        Executes a list of actions in a single undo group, with cooking held
+        until all the nodes have been created.
+
+        The actions run through ``execute_action``, but the nodes created by the
+        import and file_cop actions are laid out, reloaded and framed once, at
+        the end, rather than once per publish. This is done for the nodes which
+        were created even if an action raises midway.
+
+        :param list actions: Action dictionaries.
+        """
+        import hou
+
+        app = self.parent
+        self._deferred_nodes = []
+        try:
+            with hou.undos.group("Load %d published files" % len(actions)):
+                # hold cooking while the nodes are being created
+                update_mode = hou.updateModeSetting()
+                hou.setUpdateMode(hou.updateMode.Manual)
+                try:
+                    for (index, single_action) in enumerate(actions):
+                        # let the loader display which item is being loaded
+                        app.report_action_progress(index, len(actions))
+                        name = single_action["name"]
+                        sg_publish_data = single_action["sg_publish_data"]
+                        params = single_action["params"]
+                        self.execute_action(name, params, sg_publish_data)
+                finally:
+                    hou.setUpdateMode(update_mode)
+                    # finish the nodes which were created, even if an action
+                    # failed midway
+                    deferred_nodes = self._deferred_nodes
+                    self._deferred_nodes = None
+                    if deferred_nodes:
+                        self._update_nodes(deferred_nodes)
+        finally:
+            self._deferred_nodes = None
+
+    def _update_nodes(self, deferred_nodes):
+        """
+        Lays out, reloads and frames the nodes created while several publishes
+        were loaded.
+
+        :param deferred_nodes: List of (node, layout node) tuples, with each new
+                               node and the node to lay out in its network.
+        """
+        # lay out the new nodes of each network once
+        nodes_by_parent = {}
+        for (_, layout_node) in deferred_nodes:
+            parent_path = layout_node.parent().path()
+            nodes_by_parent.setdefault(parent_path, []).append(layout_node)
+        for nodes in nodes_by_parent.values():
+            nodes[0].parent().layoutChildren(items=nodes)
+
+        # and cook them now that they are all in place
+        for (node, _) in deferred_nodes:
+            node.parm("reload").pressButton()
+
+        _show_nodes([node for (node, _) in deferred_nodes])
+
     def _merge(self, path, sg_publish_data):
         """
         Merge a published hip file into the working hip file with
@@ -191,8 +266,12 @@ class HoudiniActions(HookBaseClass):
     def _import(self, path, sg_publish_data):
         """Import the supplied path as a geo/alembic sop.
 
+        When several publishes are loaded, the sop is neither reloaded nor
+        framed, see ``_execute_actions_batched``.
+
         :param str path: The path to the file to import.
         :param dict sg_publish_data: The publish data for the supplied path.
+        :returns: The alembic sop.
 
         """
 
@@ -226,16 +305,27 @@ class HoudiniActions(HookBaseClass):
         app.log_debug(
             "Creating alembic sop: %s\n  path: '%s' " % (alembic_sop.path(), path)
         )
+        if self._deferred_nodes is not None:
+            # the sop lives in its own geo node, lay out the geo node
+            self._deferred_nodes.append((alembic_sop, geo_node))
+            return alembic_sop
+
         alembic_sop.parm("reload").pressButton()
 
         _show_node(alembic_sop)
 
+        return alembic_sop
+
     ##############################################################################################################
     def _file_cop(self, path, sg_publish_data):
         """Read the supplied path as a file COP.
 
+        When several publishes are loaded, the COP is neither reloaded nor
+        framed, see ``_execute_actions_batched``.
+
         :param str path: The path to the file to import.
         :param dict sg_publish_data: The publish data for the supplied path.
+        :returns: The file COP.
 
         """
 
@@ -290,10 +380,16 @@ class HoudiniActions(HookBaseClass):
 
         file_cop.parm("filename1").set(path)
         app.log_debug("Created file COP: %s\n  path: '%s' " % (file_cop.path(), path))
+        if self._deferred_nodes is not None:
+            self._deferred_nodes.append((file_cop, file_cop))
+            return file_cop
+
         file_cop.parm("reload").pressButton()
 
         _show_node(file_cop)
 
+        return file_cop
+
 
 ##############################################################################################################
 def _get_current_context(context_type):
@@ -358,13 +454,32 @@ def _show_node(node):
 
     """
 
+    _show_nodes([node])
+
+
+##############################################################################################################
+def _show_nodes(nodes):
+    """Select the supplied nodes and frame them in the current network pane.
+
+    The network pane shows the network of the last node, only the nodes of
+    that network are selected and framed.
+
+    :param list nodes: The hou.Node instances to select and frame.
+
+    """
+
+    node = nodes[-1]
+
     context_type = "/" + node.path().split("/")[0]
     network_tab = _get_current_network_panetab(context_type)
 
     if not network_tab:
         return
 
-    # select the node and frame it
-    node.setSelected(True, clear_all_selected=True)
-    network_tab.cd(node.parent().path())
+    # select the nodes of the network and frame them
+    network_path = node.parent().path()
+    network_nodes = [n for n in nodes if n.parent().path() == network_path]
+    for (index, other_node) in enumerate(network_nodes):
+        other_node.setSelected(True, clear_all_selected=(index == 0))
+    network_tab.cd(network_path)
     network_tab.frameSelection()
@@ -132,7 +132,9 @@ class MariActions(HookBaseClass):
 
         :param list actions: Action dictionaries.
         """
-        for single_action in actions:
+        for (index, single_action) in enumerate(actions):
+            # let the loader display which item is being loaded
+            self.parent.report_action_progress(index, len(actions))
             name = single_action["name"]
             sg_publish_data = single_action["sg_publish_data"]
             params = single_action["params"]
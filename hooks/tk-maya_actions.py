@@ -12,10 +12,7 @@
 Hook that loads defines all the available actions, broken down by publish type.
 """
 
-import glob
 import os
-import re
-from pprint import pprint
 import maya.cmds as cmds
 import pymel.core as pm
 import maya.mel as mel
@@ -29,6 +26,10 @@ HookBaseClass = sgtk.get_hook_baseclass()
 
 class MayaActions(HookBaseClass):
 
+    # list of (file reference, nodes, sg_publish_data) tuples of the references
+    # created unloaded while several publishes are loaded, None otherwise.
+    _deferred_references = None
+
     ##############################################################################################################
     # public interface - to be overridden by deriving classes
 
@@ -155,27 +156,68 @@ class MayaActions(HookBaseClass):
             The hook will stop applying the actions on the selection if an error
             is raised midway through.
 
+        .. note::
+            When several publishes are loaded at once, the viewport refresh is
+            suspended until they are all loaded. ``_create_reference`` creates
+            the references unloaded, they are then loaded in one pass and grouped
+            for the lighting step once all the actions have run.
+
         :param list actions: Action dictionaries.
         """
         actions_result = {}
-        for single_action in actions:
-            name = single_action["name"]
-            sg_publish_data = single_action["sg_publish_data"]
-            params = single_action["params"]
-            res = self.execute_action(name, params, sg_publish_data)
-
-            if res is None:
-                continue
+        load_errors = []
+
+        batched = len(actions) > 1
+        if batched:
+            self._deferred_references = []
+            cmds.refresh(suspend=True)
+
+        try:
+            for (index, single_action) in enumerate(actions):
+                # let the loader display which item is being loaded
+                self.parent.report_action_progress(index, len(actions))
+                name = single_action["name"]
+                sg_publish_data = single_action["sg_publish_data"]
+                params = single_action["params"]
+                res = self.execute_action(name, params, sg_publish_data)
+
+                if res is None:
+                    continue
 
-            if not actions_result.get(name):
-                actions_result[name] = [res]
-            else:
-                actions_result[name].append(res)
+                if not actions_result.get(name):
+                    actions_result[name] = [res]
+                else:
+                    actions_result[name].append(res)
+        finally:
+            if batched:
+                # load whatever was referenced, even if an action failed midway
+                deferred_references = self._deferred_references
+                self._deferred_references = None
+                try:
+                    if deferred_references:
+                        load_errors = self._load_references(deferred_references)
+                finally:
+                    cmds.refresh(suspend=False)
 
         if actions_result and self._step_name_in(["lighting"]):
             self._check_and_import_shaders(actions_result)
 
+        if load_errors:
+            raise Exception(
+                "%d of %d references could not be loaded, see the log for details."
+                % (len(load_errors), len(deferred_references))
+            )
+
     def _check_and_import_shaders(self, data):
+        """
+        Applies the published shaders of their upstream nodes to the geometry
+        of the assets which were just loaded.
+
+        The Shotgun nodes and shader publishes of all the loaded assets are
+        fetched in bulk, with one query for the nodes and one for the publishes.
+
+        :param dict data: Action name -> list of the nodes loaded for each publish.
+        """
         engine = sgtk.platform.current_engine()
         sg = engine.shotgun
         context = engine.context
@@ -186,22 +228,9 @@ class MayaActions(HookBaseClass):
         tk_consuladoutils = self.load_framework("tk-framework-consuladoutils_v0.x.x")
         consulado_globals = tk_consuladoutils.import_module("shotgun_globals")
         maya_utils = tk_consuladoutils.import_module("maya_utils")
-        consulado_model = tk_consuladoutils.import_module("shotgun_model")
 
         sg_node_name = consulado_globals.get_custom_entity_by_alias("node")
-        sg_node_type_name = consulado_globals.get_custom_entity_by_alias("node_type")
         node_x_node = "custom_entity05_sg_upstream_node_dependency_custom_entity05s"
-        node_fields = [
-            "project",
-            "id",
-            "code",
-            "sg_link",
-            "sg_node_type",
-            "sg_downstream_node_dependency",
-            "sg_upstream_node_dependency",
-            "sg_published_files",
-            node_x_node,
-        ]
         publish_fields = [
             "project",
             "id",
@@ -210,63 +239,72 @@ class MayaActions(HookBaseClass):
             "version_number",
             "path",
         ]
-        local_data = {}
-        for action, asset_result in data.items():
+        shader_publish_type = {"type": "PublishedFileType", "id": 135}
+
+        # collect the geometry of all the loaded assets, along with
+        # the id of the Shotgun node each piece of geometry comes from.
+        geo_nodes = []
+        for asset_result in data.values():
             for asset in asset_result:
-                Nodes = consulado_model.EntityIter(
-                    sg_node_name, node_fields, context, sg
-                )
-                published_files = consulado_model.EntityIter(
-                    "PublishedFile", publish_fields, context, sg
-                )
                 geos = [t for t in asset if t.nodeType() in ("transform")]
-                maya_asset = maya_utils.MayaAsset(geos)
+                for geo_node in maya_utils.MayaAsset(geos):
+                    geo_nodes.append((geo_node, geo_node.cNodeId.get()))
+
+        # fetch the upstream dependencies of all the nodes at once
+        upstreams_per_node = {}
+        node_ids = list(set(c_id for (_, c_id) in geo_nodes if c_id))
+        if node_ids:
+            nodes = sg.find(sg_node_name, [["id", "in", node_ids]], [node_x_node])
+            for node in nodes:
+                upstreams_per_node[node["id"]] = node.get(node_x_node) or []
+
+        # then the shader publishes of all the upstream nodes at once
+        upstream_entities = {}
+        for upstreams in upstreams_per_node.values():
+            for upstream in upstreams:
+                upstream_entities[(upstream["type"], upstream["id"])] = upstream
+
+        publishes = []
+        if upstream_entities:
+            publishes = sg.find(
+                "PublishedFile",
+                [
+                    ["project", "is", context.project],
+                    ["entity", "in", list(upstream_entities.values())],
+                    ["published_file_type", "is", shader_publish_type],
+                ],
+                publish_fields,
+            )
 
-                for geo_node in maya_asset:
-                    c_id = geo_node.cNodeId.get()
-                    node = Nodes.add_new_entity()
-                    node.id = c_id
-                    node.entity_filter = [["id", "is", node.id]]
-                    node.load()
+        # and only keep the latest version published for each upstream node
+        latest_publishes = {}
+        for publish in publishes:
+            entity = publish.get("entity")
+            if not entity:
+                continue
+            key = (entity["type"], entity["id"])
+            latest_publish = latest_publishes.get(key)
+            if latest_publish is None or (latest_publish.get("version_number") or 0) < (
+                publish.get("version_number") or 0
+            ):
+                latest_publishes[key] = publish
+
+        path_field = "local_path_{}".format(platform.system().lower())
+        local_data = {}
+        for (geo_node, c_id) in geo_nodes:
+            for upstream in upstreams_per_node.get(c_id, []):
+                publish = latest_publishes.get((upstream["type"], upstream["id"]))
+                if publish is None:
+                    continue
+                local_path = (publish.get("path") or {}).get(path_field)
+                if not local_path:
+                    continue
+                local_path = "{}.ma".format(local_path)
 
-                    upstreams = getattr(node, node_x_node)
-                    if not upstreams:
-                        continue
+                if local_data.get(local_path) is None:
+                    local_data[local_path] = []
 
-                    last_publish = None
-                    for con in upstreams:
-                        entity_filter = [
-                            ["entity", "is", con],
-                            [
-                                "published_file_type",
-                                "is",
-                                {"type": "PublishedFileType", "id": 135},
-                            ],
-                        ]
-                        published_files.load(entity_filter)
-                        for publish in published_files:
-                            if (
-                                last_publish is None
-                                or last_publish.version_number < publish.version_number
-                            ):
-                                last_publish = publish
-                                continue
-                        if last_publish is None:
-                            continue
-                        path_data = last_publish.path
-                        pprint(path_data)
-                        local_path = "{}.ma".format(
-                            path_data.get(
-                                "local_path_{}".format(platform.system().lower()), ""
-                            )
-                        )
-                        if local_path == ".ma":
-                            continue
-
-                        if local_data.get(local_path) is None:
-                            local_data[local_path] = []
-
-                        local_data[local_path].append(geo_node)
+                local_data[local_path].append(geo_node)
 
         with maya_utils.ShaderIter(local_data=local_data) as shader_iter:
             shader_iter.apply()
@@ -333,7 +371,6 @@ class MayaActions(HookBaseClass):
         :param path: Path to file.
         :param sg_publish_data: Shotgun data dictionary with all the standard publish fields.
         """
-        app = self.parent
         if not os.path.exists(path):
             raise Exception("File not found on disk - '%s'" % path)
 
@@ -346,22 +383,106 @@ class MayaActions(HookBaseClass):
         # namespace = namespace.replace(" ", "_")
         namespace = sg_publish_data.get("name", "").replace(" ", "_")
 
+        if self._deferred_references is not None:
+            # create the reference unloaded, execute_multiple_actions loads it
+            # with the others and fills the list of nodes in.
+            file_reference = pm.createReference(
+                path, loadReferenceDepth="none", namespace=namespace
+            )
+            nodes = []
+            self._deferred_references.append((file_reference, nodes, sg_publish_data))
+            return nodes
+
         # Now create the reference object in Maya.
         nodes = pm.createReference(
             path, loadReferenceDepth="all", namespace=namespace, returnNewNodes=True
         )
 
         if self._step_name_in(["lighting"]):
-            # Create a default group
+            self._group_referenced_nodes(nodes, sg_publish_data)
+
+        return nodes
+
+    def _load_references(self, references):
+        """
+        Loads references created unloaded by ``_create_reference`` in one pass,
+        then groups them for the lighting step.
+
+        A reference failing to load doesn't prevent the others from loading.
+
+        :param references: List of (file reference, nodes, sg_publish_data) tuples.
+                           The nodes lists are filled with the nodes of each
+                           reference as they are loaded.
+        :returns: List of (sg_publish_data, error message) tuples for the
+                  references which couldn't be loaded.
+        """
+        app = self.parent
+
+        errors = []
+        loaded = []
+        for (file_reference, nodes, sg_publish_data) in references:
+            try:
+                file_reference.load(loadReferenceDepth="all")
+                nodes.extend(file_reference.nodes())
+            except Exception as e:
+                app.log_error(
+                    "Unable to load '%s': %s" % (sg_publish_data.get("name"), e)
+                )
+                errors.append((sg_publish_data, str(e)))
+                continue
+            loaded.append((nodes, sg_publish_data))
+
+        if loaded and self._step_name_in(["lighting"]):
+            self._group_referenced_nodes_multiple(loaded)
+
+        return errors
+
+    def _group_referenced_nodes(self, nodes, sg_publish_data):
+        """
+        Groups the geometry of a reference under a render group, as expected
+        by the lighting step.
+
+        :param nodes: Nodes created by the reference.
+        :param sg_publish_data: Shotgun data dictionary with all the standard publish fields.
+        """
+        self._group_referenced_nodes_multiple([(nodes, sg_publish_data)])
+
+    def _group_referenced_nodes_multiple(self, references):
+        """
+        Groups the geometry of several references under render groups, as
+        expected by the lighting step.
+
+        The groups of all the references are created first, then the geometry
+        of each reference is moved with one parent call.
+
+        :param references: List of (nodes, sg_publish_data) tuples, with the nodes
+                           created by each reference and its Shotgun data.
+        """
+        app = self.parent
+
+        # Create the default groups
+        groupings = []
+        for (nodes, sg_publish_data) in references:
             asset_name = sg_publish_data.get("name", "").split(".")[0]
             asset_group = pm.group(name=asset_name, empty=True)
             render_group = pm.group(name="render", empty=True)
             asset_group.setParent(render_group)
+            transforms = [n for n in nodes if n.nodeType() in ("transform")]
+            if transforms:
+                groupings.append((transforms, render_group))
+
+        # Add the geometries nodes into their render group, in one go if possible
+        for (transforms, render_group) in groupings:
+            try:
+                pm.parent(transforms, render_group)
+                continue
+            except Exception:
+                pass
 
-            # Add the geometries nodes into render group
-            for n in nodes:
+            # fall back on parenting nodes one by one, skipping the ones that fail
+            for n in transforms:
                 try:
-                    if n.nodeType() not in ("transform"):
+                    if n.getParent() == render_group:
                         continue
                     n.setParent(render_group)
                 except Exception as e:
@@ -370,8 +491,6 @@ class MayaActions(HookBaseClass):
                     )
                     continue
 
-        return nodes
-
     def _do_import(self, path, sg_publish_data):
         """
         Create a reference with the same settings Maya would use
@@ -467,17 +586,14 @@ class MayaActions(HookBaseClass):
         app = self.parent
         has_frame_spec = False
 
-        # replace any %0#d format string with a glob character. then just find
-        # an existing frame to use. example %04d => *
-        frame_pattern = re.compile("(%0\dd)")
-        frame_match = re.search(frame_pattern, path)
-        if frame_match:
+        # if the path has a frame token, find an existing frame to use. Frames
+        # are looked up in a listing of the folder shared by all the actions.
+        sequence_scanner = app.import_module("tk_multi_loader").sequence_scanner
+        if sequence_scanner.parse_pattern(os.path.basename(path)):
             has_frame_spec = True
-            frame_spec = frame_match.group(1)
-            glob_path = path.replace(frame_spec, "*")
-            frame_files = glob.glob(glob_path)
-            if frame_files:
-                path = frame_files[0]
+            frames = sequence_scanner.find_frames(path)
+            if frames:
+                path = frames[0][1]
             else:
                 app.logger.error(
                     "Could not find file on disk for published file path %s" % (path,)
@@ -13,7 +13,6 @@ Hook that loads defines all the available actions, broken down by publish type.
 """
 import os
 import re
-import glob
 import sys
 
 import sgtk
@@ -138,7 +137,9 @@ class NukeActions(HookBaseClass):
 
         :param list actions: Action dictionaries.
         """
-        for single_action in actions:
+        for (index, single_action) in enumerate(actions):
+            # let the loader display which item is being loaded
+            self.parent.report_action_progress(index, len(actions))
             name = single_action["name"]
             sg_publish_data = single_action["sg_publish_data"]
             params = single_action["params"]
@@ -333,20 +334,12 @@ class NukeActions(HookBaseClass):
         if not match:
             return None
 
-        # We need to get all files that match the pattern from disk so that we
-        # can determine what the min and max frame number is.
-        glob_path = "%s%s" % (re.sub(frame_pattern, "*", root), ext,)
-        files = glob.glob(glob_path)
-
-        # Our pattern from above matches against the file root, so we need
-        # to chop off the extension at the end.
-        file_roots = [os.path.splitext(f)[0] for f in files]
-
-        # We know that the search will result in a match at this point, otherwise
-        # the glob wouldn't have found the file. We can search and pull group 1
-        # to get the integer frame number from the file root name.
-        frames = [int(re.search(frame_pattern, f).group(1)) for f in file_roots]
-        return (min(frames), max(frames))
+        # Replace the frame number or token with a frame token of any padding
+        # and let the sequence scanner find all the matching frames on disk, so
+        # that we can determine what the min and max frame number is. The folder
+        # is only listed once for all the publishes loaded from it.
+        sequence_path = "%s%s" % (re.sub(frame_pattern, "%d", root), ext)
+        return self._get_sequence_scanner().get_frame_range(sequence_path)
 
     def _find_sequence_range(self, path):
         """
@@ -377,17 +370,38 @@ class NukeActions(HookBaseClass):
         if not "SEQ" in fields:
             return None
 
-        files = self.parent.sgtk.paths_from_template(template, fields, ["SEQ", "eye"])
+        if "eye" in template.keys:
+            # the files of stereo sequences are spread across one file name per
+            # view, which the sequence scanner doesn't know about. Let the template
+            # system find the files of all the views.
+            files = self.parent.sgtk.paths_from_template(
+                template, fields, ["SEQ", "eye"]
+            )
 
-        # find frame numbers from these files:
-        frames = []
-        for file in files:
-            fields = template.get_fields(file)
-            frame = fields.get("SEQ")
-            if frame != None:
-                frames.append(frame)
-        if not frames:
-            return None
+            # find frame numbers from these files:
+            frames = []
+            for file in files:
+                fields = template.get_fields(file)
+                frame = fields.get("SEQ")
+                if frame != None:
+                    frames.append(frame)
+            if not frames:
+                return None
+
+            # return the range
+            return (min(frames), max(frames))
+
+        # build the path of the sequence with a frame token and look its frames
+        # up on disk. This uses the frame format of the template, e.g. %04d.
+        fields["SEQ"] = "FORMAT: %d"
+        sequence_path = template.apply_fields(fields)
+        return self._get_sequence_scanner().get_frame_range(sequence_path)
+
+    def _get_sequence_scanner(self):
+        """
+        Returns the sequence scanner shared by the actions hooks, which caches
+        the folder listings used to find the frames of sequences.
 
-        # return the range
-        return (min(frames), max(frames))
+        :returns: The ``sequence_scanner`` module of the loader app.
+        """
+        return self.parent.import_module("tk_multi_loader").sequence_scanner
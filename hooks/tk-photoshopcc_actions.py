@@ -12,6 +12,7 @@
 Hook that loads defines all the available actions, broken down by publish type.
 """
 
+import json
 import os
 
 import sgtk
@@ -24,9 +25,43 @@ HookBaseClass = sgtk.get_hook_baseclass()
 _ADD_AS_A_LAYER = "add_as_a_layer"
 _OPEN_FILE = "open_file"
 
+# Separates the errors returned by _PLACE_FILES_SCRIPT
+_PLACE_FILES_ERROR_SEPARATOR = "<|sgtk|>"
+
+# ExtendScript placing a list of files as layers of the active document, in a
+# single remote call. This is the script generated by the Script Listener for
+# File->Place, see _place_file, run for every file. It returns "no_document" if
+# no document is opened, otherwise the index and message of the files which
+# couldn't be placed, separated by _PLACE_FILES_ERROR_SEPARATOR.
+_PLACE_FILES_SCRIPT = """
+(function (paths) {
+    if (app.documents.length === 0) {
+        return "no_document";
+    }
+    var errors = [];
+    for (var i = 0; i < paths.length; i++) {
+        try {
+            var placeActionDesc = new ActionDescriptor();
+            placeActionDesc.putPath(charIDToTypeID("null"), new File(paths[i]));
+            placeActionDesc.putEnumerated(
+                charIDToTypeID("FTcs"), charIDToTypeID("QCSt"), charIDToTypeID("Qcsa")
+            );
+            executeAction(charIDToTypeID("Plc "), placeActionDesc, DialogModes.NO);
+        } catch (e) {
+            errors.push(i + ":" + e);
+        }
+    }
+    return errors.join("%(separator)s");
+})(%(paths)s);
+"""
+
 
 class PhotoshopActions(HookBaseClass):
 
+    # list of (path, sg_publish_data) tuples of the files whose placing is
+    # deferred while several files are added as layers, None otherwise.
+    _deferred_places = None
+
     ##############################################################################################################
     # public interface - to be overridden by deriving classes
 
@@ -112,6 +147,7 @@ class PhotoshopActions(HookBaseClass):
             name: Name of the action to execute
             sg_publish_data: Publish information coming from Shotgun
             params: Parameters passed down from the generate_actions hook.
+            path: Optional path of the publish, if the loader already resolved it.
 
         .. note::
             This is the default entry point for the hook. It reuses the
@@ -122,9 +158,25 @@ class PhotoshopActions(HookBaseClass):
             The hook will stop applying the actions on the selection if an error
             is raised midway through.
 
+        .. note::
+            When several files are added as layers, they are placed with a single
+            script evaluated by Photoshop, see ``_execute_actions_batched``.
+
         :param list actions: Action dictionaries.
         """
-        for single_action in actions:
+        # place several files as layers in one go, rather than doing a round
+        # trip to Photoshop for each of them.
+        if (
+            len(actions) > 1
+            and all(a["name"] == _ADD_AS_A_LAYER for a in actions)
+            and self._can_place_files()
+        ):
+            self._execute_actions_batched(actions)
+            return
+
+        for (index, single_action) in enumerate(actions):
+            # let the loader display which item is being loaded
+            self.parent.report_action_progress(index, len(actions))
             name = single_action["name"]
             sg_publish_data = single_action["sg_publish_data"]
             params = single_action["params"]
@@ -176,6 +228,98 @@ class PhotoshopActions(HookBaseClass):
         file = self.parent.engine.adobe.File(path)
         self.parent.engine.adobe.app.load(file)
 
+    def _execute_actions_batched(self, actions):
+        """
+        Adds several files as layers of the active document with a single
+        script evaluated by Photoshop.
+
+        The actions run through ``execute_action``, but ``_place_file`` only
+        records the files, which are then placed at once by ``_place_files``.
+        A file which can't be added doesn't prevent the other files from being
+        added, the errors are logged and reported once the files were placed.
+
+        :param list actions: Action dictionaries.
+        """
+        app = self.parent
+
+        errors = []
+        self._deferred_places = []
+        try:
+            for (index, single_action) in enumerate(actions):
+                # let the loader display which item is being loaded
+                app.report_action_progress(index, len(actions))
+                sg_publish_data = single_action["sg_publish_data"]
+                try:
+                    self.execute_action(
+                        single_action["name"], single_action["params"], sg_publish_data
+                    )
+                except Exception as e:
+                    errors.append((sg_publish_data, str(e)))
+        finally:
+            # place the files recorded so far, even if the loader stopped the
+            # actions midway
+            deferred_places = self._deferred_places
+            self._deferred_places = None
+            if deferred_places:
+                errors.extend(self._place_files(deferred_places))
+            for (sg_publish_data, error) in errors:
+                app.log_error(
+                    "Unable to add '%s' as a layer: %s"
+                    % (sg_publish_data.get("name"), error)
+                )
+
+        if errors:
+            raise Exception(
+                "%d of %d files could not be added as layers, see the log for details."
+                % (len(errors), len(actions))
+            )
+
+    def _can_place_files(self):
+        """
+        Checks if several files can be placed with a single script.
+
+        ``rpc_eval`` is implemented by the communicator base class of the
+        ``AdobeBridge`` of tk-framework-adobe, which ``engine.adobe`` is an
+        instance of. It is looked up on the class, since the bridge proxies any
+        unknown attribute to a remote object.
+
+        :returns: True if the Adobe bridge can evaluate scripts.
+        """
+        return hasattr(type(self.parent.engine.adobe), "rpc_eval")
+
+    def _place_files(self, files):
+        """
+        Import the contents of several files as layers of the active document,
+        with a single script evaluated by Photoshop.
+
+        :param files: List of (path, sg_publish_data) tuples.
+        :returns: List of (sg_publish_data, error message) tuples for the files
+                  which couldn't be placed.
+        """
+        app = self.parent
+        app.log_debug("Placing %d files as layers" % len(files))
+
+        paths = ["/".join(path.split(os.path.sep)) for (path, _) in files]
+        result = app.engine.adobe.rpc_eval(
+            _PLACE_FILES_SCRIPT
+            % {"paths": json.dumps(paths), "separator": _PLACE_FILES_ERROR_SEPARATOR}
+        )
+
+        # We can't import in an empty scene.
+        if result == "no_document":
+            QtGui.QMessageBox.warning(
+                None, "Add To Layer", "Please open a document first.",
+            )
+            return []
+
+        errors = []
+        for error in (result or "").split(_PLACE_FILES_ERROR_SEPARATOR):
+            if error:
+                (index, message) = error.split(":", 1)
+                (_, sg_publish_data) = files[int(index)]
+                errors.append((sg_publish_data, message.strip()))
+        return errors
+
     def _place_file(self, path, sg_publish_data):
         """
         Import contents of the given file into the scene.
@@ -184,6 +328,11 @@ class PhotoshopActions(HookBaseClass):
         :param sg_publish_data: Shotgun data dictionary with all the standard
                                 publish fields.
         """
+        if self._deferred_places is not None:
+            # placed with the other files by _execute_actions_batched
+            self._deferred_places.append((path, sg_publish_data))
+            return
+
         path = "/".join(path.split(os.path.sep))
         adobe = self.parent.engine.adobe
 
@@ -139,7 +139,9 @@ class ShellActions(HookBaseClass):
         app.log_info("Executing action '%s' on the selection")
         # Helps to visually scope selections
         # Execute each action.
-        for single_action in actions:
+        for (index, single_action) in enumerate(actions):
+            # let the loader display which item is being loaded
+            self.parent.report_action_progress(index, len(actions))
             name = single_action["name"]
             sg_publish_data = single_action["sg_publish_data"]
             params = single_action["params"]
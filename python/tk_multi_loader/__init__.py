@@ -8,14 +8,10 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-from .open_publish_form import open_publish_browser
-
-import sgtk
-from sgtk.platform.qt import QtCore, QtGui
-
-from .ui import resources_rc
-
-help_screen = sgtk.platform.import_framework("tk-framework-qtwidgets", "help_screen")
+# only modules which don't depend on Qt are imported here, so that the
+# app can be used in batch modes. Qt modules are imported on demand.
+from . import batch_load
+from . import sequence_scanner
 
 
 def show_dialog(app):
@@ -25,10 +21,14 @@ def show_dialog(app):
     :param app:    The parent App
     """
     # defer imports so that the app works gracefully in batch modes
+    from sgtk.platform.qt import QtCore, QtGui
+
+    from .ui import resources_rc
     from .dialog import AppDialog
+    from . import resource_cache
 
     # Create and display the splash screen
-    splash_pix = QtGui.QPixmap(":/res/splash.png")
+    splash_pix = resource_cache.get_pixmap(":/res/splash.png")
     splash = QtGui.QSplashScreen(splash_pix, QtCore.Qt.WindowStaysOnTopHint)
     splash.setMask(splash_pix.mask())
     splash.show()
@@ -56,3 +56,14 @@ def show_dialog(app):
     if w.is_first_launch():
         # wait a bit before show window
         QtCore.QTimer.singleShot(1400, w.show_help_popup)
+
+
+def open_publish_browser(app, title, action, publish_types=None):
+    """
+    Display the loader UI in an open-file style where a publish can be selected,
+    see :func:`open_publish_form.open_publish_browser`.
+    """
+    # defer imports so that the app works gracefully in batch modes
+    from . import open_publish_form
+
+    return open_publish_form.open_publish_browser(app, title, action, publish_types)
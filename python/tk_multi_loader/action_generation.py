@@ -0,0 +1,88 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Generation of the action definitions of publishes through the actions hook.
+
+This module doesn't depend on Qt, so that actions are generated the same way
+by the loader UI and by the headless batch loading.
+"""
+
+from sgtk import TankError
+
+from . import hook_timing
+
+
+def get_actions_hook(app):
+    """
+    Returns an instance of the configured actions hook, which can be used to
+    check which methods it implements.
+
+    :param app: The loader app instance.
+    :returns: Hook instance.
+    """
+    return app.create_hook_instance(app.get_setting("actions_hook"))
+
+
+def generate_actions(app, publish_type, sg_data_list, actions, ui_area, hook=None):
+    """
+    Calls out to the actions hook to get the action definitions for publishes
+    which all share the same publish type.
+
+    If the hook implements ``generate_actions_multiple``, all the publishes are
+    handed to it in a single call. Otherwise ``generate_actions`` is called for
+    each publish, since hooks can offer different actions for each publish.
+
+    :param app: The loader app instance.
+    :param publish_type: Name of the publish type of the publishes
+    :param sg_data_list: Publishes to retrieve actions for
+    :param actions: Sequence of action names configured for the publish type
+    :param ui_area: Name of the ui area, e.g. "main"
+    :param hook: Optional instance of the actions hook, as returned by
+                 :func:`get_actions_hook`. Created if not specified.
+    :returns: List with the list of action definitions of each publish.
+    :raises: Any error raised by the hook.
+    """
+    if not sg_data_list:
+        return []
+
+    if hook is None:
+        hook = get_actions_hook(app)
+    timings = hook_timing.get_hook_timings()
+
+    if hasattr(hook, "generate_actions_multiple"):
+        with timings.span("generate_actions_multiple", publish_type):
+            action_defs_list = app.execute_hook_method(
+                "actions_hook",
+                "generate_actions_multiple",
+                sg_publish_data_list=sg_data_list,
+                actions=list(actions),
+                ui_area=ui_area,
+            )
+        if len(action_defs_list) != len(sg_data_list):
+            raise TankError(
+                "The generate_actions_multiple hook returned %d lists of actions "
+                "for %d publishes." % (len(action_defs_list), len(sg_data_list))
+            )
+        return action_defs_list
+
+    action_defs_list = []
+    for sg_data in sg_data_list:
+        with timings.span("generate_actions", publish_type):
+            action_defs_list.append(
+                app.execute_hook_method(
+                    "actions_hook",
+                    "generate_actions",
+                    sg_publish_data=sg_data,
+                    actions=list(actions),
+                    ui_area=ui_area,
+                )
+            )
+    return action_defs_list
@@ -63,6 +63,13 @@ class ActionManager(QtCore.QObject):
         """
         return []
 
+    def invalidate_action_cache(self):
+        """
+        Discards any cached actions. The open dialog doesn't cache
+        actions, so this does nothing.
+        """
+        pass
+
     def get_default_action_for_publish(self, sg_data, ui_area):
         """
         Get the default action for the specified publish data.
@@ -0,0 +1,91 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+
+class ActionMappings(object):
+    """
+    Lookup table of the actions configured for publish types and entity types.
+
+    The table is compiled once from the ``action_mappings`` and ``entity_mappings``
+    settings, which are on the form ``{ "Maya Scene": ["reference", "import"] }``,
+    and doesn't change afterwards. Action names are stored as tuples and types
+    without any actions are dropped, so that checking whether a type has actions
+    is a simple set lookup.
+    """
+
+    def __init__(self, publish_mappings, entity_mappings=None):
+        """
+        :param publish_mappings: Dictionary of publish type names to lists of action names.
+        :param entity_mappings: Dictionary of entity types to lists of action names.
+        """
+        self._publish_actions = self._compile(publish_mappings)
+        self._entity_actions = self._compile(entity_mappings)
+        self._publish_types = frozenset(self._publish_actions)
+
+    @classmethod
+    def from_settings(cls, app):
+        """
+        Compiles the action mappings configured for an app.
+
+        :param app: The loader app instance.
+        :returns: :class:`ActionMappings` instance.
+        """
+        return cls(
+            app.get_setting("action_mappings"), app.get_setting("entity_mappings")
+        )
+
+    @property
+    def publish_types(self):
+        """
+        Frozen set of the names of all publish types which have actions.
+        """
+        return self._publish_types
+
+    def get_publish_actions(self, publish_type):
+        """
+        Returns the actions configured for a publish type.
+
+        :param publish_type: A Shotgun publish type (e.g. 'Maya Render')
+        :returns: Tuple of action names, empty if the type has no actions.
+        """
+        return self._publish_actions.get(publish_type, ())
+
+    def get_entity_actions(self, entity_type):
+        """
+        Returns the actions configured for an entity type.
+
+        :param entity_type: A Shotgun entity type (e.g. 'Shot')
+        :returns: Tuple of action names, empty if the type has no actions.
+        """
+        return self._entity_actions.get(entity_type, ())
+
+    def has_publish_actions(self, publish_type):
+        """
+        Returns true if the given publish type has any actions associated with it.
+
+        :param publish_type: A Shotgun publish type (e.g. 'Maya Render')
+        :returns: True if there are actions for this publish type.
+        """
+        return publish_type in self._publish_types
+
+    @staticmethod
+    def _compile(mappings):
+        """
+        Converts a mappings setting into a dictionary of tuples,
+        dropping types without actions.
+
+        :param mappings: Dictionary of type names to lists of action names, or None.
+        :returns: Dictionary of type names to tuples of action names.
+        """
+        return dict(
+            (type_name, tuple(actions))
+            for (type_name, actions) in (mappings or {}).items()
+            if actions
+        )
@@ -0,0 +1,339 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Pipeline running the actions triggered from the loader in stages.
+
+This module doesn't depend on Qt. The action manager drives it from the main
+thread and hands it callbacks for running the actions hook and reporting progress.
+"""
+
+import os
+import re
+from multiprocessing.pool import ThreadPool
+
+import sgtk
+
+from . import constants
+
+# matches the frame, stereo view and udim tokens found in image sequence and
+# texture paths, e.g. %04d, ####, @@@@, $F4, %V, <UDIM>, {UDIM}, <UVTILE>. Paths
+# with such tokens don't exist on disk as is, so they are never reported as missing.
+_SEQUENCE_TOKEN_REGEX = re.compile(
+    r"%0?\d*d|%v|#+|@+|\$F\d*|<UDIM>|\{UDIM\}|<UVTILE>", re.IGNORECASE
+)
+
+
+class ActionsCancelled(Exception):
+    """
+    Raised by :meth:`ActionPipeline.report_progress` once the pipeline has been
+    cancelled, so that the hook running the actions stops at the next item.
+    """
+
+
+class ActionPipeline(object):
+    """
+    Runs a list of actions, as passed to the ``execute_multiple_actions`` hook
+    method, in three stages:
+
+    - The paths of all publishes are resolved and checked for existence concurrently,
+      in background threads. Actions on publishes whose file is missing are skipped.
+      The resolved path is stored under the ``path`` key of the action, so that
+      hooks don't have to resolve it again.
+    - The remaining actions are handed to the hook, on the calling thread, since
+      DCCs expect their API to be called from the main thread. By default they are
+      all handed over in a single call, so that hooks can batch their work.
+    - The hook reports progress through :meth:`report_progress`. If the actions
+      are split in batches, progress is also reported before every batch. Once
+      the pipeline is cancelled, :meth:`report_progress` raises
+      :class:`ActionsCancelled`, which stops the hook, and the remaining batches
+      are skipped.
+
+    Actions which are skipped are recorded in :attr:`failures`.
+    """
+
+    def __init__(
+        self,
+        app,
+        actions,
+        batch_size=None,
+        num_threads=constants.ACTION_PRESTAGE_THREADS,
+    ):
+        """
+        :param app: The loader app instance.
+        :param actions: List of action dictionaries with keys name, sg_publish_data
+                        and params.
+        :param batch_size: Number of actions handed to the hook at once.
+                           If None, all the actions are handed over at once.
+        :param num_threads: Number of threads resolving paths.
+        """
+        self._app = app
+        self._actions = actions
+        self._batch_size = max(1, batch_size or len(actions))
+        self._num_threads = max(1, num_threads)
+        self._cancelled = False
+        # list of (action, reason) tuples for the actions which were not run
+        self._failures = []
+        # progress state while the actions are being run
+        self._progress_fn = None
+        self._processed = 0
+        self._batch = []
+        # number of actions of the current batch the hook reported as processed
+        self._batch_processed = 0
+
+    @property
+    def failures(self):
+        """
+        List of (action, reason) tuples for the actions which were skipped.
+        """
+        return self._failures
+
+    @property
+    def cancelled(self):
+        """
+        True if the pipeline was cancelled.
+        """
+        return self._cancelled
+
+    def cancel(self):
+        """
+        Requests the pipeline to stop. The hook is stopped the next time it
+        reports progress, the actions it didn't get to and the remaining batches
+        are skipped.
+        """
+        self._cancelled = True
+
+    def run(self, execute_fn, progress_fn=None, idle_fn=None):
+        """
+        Runs all the stages of the pipeline.
+
+        :param execute_fn: Callable taking a list of actions, which runs them.
+        :param progress_fn: Optional callable taking the number of actions processed,
+                            the total number of actions and the name of the publish
+                            being processed, or None when done.
+        :param idle_fn: Optional callable invoked regularly while waiting on the
+                        background threads, e.g. to keep a UI responsive.
+        :returns: Number of actions which were run.
+        """
+        total = len(self._actions)
+        actions = self._prestage(idle_fn)
+
+        self._progress_fn = progress_fn
+        # skipped actions count as processed for progress purposes
+        self._processed = total - len(actions)
+        executed = 0
+
+        try:
+            for start in range(0, len(actions), self._batch_size):
+                if self._cancelled:
+                    break
+                self._batch = actions[start : start + self._batch_size]
+                self._batch_processed = 0
+                try:
+                    self.report_progress(0, len(self._batch))
+                    execute_fn(self._batch)
+                except ActionsCancelled:
+                    self._app.log_debug(
+                        "Actions cancelled after %d of %d actions."
+                        % (executed + self._batch_processed, len(actions))
+                    )
+                    self._processed += self._batch_processed
+                    executed += self._batch_processed
+                    break
+                self._processed += len(self._batch)
+                executed += len(self._batch)
+
+            self._batch = []
+            if progress_fn:
+                progress_fn(self._processed, total, None)
+        finally:
+            self._progress_fn = None
+            self._batch = []
+
+        return executed
+
+    def iter_run(self, execute_fn):
+        """
+        Runs the actions as a generator, for callers without any UI to keep
+        responsive. The actions are handed to the hook in batches, like with
+        :meth:`run`, but the paths of the publishes of the next batch are checked
+        in background threads while the current batch runs, and the outcome of
+        each action is yielded as soon as its batch is done.
+
+        Unlike :meth:`run`, a batch raising an error doesn't stop the pipeline:
+        the error is reported for the actions of the batch and the next batch is
+        run. The actions the hook reported as processed through
+        :meth:`report_progress` before the error are considered loaded, the
+        error is reported for the remaining ones. If the hook doesn't report any
+        progress, the error is reported for all the actions of the batch.
+
+        :param execute_fn: Callable taking a list of actions, which runs them.
+        :returns: Generator of (action, error) tuples, where error is None if the
+                  action was run or the reason why it wasn't.
+        """
+        batches = [
+            self._actions[start : start + self._batch_size]
+            for start in range(0, len(self._actions), self._batch_size)
+        ]
+        if not batches:
+            return
+
+        pool = ThreadPool(self._num_threads)
+        try:
+            pending = pool.map_async(self._check_action, batches[0])
+            for (index, batch) in enumerate(batches):
+                reasons = pending.get()
+                # prefetch the next batch while the hook runs this one
+                if index + 1 < len(batches):
+                    pending = pool.map_async(self._check_action, batches[index + 1])
+
+                if self._cancelled:
+                    break
+
+                actions = []
+                for (action, reason) in zip(batch, reasons):
+                    if reason:
+                        self._failures.append((action, reason))
+                        yield (action, reason)
+                    else:
+                        actions.append(action)
+
+                if not actions:
+                    continue
+
+                self._batch = actions
+                self._batch_processed = 0
+                try:
+                    execute_fn(actions)
+                except ActionsCancelled as e:
+                    processed = self._batch_processed
+                    for action in actions[:processed]:
+                        yield (action, None)
+                    for action in actions[processed:]:
+                        yield (action, str(e))
+                    break
+                except Exception as e:
+                    self._app.log_exception("Could not execute actions: %s" % e)
+                    processed = self._batch_processed
+                    for action in actions[:processed]:
+                        yield (action, None)
+                    for action in actions[processed:]:
+                        self._failures.append((action, str(e)))
+                        yield (action, str(e))
+                else:
+                    for action in actions:
+                        yield (action, None)
+                finally:
+                    self._batch = []
+        finally:
+            pool.close()
+            pool.join()
+
+    def report_progress(self, processed, total, item_name=None):
+        """
+        Reports progress within the batch of actions currently being run.
+
+        :param processed: Number of actions of the batch processed so far.
+        :param total: Number of actions in the batch.
+        :param item_name: Name of the item being processed. Defaults to the name
+                          of the publish of the next action in the batch.
+        :raises ActionsCancelled: If the pipeline was cancelled.
+        """
+        if not self._batch:
+            return
+        # the hook may report progress in its own units, scale them to the batch
+        batch_size = len(self._batch)
+        if total and total != batch_size:
+            processed = int(processed * batch_size / float(total))
+        processed = max(0, min(processed, batch_size))
+        self._batch_processed = processed
+        self._raise_if_cancelled()
+        if not self._progress_fn:
+            return
+        if item_name is None and processed < batch_size:
+            sg_data = self._batch[processed]["sg_publish_data"]
+            item_name = sg_data.get("name") or "Unnamed"
+        self._progress_fn(
+            self._processed + processed, len(self._actions), item_name or ""
+        )
+        # the progress callback gives the user a chance to cancel
+        self._raise_if_cancelled()
+
+    def _raise_if_cancelled(self):
+        """
+        Stops the hook running the current batch if the pipeline was cancelled.
+
+        :raises ActionsCancelled: If the pipeline was cancelled.
+        """
+        if self._cancelled:
+            raise ActionsCancelled("The actions were cancelled.")
+
+    def _prestage(self, idle_fn):
+        """
+        Resolves the paths of all publishes in background threads and
+        weeds out the actions on publishes whose file is missing.
+
+        :param idle_fn: Optional callable invoked while waiting on the threads.
+        :returns: List of actions which can be run.
+        """
+        if len(self._actions) <= 1:
+            # not worth spinning up threads, let the hook report any issues
+            return list(self._actions)
+
+        pool = ThreadPool(min(self._num_threads, len(self._actions)))
+        try:
+            result = pool.map_async(self._check_action, self._actions)
+            while not result.ready():
+                result.wait(0.05)
+                if idle_fn:
+                    idle_fn()
+            reasons = result.get()
+        finally:
+            pool.close()
+            pool.join()
+
+        actions = []
+        for (action, reason) in zip(self._actions, reasons):
+            if reason:
+                self._failures.append((action, reason))
+            else:
+                actions.append(action)
+        return actions
+
+    def _check_action(self, action):
+        """
+        Checks if the publish an action runs on exists on disk and stores
+        its resolved path on the action. This is run in a background thread.
+
+        :param action: Action dictionary.
+        :returns: The reason why the action can't be run or None if it can.
+        """
+        sg_data = action["sg_publish_data"]
+        if not sg_data.get("path"):
+            # folder actions or publishes without any file, leave it to the hook
+            return None
+
+        try:
+            path = sgtk.util.resolve_publish_path(self._app.sgtk, sg_data)
+        except Exception:
+            # the hook will run into the same issue and report it properly
+            return None
+
+        if not path:
+            return None
+
+        action["path"] = path
+        if _SEQUENCE_TOKEN_REGEX.search(path):
+            return None
+
+        if not os.path.exists(path):
+            return "File not found: %s" % path
+
+        return None
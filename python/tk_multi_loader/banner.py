@@ -19,11 +19,23 @@ class Banner(QtGui.QLabel):
     be shown for at least 3 seconds even if a request to hide it is done before
     the time is up. The banner will always be displayed at the top of the parent
     widget's window.
+
+    The banner can also display the progress of a long running operation, see
+    :meth:`show_progress`. Progress updates are throttled, so reporting progress
+    for every single item of an operation is cheap.
+
+    :signal: ``cancel_requested()`` - Fired when the user clicks the cancel link
+             displayed with the progress of an operation.
     """
 
     # Height of the widget.
     _HEIGHT = 32
 
+    # Minimum time, in seconds, between two redraws of the progress.
+    _PROGRESS_UPDATE_INTERVAL = 0.1
+
+    cancel_requested = QtCore.Signal()
+
     def __init__(self, parent):
         """
         :param parent: Parent widget.
@@ -40,15 +52,102 @@ class Banner(QtGui.QLabel):
         """
         )
 
+        # Allow the user to click the cancel link displayed with the progress.
+        self.setTextInteractionFlags(QtCore.Qt.LinksAccessibleByMouse)
+        self.linkActivated.connect(self._on_link_activated)
+
         # Hide the widget by default.
         self.hide()
         self._banner_animation = QtCore.QSequentialAnimationGroup(self)
 
         self._show_time = 0
 
+        # State of the progress being displayed, if any.
+        self._progress = None
+        # Time at which the progress was last redrawn.
+        self._progress_render_time = 0
+        # Coalesces progress updates which arrive faster than they are redrawn.
+        self._progress_timer = QtCore.QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.timeout.connect(self._render_progress)
+
     def show_banner(self, message):
         """
         Shows the banner at the top of the widget's dialog.
+        :param message: Message to display in the banner.
+        """
+        # A message replaces any progress being displayed.
+        self._progress = None
+        self._progress_timer.stop()
+        self._show(message)
+
+    def show_progress(self, title, total, cancellable=True):
+        """
+        Shows the banner with the progress of an operation. The progress is
+        then updated with :meth:`update_progress` and the banner dismissed
+        with :meth:`finish_progress`.
+
+        :param str title: Title of the operation, can contain rich text.
+        :param int total: Number of items the operation will process.
+        :param bool cancellable: If True, a cancel link is displayed which
+                                 triggers the ``cancel_requested`` signal.
+        """
+        self._progress_timer.stop()
+        self._progress = {
+            "title": title,
+            "total": total,
+            "processed": 0,
+            "item_name": None,
+            "start_time": time.time(),
+            "cancellable": cancellable,
+            "cancelled": False,
+        }
+        self._show(self._format_progress())
+        self._progress_render_time = time.time()
+
+    def is_showing_progress(self):
+        """
+        :returns: True if the banner is displaying the progress of an operation.
+        """
+        return self._progress is not None
+
+    def update_progress(self, processed, item_name=None):
+        """
+        Updates the progress displayed by the banner. Updates coming in faster
+        than the banner is redrawn are coalesced, only the latest one is shown.
+
+        :param int processed: Number of items processed so far.
+        :param str item_name: Name of the item being processed, if any.
+        """
+        if self._progress is None:
+            return
+
+        self._progress["processed"] = processed
+        self._progress["item_name"] = item_name
+
+        elapsed = time.time() - self._progress_render_time
+        if processed >= self._progress["total"] or (
+            elapsed >= self._PROGRESS_UPDATE_INTERVAL
+        ):
+            self._render_progress()
+        elif not self._progress_timer.isActive():
+            self._progress_timer.start(
+                int((self._PROGRESS_UPDATE_INTERVAL - elapsed) * 1000)
+            )
+
+    def finish_progress(self):
+        """
+        Dismisses the banner once the operation displayed
+        by :meth:`show_progress` is over.
+        """
+        self._progress_timer.stop()
+        self._progress = None
+        self.hide_banner()
+
+    def _show(self, message):
+        """
+        Shows the banner at the top of the widget's dialog.
+
         :param message: Message to display in the banner.
         """
 
@@ -98,6 +197,69 @@ class Banner(QtGui.QLabel):
         # Launch the sliding out!
         self._banner_animation.start()
 
+    def _render_progress(self):
+        """
+        Redraws the progress with its latest state.
+        """
+        self._progress_timer.stop()
+        if self._progress is None:
+            return
+        self.setText(self._format_progress())
+        self._progress_render_time = time.time()
+
+    def _format_progress(self):
+        """
+        Formats the progress for display.
+
+        :returns: Rich text string.
+        """
+        progress = self._progress
+        processed = progress["processed"]
+        total = progress["total"]
+
+        parts = ["<b>%s</b>" % progress["title"], "%d of %d" % (processed, total)]
+        if progress["item_name"]:
+            parts.append(progress["item_name"])
+
+        elapsed = time.time() - progress["start_time"]
+        time_str = "%s elapsed" % self._format_duration(elapsed)
+        if 0 < processed < total:
+            remaining = elapsed / processed * (total - processed)
+            time_str += ", about %s left" % self._format_duration(remaining)
+        parts.append(time_str)
+
+        message = " &middot; ".join(parts)
+        if progress["cancelled"]:
+            message += " &middot; Cancelling..."
+        elif progress["cancellable"] and processed < total:
+            message += (
+                "&nbsp;&nbsp;<a href='cancel' style='color: rgb(255, 255, 255)'>"
+                "Cancel</a>"
+            )
+        return "<center>%s</center>" % message
+
+    @staticmethod
+    def _format_duration(seconds):
+        """
+        Formats a duration for display, e.g. 1:05.
+
+        :param float seconds: Duration in seconds.
+        :returns: String representation of the duration.
+        """
+        (minutes, seconds) = divmod(int(seconds), 60)
+        return "%d:%02d" % (minutes, seconds)
+
+    def _on_link_activated(self, link):
+        """
+        Called when a link in the banner is clicked.
+
+        :param str link: The link which was clicked.
+        """
+        if link == "cancel" and self._progress and not self._progress["cancelled"]:
+            self._progress["cancelled"] = True
+            self._render_progress()
+            self.cancel_requested.emit()
+
     def _calc_expanded_pos(self):
         """
         Calculates the position of the banner in the parent window. The banner
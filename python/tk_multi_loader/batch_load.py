@@ -0,0 +1,136 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Loading of publishes without any UI, e.g. from farm or build scripts.
+
+Publishes are retrieved, filtered and loaded the same way as in the loader UI:
+the ``publish_filters`` setting and the ``filter_publishes_hook`` are applied,
+only the latest version of each publish is kept, the actions are resolved from
+the ``action_mappings`` setting through the actions hook and finally run by the
+``execute_multiple_actions`` method of the actions hook.
+
+This module doesn't depend on Qt.
+"""
+
+from collections import OrderedDict
+
+from . import action_generation
+from . import constants
+from . import hook_timing
+from . import publish_query
+from .action_mappings import ActionMappings
+from .action_pipeline import ActionPipeline
+
+
+def load_latest_publishes(
+    app,
+    entity,
+    publish_types=None,
+    action_name=None,
+    filters=None,
+    batch_size=None,
+    num_threads=constants.ACTION_PRESTAGE_THREADS,
+):
+    """
+    Loads the latest publishes linked to an entity.
+
+    This is a generator: publishes are loaded as the results are consumed. If
+    they are split in batches, the files of the next batch are checked in
+    background threads while the current batch is loaded.
+
+    :param app: The loader app instance.
+    :param dict entity: Shotgun entity dictionary with keys type and id.
+    :param publish_types: Optional list of publish type names to load,
+                          e.g. ["Alembic Cache"]. Defaults to all types.
+    :param action_name: Name of the action to run, e.g. "reference". Defaults to
+                        the first action configured for each publish type.
+    :param filters: Optional list of additional Shotgun filters for the publishes.
+    :param batch_size: Number of publishes handed to the actions hook at once.
+                       If None, all the publishes are handed over at once.
+    :param num_threads: Number of threads checking the files of the publishes.
+    :returns: Generator of (sg_publish_data, error) tuples, where error is None if
+              the publish was loaded or the reason why it wasn't.
+    """
+    publish_type_field = publish_query.get_publish_type_field(app)
+
+    sg_data_list = publish_query.find_publishes(app, entity, publish_types, filters)
+    sg_data_list = publish_query.filter_publishes(app, sg_data_list)
+    sg_data_list = publish_query.get_latest_publishes(sg_data_list, publish_type_field)
+
+    app.log_debug(
+        "Loading %d publishes of %s %s."
+        % (len(sg_data_list), entity["type"], entity["id"])
+    )
+
+    # the actions hook is called once per publish type
+    publishes_per_type = OrderedDict()
+    for sg_data in sg_data_list:
+        type_link = sg_data.get(publish_type_field)
+        publish_type = type_link["name"] if type_link else "undefined"
+        publishes_per_type.setdefault(publish_type, []).append(sg_data)
+
+    mappings = ActionMappings.from_settings(app)
+    actions_hook = action_generation.get_actions_hook(app)
+
+    actions = []
+    for (publish_type, type_sg_data_list) in publishes_per_type.items():
+        action_names = mappings.get_publish_actions(publish_type)
+        if action_name is not None:
+            action_names = tuple(name for name in action_names if name == action_name)
+
+        if not action_names:
+            for sg_data in type_sg_data_list:
+                yield (sg_data, "No action configured for %s publishes." % publish_type)
+            continue
+
+        try:
+            action_defs_list = action_generation.generate_actions(
+                app, publish_type, type_sg_data_list, action_names, "main", actions_hook
+            )
+        except Exception as e:
+            app.log_exception("Could not execute generate_actions hook.")
+            for sg_data in type_sg_data_list:
+                yield (sg_data, "Could not retrieve the actions: %s" % e)
+            continue
+        for (sg_data, action_defs) in zip(type_sg_data_list, action_defs_list):
+            if not action_defs:
+                yield (sg_data, "The actions hook didn't return any action.")
+                continue
+            actions.append(
+                {
+                    "name": action_defs[0]["name"],
+                    "sg_publish_data": sg_data,
+                    "params": action_defs[0]["params"],
+                }
+            )
+
+    def execute_actions(batch):
+        """
+        Runs a batch of actions through the actions hook.
+
+        :param batch: List of action dictionaries.
+        """
+        # route the progress reported by the hook to the pipeline, so that it
+        # knows which actions were loaded if the hook fails midway
+        app.set_action_progress_handler(pipeline.report_progress)
+        try:
+            with hook_timing.get_hook_timings().span(
+                "execute_multiple_actions", batch[0]["name"]
+            ):
+                app.execute_hook_method(
+                    "actions_hook", "execute_multiple_actions", actions=batch
+                )
+        finally:
+            app.set_action_progress_handler(None)
+
+    pipeline = ActionPipeline(app, actions, batch_size, num_threads)
+    for (action, error) in pipeline.iter_run(execute_actions):
+        yield (action["sg_publish_data"], error)
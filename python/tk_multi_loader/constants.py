@@ -37,3 +37,37 @@ PUBLISHED_FILES_FIELDS = [
 # left hand side tree view search only kicks in
 # after a certain number have been typed in.
 TREE_SEARCH_TRIGGER_LENGTH = 2
+
+# maximum size, in bytes, of the on-disk cache of composited thumbnails.
+COMPOSITED_THUMBNAIL_CACHE_SIZE = 200 * 1024 * 1024
+
+# sizes, (width, height), of the composited thumbnails
+PUBLISH_THUMBNAIL_SIZE = (512, 400)
+HISTORY_THUMBNAIL_SIZE = (75, 75)
+
+# widths, in ascending order, at which the composited publish thumbnails
+# are stored. Views pick the level closest to the size they draw at.
+THUMBNAIL_PYRAMID_LEVELS = (64, 128, 256, 512)
+
+# maximum number of thumbnails requested from Shotgun at any given time
+# by the main view. Requests for items which are not visible are held back.
+MAX_CONCURRENT_THUMBNAIL_REQUESTS = 8
+
+# time in seconds after which a thumbnail request which hasn't
+# completed no longer counts against the limit above.
+THUMBNAIL_REQUEST_TIMEOUT = 30
+
+# area above and below the main view, in number of view heights, for
+# which thumbnails are requested ahead of the user scrolling to them.
+THUMBNAIL_PREFETCH_MARGIN = 1.0
+
+# number of items the main view lays out in one go before
+# handing control back to the event loop.
+PUBLISH_VIEW_LAYOUT_BATCH_SIZE = 200
+
+# number of threads resolving and checking publish paths before actions run.
+ACTION_PRESTAGE_THREADS = 8
+
+# minimum time, in seconds, between two rounds of ui event processing while
+# an action reports progress, so that repainting never slows down the load.
+ACTION_PROGRESS_EVENTS_INTERVAL = 0.05
@@ -112,11 +112,19 @@ class PublishWidget(QtGui.QWidget):
 class PublishDelegate(shotgun_view.EditSelectedWidgetDelegate):
     """
     Base class for delegates which 'glues up' the widget with a QT View. It expects
-    the ``_format_folder`` and ``_format_publish`` method to be implemented so
-    it can be rendered correctly. The derived class only needs to worry about
-    how things get rendered.
+    the ``_format_folder`` and ``_format_publish`` method to be implemented, returning
+    the header and body text of an item, so it can be rendered correctly. The derived
+    class only needs to worry about how things get rendered.
+
+    Rendering a widget is expensive, so only selected items are drawn through
+    the widget. All other items are drawn directly with a QPainter by the
+    ``_paint_item`` and ``_layout_text`` methods, which derived classes override
+    to mimic the look of their widget.
     """
 
+    # maximum number of rows for which display data is cached
+    _MAX_CACHED_ROWS = 5000
+
     def __init__(self, view, action_manager):
         """
         Constructor
@@ -127,8 +135,23 @@ class PublishDelegate(shotgun_view.EditSelectedWidgetDelegate):
         self._action_manager = action_manager
         self._view = view
         self._sub_items_mode = False
+        # all items share the same size, which is only recomputed
+        # when the layout of the view changes.
+        self._item_size = None
         shotgun_view.EditSelectedWidgetDelegate.__init__(self, view)
 
+        # display strings and text layouts are computed once per row and
+        # reused until the underlying data changes.
+        # id(item) -> {"item": item, "text": (header, body), "layouts": {size: layout}}
+        self._row_cache = {}
+
+        source_model = view.model()
+        while hasattr(source_model, "sourceModel"):
+            source_model = source_model.sourceModel()
+        source_model.dataChanged.connect(self._on_source_data_changed)
+        source_model.modelReset.connect(self._clear_row_cache)
+        source_model.rowsRemoved.connect(self._clear_row_cache)
+
     def set_sub_items_mode(self, enabled):
         """
         Enables rendering of cells in to work with the sub items
@@ -137,8 +160,290 @@ class PublishDelegate(shotgun_view.EditSelectedWidgetDelegate):
 
         :param enabled: True if subitems mode is enabled, false if not
         """
+        if enabled != self._sub_items_mode:
+            # the text displayed for publishes depends on the mode
+            self._clear_row_cache()
         self._sub_items_mode = enabled
 
+    def paint(self, painter, style_options, model_index):
+        """
+        Paints an item in the view.
+
+        Selected items are interactive and are rendered by the base class through
+        the full widget. All other items are drawn directly, which is a lot cheaper
+        when scrolling through large numbers of items.
+
+        :param painter: QPainter to draw with
+        :param style_options: QT style options
+        :param model_index: The model index to paint
+        """
+        if self._view.selectionModel().isSelected(model_index):
+            shotgun_view.EditSelectedWidgetDelegate.paint(
+                self, painter, style_options, model_index
+            )
+            return
+
+        rect = style_options.rect
+
+        # lay out the text once per row and item size
+        row_cache = self._get_row_cache(model_index)
+        size_key = (rect.width(), rect.height())
+        text_layout = row_cache["layouts"].get(size_key)
+        if text_layout is None:
+            (header, body) = row_cache["text"]
+            text_layout = self._layout_text(rect.size(), header, body)
+            # items are all drawn at the same size, only keep the current layout
+            row_cache["layouts"] = {size_key: text_layout}
+
+        thumbnail = self._get_thumbnail(model_index)
+
+        painter.save()
+        try:
+            painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+            self._paint_item(painter, rect, thumbnail)
+            for (document, document_rect) in text_layout:
+                self._draw_text_document(
+                    painter, document, document_rect.translated(rect.topLeft())
+                )
+        finally:
+            painter.restore()
+
+    def get_thumbnail_width(self):
+        """
+        Returns the width at which this delegate draws thumbnails. By default,
+        this is the width of the icon size property of the view.
+
+        :returns: Width in pixels.
+        """
+        return self._view.iconSize().width()
+
+    def update_item_size(self):
+        """
+        Recomputes the size of the items drawn by this delegate. This should
+        be called whenever a setting the size depends on, e.g. the icon size
+        of the view, changes.
+        """
+        self._item_size = self._calculate_item_size()
+
+    def sizeHint(self, style_options, model_index):
+        """
+        Specify the size of the item.
+
+        Every item is drawn at the same size, so the view can lay out
+        items without this being computed for each of them.
+
+        :param style_options: QT style options
+        :param model_index: Model item to operate on
+        """
+        if self._item_size is None:
+            self.update_item_size()
+        return self._item_size
+
+    def _calculate_item_size(self):
+        """
+        Calculates the size of the items drawn by this delegate. By default,
+        this is the size hint of the widget used for selected items.
+
+        :returns: QSize
+        """
+        widget = self._create_widget(self._view)
+        try:
+            return widget.sizeHint()
+        finally:
+            widget.deleteLater()
+
+    def _paint_item(self, painter, rect, thumbnail):
+        """
+        Draws the frame and thumbnail of an item which isn't selected. Deriving
+        classes should render the same way as their widget does. By default, the
+        thumbnail is drawn on the left of the frame, scaled to fit its height.
+
+        :param painter: QPainter to draw with
+        :param rect: QRect to draw the item in
+        :param thumbnail: QPixmap with the thumbnail or None
+        """
+        self._draw_frame(painter, rect)
+        if thumbnail is not None:
+            painter.drawPixmap(self._get_default_thumbnail_rect(rect), thumbnail)
+
+    def _layout_text(self, size, header, body):
+        """
+        Lays out the text of an item which isn't selected. Deriving classes should
+        render the same way as their widget does. By default, the header and body
+        are drawn on two lines to the right of the thumbnail.
+
+        :param size: QSize of the item
+        :param header: Header text as string
+        :param body: Body text as string
+        :returns: List of (QTextDocument, QRect) tuples, with rectangles
+                  relative to the top left corner of the item.
+        """
+        rect = QtCore.QRect(QtCore.QPoint(0, 0), size)
+        contents = rect.adjusted(4, 4, -4, -4)
+        text_left = self._get_default_thumbnail_rect(rect).right() + 5
+        text_rect = QtCore.QRect(
+            text_left,
+            contents.top(),
+            max(contents.right() - text_left, 1),
+            contents.height(),
+        )
+        document = self._create_text_document(
+            "<b>%s</b><br>%s" % (header, body), self._view.font(), text_rect.width()
+        )
+        return [(document, text_rect)]
+
+    def _get_default_thumbnail_rect(self, rect):
+        """
+        :param rect: QRect of the item
+        :returns: QRect of the thumbnail drawn by the default implementation of
+                  :meth:`_paint_item`, keeping the 512x400 proportions.
+        """
+        contents = rect.adjusted(4, 4, -4, -4)
+        height = min(contents.height(), int(contents.width() * 0.78125))
+        return QtCore.QRect(contents.left(), contents.top(), int(height * 1.28), height)
+
+    def _draw_frame(self, painter, rect):
+        """
+        Draws a frame looking like the raised, styled panel
+        which surrounds the contents of the widgets.
+
+        :param painter: QPainter to draw with
+        :param rect: QRect of the frame
+        """
+        frame_option = QtGui.QStyleOptionFrame()
+        frame_option.rect = rect
+        frame_option.palette = self._view.palette()
+        frame_option.lineWidth = 1
+        frame_option.midLineWidth = 0
+        frame_option.state = QtGui.QStyle.State_Enabled | QtGui.QStyle.State_Raised
+        self._view.style().drawPrimitive(
+            QtGui.QStyle.PE_Frame, frame_option, painter, self._view
+        )
+
+    def _create_text_document(self, text, font, width=None):
+        """
+        Lays out a piece of rich text the same way a label would.
+
+        :param text: Text to lay out, possibly containing html markup.
+        :param font: QFont to render the text with.
+        :param width: Width to wrap the text at. If None, the text isn't wrapped.
+        :returns: QTextDocument
+        """
+        document = QtGui.QTextDocument()
+        document.setDocumentMargin(0)
+        document.setDefaultFont(font)
+        document.setHtml(text)
+        if width is not None:
+            document.setTextWidth(width)
+        return document
+
+    def _draw_text_document(self, painter, document, rect):
+        """
+        Draws a text document, clipped to a rectangle.
+
+        :param painter: QPainter to draw with
+        :param document: QTextDocument to draw
+        :param rect: QRect to draw the document in
+        """
+        painter.save()
+        try:
+            painter.translate(rect.topLeft())
+            # labels draw their text using the window text color
+            palette = QtGui.QPalette(self._view.palette())
+            palette.setColor(
+                QtGui.QPalette.Text, palette.color(QtGui.QPalette.WindowText)
+            )
+            context = QtGui.QAbstractTextDocumentLayout.PaintContext()
+            context.palette = palette
+            context.clip = QtCore.QRectF(0, 0, rect.width(), rect.height())
+            painter.setClipRect(context.clip)
+            document.documentLayout().draw(painter, context)
+        finally:
+            painter.restore()
+
+    def _get_text(self, model_index):
+        """
+        Returns the text to display for an item.
+
+        :param model_index: The model index to operate on
+        :returns: Tuple with the header and body text.
+        """
+        return self._get_row_cache(model_index)["text"]
+
+    def _get_row_cache(self, model_index):
+        """
+        Returns the cached display data for a row, computing the
+        display strings if the row hasn't been displayed before.
+
+        :param model_index: The model index to operate on
+        :returns: Dictionary with keys item, text and layouts.
+        """
+        source_index = self._get_source_index(model_index)
+        item = source_index.model().itemFromIndex(source_index)
+
+        row_cache = self._row_cache.get(id(item))
+        if row_cache is None:
+            if len(self._row_cache) >= self._MAX_CACHED_ROWS:
+                self._row_cache.clear()
+
+            if shotgun_model.get_sanitized_data(
+                model_index, SgLatestPublishModel.IS_FOLDER_ROLE
+            ):
+                text = self._format_folder(model_index)
+            else:
+                text = self._format_publish(model_index)
+
+            # keep a reference to the item so that its id remains unique
+            row_cache = {"item": item, "text": text, "layouts": {}}
+            self._row_cache[id(item)] = row_cache
+
+        return row_cache
+
+    def _clear_row_cache(self, *args):
+        """
+        Discards all cached display strings and text layouts.
+        """
+        self._row_cache.clear()
+
+    def _on_source_data_changed(self, top_left, bottom_right, *args):
+        """
+        Discards the cached display data of rows which have changed.
+
+        :param top_left: Index of the first changed item
+        :param bottom_right: Index of the last changed item
+        """
+        model = top_left.model()
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            item = model.itemFromIndex(model.index(row, 0, top_left.parent()))
+            self._row_cache.pop(id(item), None)
+
+    def _get_source_index(self, model_index):
+        """
+        Translates an index of the view into an index of the underlying model.
+
+        :param model_index: The model index to translate
+        :returns: QModelIndex
+        """
+        source_index = model_index
+        while hasattr(source_index.model(), "mapToSource"):
+            source_index = source_index.model().mapToSource(source_index)
+        return source_index
+
+    def _get_thumbnail(self, model_index):
+        """
+        Retrieves the thumbnail for an index at a resolution suitable
+        for the size this delegate draws thumbnails at.
+
+        :param model_index: The model index to operate on
+        :returns: QPixmap or None if the item has no thumbnail.
+        """
+        # the incoming model index is an index into our proxy model,
+        # thumbnails are handled by the underlying model
+        source_index = self._get_source_index(model_index)
+        return source_index.model().get_thumbnail(
+            source_index, self.get_thumbnail_width()
+        )
+
     def _on_before_selection(self, widget, model_index, style_options):
         """
         Called when the associated widget is selected. This method
@@ -202,15 +507,9 @@ class PublishDelegate(shotgun_view.EditSelectedWidgetDelegate):
         else:
             widget.set_button_visible(False)
 
-        icon = shotgun_model.get_sanitized_data(model_index, QtCore.Qt.DecorationRole)
-
-        if icon:
-            thumb = icon.pixmap(512)
+        thumb = self._get_thumbnail(model_index)
+        if thumb is not None:
             widget.set_thumbnail(thumb)
 
-        if shotgun_model.get_sanitized_data(
-            model_index, SgLatestPublishModel.IS_FOLDER_ROLE
-        ):
-            self._format_folder(model_index, widget)
-        else:
-            self._format_publish(model_index, widget)
+        (header, body) = self._get_text(model_index)
+        widget.set_text(header, body)
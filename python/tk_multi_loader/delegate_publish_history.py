@@ -132,6 +132,9 @@ class SgPublishHistoryDelegate(shotgun_view.EditSelectedWidgetDelegate):
     Delegate which 'glues up' the Details Widget with a QT View.
     """
 
+    # maximum number of publishes for which display strings are cached
+    _MAX_CACHED_TEXTS = 1000
+
     def __init__(self, view, status_model, action_manager):
         """
         Constructor
@@ -142,6 +145,9 @@ class SgPublishHistoryDelegate(shotgun_view.EditSelectedWidgetDelegate):
         shotgun_view.EditSelectedWidgetDelegate.__init__(self, view)
         self._status_model = status_model
         self._action_manager = action_manager
+        # the display strings only depend on a handful of publish fields,
+        # so cache them keyed by the values of these fields.
+        self._text_cache = {}
 
     def _create_widget(self, parent):
         """
@@ -212,7 +218,40 @@ class SgPublishHistoryDelegate(shotgun_view.EditSelectedWidgetDelegate):
         # but I guess that's inevitable here...
 
         sg_item = shotgun_model.get_sg_data(model_index)
+        (header_str, body_str) = self._get_text(sg_item)
+        widget.set_text(header_str, body_str)
+
+    def _get_text(self, sg_item):
+        """
+        Returns the header and body text for a publish, formatting
+        them only the first time a given publish is displayed.
+
+        :param sg_item: Shotgun data for the publish
+        :returns: Tuple with the header and body text.
+        """
+        created_by = sg_item.get("created_by")
+        cache_key = (
+            sg_item.get("id"),
+            sg_item.get("version_number"),
+            sg_item.get("created_at"),
+            sg_item.get("description"),
+            created_by.get("name") if created_by else None,
+        )
+        text = self._text_cache.get(cache_key)
+        if text is None:
+            if len(self._text_cache) >= self._MAX_CACHED_TEXTS:
+                self._text_cache.clear()
+            text = self._format_text(sg_item)
+            self._text_cache[cache_key] = text
+        return text
+
+    def _format_text(self, sg_item):
+        """
+        Formats the header and body text for a publish.
 
+        :param sg_item: Shotgun data for the publish
+        :returns: Tuple with the header and body text.
+        """
         # First do the header - this is on the form
         # v004 (2014-02-21 12:34)
 
@@ -238,7 +277,7 @@ class SgPublishHistoryDelegate(shotgun_view.EditSelectedWidgetDelegate):
         else:
             author_str = "Unspecified User"
         body_str = "<i>%s</i>: %s<br>" % (author_str, desc_str)
-        widget.set_text(header_str, body_str)
+        return (header_str, body_str)
 
     def sizeHint(self, style_options, model_index):
         """
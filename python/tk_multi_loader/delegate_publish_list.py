@@ -74,12 +74,91 @@ class SgPublishListDelegate(PublishDelegate):
         """
         return PublishListWidget(parent)
 
-    def _format_folder(self, model_index, widget):
+    def get_thumbnail_width(self):
         """
-        Formats the associated widget as a folder item.
+        Returns the width at which this delegate draws thumbnails.
+
+        :returns: Width in pixels.
+        """
+        # the thumbnail label in the list widget has a fixed size of 50x40
+        return 50
+
+    def _paint_item(self, painter, rect, thumbnail):
+        """
+        Draws the frame and thumbnail of an item which isn't selected,
+        mimicking the layout of the :class:`PublishListWidget`.
+
+        :param painter: QPainter to draw with
+        :param rect: QRect to draw the item in
+        :param thumbnail: QPixmap with the thumbnail or None
+        """
+        # widget margins
+        self._draw_frame(painter, rect.adjusted(1, 1, -1, -1))
+        if thumbnail is not None:
+            painter.drawPixmap(self._get_thumbnail_rect(rect), thumbnail)
+
+    def _layout_text(self, size, header, body):
+        """
+        Lays out the text of an item which isn't selected,
+        mimicking the layout of the :class:`PublishListWidget`.
+
+        :param size: QSize of the item
+        :param header: Header text as string
+        :param body: Body text as string
+        :returns: List of (QTextDocument, QRect) tuples, with rectangles
+                  relative to the top left corner of the item.
+        """
+        rect = QtCore.QRect(QtCore.QPoint(0, 0), size)
+        contents = self._get_contents_rect(rect)
+        thumbnail_rect = self._get_thumbnail_rect(rect)
+
+        # two word wrapped labels next to the thumbnail, centered vertically as a block
+        text_left = thumbnail_rect.right() + 11
+        text_width = max(contents.right() - text_left, 1)
+
+        header_font = QtGui.QFont(self._view.font())
+        header_font.setPixelSize(11)
+        header_document = self._create_text_document(header, header_font, text_width)
+
+        body_font = QtGui.QFont(self._view.font())
+        body_font.setPixelSize(10)
+        body_document = self._create_text_document(body, body_font, text_width)
+
+        header_height = int(header_document.size().height())
+        body_height = int(body_document.size().height())
+        top = contents.center().y() - (header_height + 2 + body_height) // 2
+
+        return [
+            (header_document, QtCore.QRect(text_left, top, text_width, header_height),),
+            (
+                body_document,
+                QtCore.QRect(
+                    text_left, top + header_height + 2, text_width, body_height
+                ),
+            ),
+        ]
+
+    def _get_contents_rect(self, rect):
+        """
+        :param rect: QRect of the item
+        :returns: QRect inside the margins, frame and layout margins of the widget.
+        """
+        return rect.adjusted(12, 4, -12, -4)
+
+    def _get_thumbnail_rect(self, rect):
+        """
+        :param rect: QRect of the item
+        :returns: QRect of the fixed size thumbnail, centered vertically.
+        """
+        contents = self._get_contents_rect(rect)
+        return QtCore.QRect(contents.left(), contents.center().y() - 19, 50, 40)
+
+    def _format_folder(self, model_index):
+        """
+        Computes the text to display for a folder item.
 
         :param model_index: Model index to process
-        :param widget: widget to adjust
+        :returns: Tuple with the main and small text.
         """
 
         # Extract the Shotgun data and field value from the model index.
@@ -134,14 +213,14 @@ class SgPublishListDelegate(PublishDelegate):
             )
             small_text = sg_data.get("description") or "No description given."
 
-        widget.set_text(main_text, small_text)
+        return (main_text, small_text)
 
-    def _format_publish(self, model_index, widget):
+    def _format_publish(self, model_index):
         """
-        Formats the associated widget as a publish item.
+        Computes the text to display for a publish item.
 
         :param model_index: Model index to process
-        :param widget: widget to adjust
+        :returns: Tuple with the main and small text.
         """
 
         # example data:
@@ -239,13 +318,12 @@ class SgPublishListDelegate(PublishDelegate):
             author_str,
             date_str,
         )
-        widget.set_text(main_text, small_text)
+        return (main_text, small_text)
 
-    def sizeHint(self, style_options, model_index):
+    def _calculate_item_size(self):
         """
-        Specify the size of the item.
+        Calculates the size of the items drawn by this delegate.
 
-        :param style_options: QT style options
-        :param model_index: Model item to operate on
+        :returns: QSize
         """
         return PublishListWidget.calculate_size()
@@ -41,6 +41,9 @@ class PublishThumbWidget(PublishWidget):
         """
         PublishWidget.__init__(self, Ui_PublishThumbWidget, parent)
 
+    # the label displays the header in bold and the body on a second line
+    TEXT_FORMAT = "<b>%s</b><br>%s"
+
     def set_text(self, header, body):
         """
         Populate the lines of text in the widget
@@ -48,7 +51,7 @@ class PublishThumbWidget(PublishWidget):
         :param header: Header text as string
         :param body: Body text as string
         """
-        msg = "<b>%s</b><br>%s" % (header, body)
+        msg = self.TEXT_FORMAT % (header, body)
         self.ui.label.setText(msg)
 
     @staticmethod
@@ -78,12 +81,83 @@ class SgPublishThumbDelegate(PublishDelegate):
         """
         return PublishThumbWidget(parent)
 
-    def _format_folder(self, model_index, widget):
+    def get_thumbnail_width(self):
+        """
+        Returns the width at which this delegate draws thumbnails.
+
+        :returns: Width in pixels.
+        """
+        # thumbnails span the width of the widget, which is driven
+        # by the icon size property of the view
+        return self._view.iconSize().width()
+
+    def _paint_item(self, painter, rect, thumbnail):
+        """
+        Draws the frame and thumbnail of an item which isn't selected,
+        mimicking the layout of the :class:`PublishThumbWidget`.
+
+        :param painter: QPainter to draw with
+        :param rect: QRect to draw the item in
+        :param thumbnail: QPixmap with the thumbnail or None
+        """
+        self._draw_frame(painter, rect)
+        if thumbnail is not None:
+            painter.drawPixmap(self._get_thumbnail_rect(rect), thumbnail)
+
+    def _layout_text(self, size, header, body):
+        """
+        Lays out the text of an item which isn't selected,
+        mimicking the layout of the :class:`PublishThumbWidget`.
+
+        :param size: QSize of the item
+        :param header: Header text as string
+        :param body: Body text as string
+        :returns: List of (QTextDocument, QRect) tuples, with rectangles
+                  relative to the top left corner of the item.
+        """
+        rect = QtCore.QRect(QtCore.QPoint(0, 0), size)
+        contents = self._get_contents_rect(rect)
+        thumbnail_rect = self._get_thumbnail_rect(rect)
+
+        # text goes underneath the thumbnail, unwrapped and clipped like in the label
+        text_rect = QtCore.QRect(
+            contents.left() + 2,
+            thumbnail_rect.bottom() + 1,
+            contents.width() - 4,
+            contents.bottom() - thumbnail_rect.bottom() - 2,
+        )
+        document = self._create_text_document(
+            PublishThumbWidget.TEXT_FORMAT % (header, body), self._view.font()
+        )
+        return [(document, text_rect)]
+
+    def _get_contents_rect(self, rect):
+        """
+        :param rect: QRect of the item
+        :returns: QRect inside the frame and layout margins of the widget.
+        """
+        return rect.adjusted(4, 4, -4, -4)
+
+    def _get_thumbnail_rect(self, rect):
+        """
+        :param rect: QRect of the item
+        :returns: QRect of the thumbnail, which spans the width of the
+                  widget while keeping the 512x400 proportions.
+        """
+        contents = self._get_contents_rect(rect)
+        return QtCore.QRect(
+            contents.left(),
+            contents.top(),
+            contents.width(),
+            min(int(contents.width() * 0.78125), contents.height()),
+        )
+
+    def _format_folder(self, model_index):
         """
-        Formats the associated widget as a folder item.
+        Computes the text to display for a folder item.
 
         :param model_index: Index of the item being drawn by the delegate.
-        :param widget: Qt widget created by the delegate for rendering.
+        :returns: Tuple with the header and body text.
         """
 
         # Extract the Shotgun data and field value from the model index.
@@ -126,14 +200,14 @@ class SgPublishThumbDelegate(PublishDelegate):
             # other value (e.g. intermediary non-entity link node like sg_asset_type)
             header_text = field_value
 
-        widget.set_text(header_text, details_text)
+        return (header_text, details_text)
 
-    def _format_publish(self, model_index, widget):
+    def _format_publish(self, model_index):
         """
-        Formats the associated widget as a publish.
+        Computes the text to display for a publish item.
 
         :param model_index: Index of the item being drawn by the delegate.
-        :param widget: Qt widget created by the delegate for rendering.
+        :returns: Tuple with the header and body text.
         """
 
         # this is a publish!
@@ -237,14 +311,13 @@ class SgPublishThumbDelegate(PublishDelegate):
                 model_index, SgLatestPublishModel.PUBLISH_TYPE_NAME_ROLE
             )
 
-        widget.set_text(header_text, details_text)
+        return (header_text, details_text)
 
-    def sizeHint(self, style_options, model_index):
+    def _calculate_item_size(self):
         """
-        Specify the size of the item.
+        Calculates the size of the items drawn by this delegate.
 
-        :param style_options: QT style options
-        :param model_index: Model item to operate on
+        :returns: QSize
         """
         # base the size of each element off the icon size property of the view
         scale_factor = self._view.iconSize().width()
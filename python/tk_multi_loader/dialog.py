@@ -27,9 +27,11 @@ from .delegate_publish_history import SgPublishHistoryDelegate
 from .search_widget import SearchWidget
 from .banner import Banner
 from .loader_action_manager import LoaderActionManager
-from .utils import resolve_filters
+from .utils import resolve_filters, VisibleRowsTracker
 
 from . import constants
+from . import resource_cache
+from . import hook_timing
 from . import model_item_data
 
 from .ui.dialog import Ui_Dialog
@@ -86,9 +88,16 @@ class AppDialog(QtGui.QWidget):
         # We will support the banners only for the default loader.
         if isinstance(action_manager, LoaderActionManager):
             self._action_banner = Banner(self)
+            # title of the action being executed, displayed with its progress
+            self._current_action_title = ""
             self._action_manager.pre_execute_action.connect(self._pre_execute_action)
             self._action_manager.post_execute_action.connect(
-                lambda _: self._action_banner.hide_banner()
+                lambda _: self._action_banner.finish_progress()
+            )
+            self._action_manager.action_progress.connect(self._on_action_progress)
+            self._action_manager.action_failures.connect(self._on_action_failures)
+            self._action_banner.cancel_requested.connect(
+                self._action_manager.cancel_actions
             )
 
         # create a settings manager where we can pull and push prefs later
@@ -168,11 +177,15 @@ class AppDialog(QtGui.QWidget):
             self._on_history_selection
         )
 
-        self._multiple_publishes_pixmap = QtGui.QPixmap(
+        self._multiple_publishes_pixmap = resource_cache.get_pixmap(
             ":/res/multiple_publishes_512x400.png"
         )
-        self._no_selection_pixmap = QtGui.QPixmap(":/res/no_item_selected_512x400.png")
-        self._no_pubs_found_icon = QtGui.QPixmap(":/res/no_publishes_found.png")
+        self._no_selection_pixmap = resource_cache.get_pixmap(
+            ":/res/no_item_selected_512x400.png"
+        )
+        self._no_pubs_found_icon = resource_cache.get_pixmap(
+            ":/res/no_publishes_found.png"
+        )
 
         self.ui.detail_playback_btn.clicked.connect(self._on_detail_version_playback)
         self._current_version_detail_playback_url = None
@@ -224,6 +237,19 @@ class AppDialog(QtGui.QWidget):
         # hook up view -> proxy model -> model
         self.ui.publish_view.setModel(self._publish_proxy_model)
 
+        # all publishes are drawn at the same size, so lay them out in batches
+        # to keep the ui responsive when large numbers of publishes are loaded.
+        self.ui.publish_view.setLayoutMode(QtGui.QListView.Batched)
+        self.ui.publish_view.setBatchSize(constants.PUBLISH_VIEW_LAYOUT_BATCH_SIZE)
+
+        # only request thumbnails for the publishes the user can actually see
+        self._publish_view_tracker = VisibleRowsTracker(
+            self.ui.publish_view, constants.THUMBNAIL_PREFETCH_MARGIN, self
+        )
+        self._publish_view_tracker.visible_indexes_changed.connect(
+            self._publish_model.set_thumbnail_priorities
+        )
+
         # set up custom delegates to use when drawing the main area
         self._publish_thumb_delegate = SgPublishThumbDelegate(
             self.ui.publish_view, self._action_manager
@@ -297,6 +323,7 @@ class AppDialog(QtGui.QWidget):
         # position both slider and view
         self.ui.thumb_scale.setValue(scale_val)
         self.ui.publish_view.setIconSize(QtCore.QSize(scale_val, scale_val))
+        self._update_thumbnail_width()
         # and track subsequent changes
         self.ui.thumb_scale.valueChanged.connect(self._on_thumb_size_slider_change)
 
@@ -327,6 +354,10 @@ class AppDialog(QtGui.QWidget):
         self._reload_action.triggered.connect(self._on_reload_action)
         self.ui.cog_button.addAction(self._reload_action)
 
+        self._hook_timings_action = QtGui.QAction("Show Hook Timings", self)
+        self._hook_timings_action.triggered.connect(self._on_hook_timings_action)
+        self.ui.cog_button.addAction(self._hook_timings_action)
+
         #################################################
         # set up preset tabs and load and init tree views
         self._entity_presets = {}
@@ -419,7 +450,7 @@ class AppDialog(QtGui.QWidget):
         need to be called here.
         """
         # display exit splash screen
-        splash_pix = QtGui.QPixmap(":/res/exit_splash.png")
+        splash_pix = resource_cache.get_pixmap(":/res/exit_splash.png")
         splash = QtGui.QSplashScreen(splash_pix, QtCore.Qt.WindowStaysOnTopHint)
         splash.setMask(splash_pix.mask())
         splash.show()
@@ -518,12 +549,12 @@ class AppDialog(QtGui.QWidget):
         """
         if self.ui.search_publishes.isChecked():
             self.ui.search_publishes.setIcon(
-                QtGui.QIcon(QtGui.QPixmap(":/res/search_active.png"))
+                resource_cache.get_icon(":/res/search_active.png")
             )
             self._search_widget.enable()
         else:
             self.ui.search_publishes.setIcon(
-                QtGui.QIcon(QtGui.QPixmap(":/res/search.png"))
+                resource_cache.get_icon(":/res/search.png")
             )
             self._search_widget.disable()
 
@@ -547,11 +578,11 @@ class AppDialog(QtGui.QWidget):
         """
         if mode == self.MAIN_VIEW_LIST:
             self.ui.list_mode.setIcon(
-                QtGui.QIcon(QtGui.QPixmap(":/res/mode_switch_card_active.png"))
+                resource_cache.get_icon(":/res/mode_switch_card_active.png")
             )
             self.ui.list_mode.setChecked(True)
             self.ui.thumbnail_mode.setIcon(
-                QtGui.QIcon(QtGui.QPixmap(":/res/mode_switch_thumb.png"))
+                resource_cache.get_icon(":/res/mode_switch_thumb.png")
             )
             self.ui.thumbnail_mode.setChecked(False)
             self.ui.publish_view.setViewMode(QtGui.QListView.ListMode)
@@ -559,11 +590,11 @@ class AppDialog(QtGui.QWidget):
             self._show_thumb_scale(False)
         elif mode == self.MAIN_VIEW_THUMB:
             self.ui.list_mode.setIcon(
-                QtGui.QIcon(QtGui.QPixmap(":/res/mode_switch_card.png"))
+                resource_cache.get_icon(":/res/mode_switch_card.png")
             )
             self.ui.list_mode.setChecked(False)
             self.ui.thumbnail_mode.setIcon(
-                QtGui.QIcon(QtGui.QPixmap(":/res/mode_switch_thumb_active.png"))
+                resource_cache.get_icon(":/res/mode_switch_thumb_active.png")
             )
             self.ui.thumbnail_mode.setChecked(True)
             self.ui.publish_view.setViewMode(QtGui.QListView.IconMode)
@@ -574,6 +605,7 @@ class AppDialog(QtGui.QWidget):
 
         self.ui.publish_view.selectionModel().clear()
         self._settings_manager.store("main_view_mode", mode)
+        self._update_thumbnail_width()
 
     def _show_thumb_scale(self, is_visible):
         """
@@ -678,7 +710,9 @@ class AppDialog(QtGui.QWidget):
             item = source_index.model().itemFromIndex(source_index)
 
             # render out details
-            thumb_pixmap = item.icon().pixmap(512)
+            thumb_pixmap = source_index.model().get_thumbnail(
+                source_index, 512, keep=False
+            )
             self.ui.details_image.setPixmap(thumb_pixmap)
 
             sg_data = item.get_sg_data()
@@ -1022,6 +1056,18 @@ class AppDialog(QtGui.QWidget):
         """
         self.ui.publish_view.setIconSize(QtCore.QSize(value, value))
         self._settings_manager.store("thumb_size_scale", value)
+        self._update_thumbnail_width()
+
+    def _update_thumbnail_width(self):
+        """
+        Lets the publish delegate and model know at which size the
+        main view currently displays items and thumbnails.
+        """
+        delegate = self.ui.publish_view.itemDelegate()
+        delegate.update_item_size()
+        self._publish_model.set_thumbnail_width(delegate.get_thumbnail_width())
+        # the layout of the view changed, so the visible items most likely did too
+        self._publish_view_tracker.schedule_update()
 
     def _on_publish_selection(self, selected, deselected):
         """
@@ -1080,6 +1126,7 @@ class AppDialog(QtGui.QWidget):
 
         :param action: The QAction that is being executed.
         """
+        self._current_action_title = action.text()
         data = action.data()
 
         # If there is a single item, we'll put its name in the banner.
@@ -1106,6 +1153,31 @@ class AppDialog(QtGui.QWidget):
         self.window().repaint()
         QtGui.QApplication.processEvents()
 
+    def _on_action_progress(self, processed, total, name):
+        """
+        Called while a custom action runs on several publishes.
+
+        :param int processed: Number of publishes processed so far.
+        :param int total: Total number of publishes.
+        :param str name: Name of the publish being loaded.
+        """
+        if not self._action_banner.is_showing_progress():
+            self._action_banner.show_progress(
+                "Action %s" % self._current_action_title, total
+            )
+        self._action_banner.update_progress(processed, name)
+
+    def _on_action_failures(self, failures):
+        """
+        Called after a custom action ran if some of the publishes were skipped.
+
+        :param list failures: List of (publish name, reason) tuples.
+        """
+        self._action_banner.show_banner(
+            "<center>%d of the selected items could not be loaded. "
+            "See the log for details.</center>" % len(failures)
+        )
+
     def show_help_popup(self):
         """
         Someone clicked the show help screen action
@@ -1127,10 +1199,25 @@ class AppDialog(QtGui.QWidget):
         app.log_debug("Opening documentation url %s..." % app.documentation_url)
         QtGui.QDesktopServices.openUrl(QtCore.QUrl(app.documentation_url))
 
+    def _on_hook_timings_action(self):
+        """
+        Someone clicked the show hook timings action
+        """
+        summary = hook_timing.get_hook_timings().get_summary()
+        app = sgtk.platform.current_bundle()
+        app.log_info("Loader hook timings:\n%s" % summary)
+
+        msg_box = QtGui.QMessageBox(self)
+        msg_box.setWindowTitle("Hook Timings")
+        msg_box.setText("Time spent in the loader hooks during this session.")
+        msg_box.setDetailedText(summary)
+        msg_box.exec_()
+
     def _on_reload_action(self):
         """
         Hard reload all caches
         """
+        self._action_manager.invalidate_action_cache()
         self._status_model.hard_refresh()
         self._publish_history_model.hard_refresh()
         self._publish_type_model.hard_refresh()
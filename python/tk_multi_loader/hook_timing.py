@@ -0,0 +1,172 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+In-process timing of the hooks called by the loader.
+"""
+
+import contextlib
+import threading
+import time
+
+import sgtk
+
+# upper bounds, in seconds, of the buckets of the timing histograms.
+_HISTOGRAM_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float("inf"))
+
+
+class HookTimings(object):
+    """
+    Records how long hook calls take.
+
+    Each call is recorded under the name of the hook method and an optional
+    detail, e.g. the name of the action being executed, so that the cost of
+    individual actions can be told apart. Calls taking longer than the slow
+    threshold are logged as they happen.
+    """
+
+    def __init__(self, app, slow_threshold):
+        """
+        :param app: The loader app instance.
+        :param slow_threshold: Duration in seconds above which hook calls are
+                               logged. Calls are never logged if this is 0.
+        """
+        self._app = app
+        self._slow_threshold = slow_threshold
+        # hooks may be called from background threads, e.g. filter_publishes
+        self._lock = threading.Lock()
+        # (hook name, detail) -> dict with count, total, max and histogram
+        self._stats = {}
+
+    @contextlib.contextmanager
+    def span(self, hook_name, detail=None):
+        """
+        Context manager timing the code it wraps, e.g.::
+
+            with timings.span("generate_actions", "Maya Scene"):
+                app.execute_hook_method(...)
+
+        :param str hook_name: Name of the hook method being called.
+        :param str detail: Optional detail the call is recorded under.
+        """
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            self.record(hook_name, detail, time.time() - start_time)
+
+    def record(self, hook_name, detail, duration):
+        """
+        Records the duration of a hook call.
+
+        :param str hook_name: Name of the hook method which was called.
+        :param str detail: Detail the call is recorded under, or None.
+        :param float duration: Duration of the call, in seconds.
+        """
+        key = (hook_name, detail)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = {
+                    "count": 0,
+                    "total": 0.0,
+                    "max": 0.0,
+                    "histogram": [0] * len(_HISTOGRAM_BUCKETS),
+                }
+                self._stats[key] = stats
+            stats["count"] += 1
+            stats["total"] += duration
+            stats["max"] = max(stats["max"], duration)
+            for (index, upper_bound) in enumerate(_HISTOGRAM_BUCKETS):
+                if duration <= upper_bound:
+                    stats["histogram"][index] += 1
+                    break
+
+        if self._slow_threshold and duration >= self._slow_threshold:
+            self._app.log_warning(
+                "Slow hook call: %s took %.3fs."
+                % (self._format_key(hook_name, detail), duration)
+            )
+
+    def reset(self):
+        """
+        Discards all the recorded timings.
+        """
+        with self._lock:
+            self._stats = {}
+
+    def get_summary(self):
+        """
+        Returns a plain text report of the recorded timings, slowest hooks first.
+
+        :returns: Multi-line string.
+        """
+        with self._lock:
+            stats = [(key, dict(value)) for (key, value) in self._stats.items()]
+
+        if not stats:
+            return "No hook calls have been recorded yet."
+
+        stats.sort(key=lambda item: item[1]["total"], reverse=True)
+
+        bucket_names = [
+            "<%dms" % (upper_bound * 1000) for upper_bound in _HISTOGRAM_BUCKETS[:-1]
+        ] + [">%dms" % (_HISTOGRAM_BUCKETS[-2] * 1000)]
+
+        lines = []
+        for ((hook_name, detail), value) in stats:
+            lines.append(
+                "%s: %d calls, %.3fs total, %.3fs mean, %.3fs max"
+                % (
+                    self._format_key(hook_name, detail),
+                    value["count"],
+                    value["total"],
+                    value["total"] / value["count"],
+                    value["max"],
+                )
+            )
+            lines.append(
+                "    "
+                + ", ".join(
+                    "%s: %d" % (bucket_name, count)
+                    for (bucket_name, count) in zip(bucket_names, value["histogram"])
+                    if count
+                )
+            )
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format_key(hook_name, detail):
+        """
+        Formats the name a hook call is recorded under.
+
+        :param str hook_name: Name of the hook method.
+        :param str detail: Detail of the call, or None.
+        :returns: String.
+        """
+        if detail:
+            return "%s (%s)" % (hook_name, detail)
+        return hook_name
+
+
+_hook_timings = None
+
+
+def get_hook_timings():
+    """
+    Returns the hook timings recorded for the current session.
+
+    :returns: :class:`HookTimings` instance.
+    """
+    global _hook_timings
+    if _hook_timings is None:
+        app = sgtk.platform.current_bundle()
+        _hook_timings = HookTimings(app, app.get_setting("slow_hook_threshold"))
+    return _hook_timings
@@ -12,12 +12,18 @@ import sgtk
 import datetime
 import os
 import sys
+import time
 from sgtk.platform.qt import QtCore, QtGui
 from tank_vendor import shotgun_api3
 from sgtk import TankError
-from sgtk.util import login
 
+from . import action_generation
+from . import constants
+from . import hook_timing
 from .action_manager import ActionManager
+from .action_mappings import ActionMappings
+from .action_pipeline import ActionPipeline
+from .metrics import MetricsLogger
 
 
 class LoaderActionManager(ActionManager):
@@ -27,10 +33,20 @@ class LoaderActionManager(ActionManager):
 
     :signal: ``pre_execute_action(QtGui.QAction)`` - Fired before a custom action is executed.
     :signal: ``post_execute_action(QtGui.QAction)`` - Fired after a custom action is executed.
+    :signal: ``action_progress(int, int, str)`` - Fired while a custom action runs on several
+             publishes, with the number of publishes processed, the total number of publishes
+             and the name of the publish being loaded next.
+    :signal: ``action_failures(list)`` - Fired after a custom action ran if some publishes
+             were skipped, with a list of (publish name, reason) tuples.
     """
 
     pre_execute_action = QtCore.Signal(object)
     post_execute_action = QtCore.Signal(object)
+    action_progress = QtCore.Signal(int, int, str)
+    action_failures = QtCore.Signal(object)
+
+    # maximum number of publishes for which action definitions are cached
+    _MAX_CACHED_ACTION_DEFS = 10000
 
     def __init__(self):
         """
@@ -48,6 +64,59 @@ class LoaderActionManager(ActionManager):
         else:
             self._publish_type_field = "tank_type"
 
+        # the action definitions returned by the generate_actions hook depend on
+        # the publish, the ui area, the current context and the scene, so they
+        # are cached until an action runs or the context changes, to avoid calling
+        # the hook every time the same publish is selected.
+        # (publish type, action names, ui area, entity type, id, version) -> action defs
+        self._action_defs_cache = {}
+        # the configured action mappings, compiled for fast lookups
+        self._action_mappings = ActionMappings.from_settings(self._app)
+        # context the cached action definitions and mappings were generated for
+        self._action_defs_context = self._app.context
+        # instance of the actions hook, to check which methods it implements
+        self._actions_hook = None
+
+        # pipeline of the action currently being executed
+        self._action_pipeline = None
+        # last time events were processed while reporting progress
+        self._last_progress_events_time = 0
+
+        self._metrics_logger = MetricsLogger(self._app)
+        self._hook_timings = hook_timing.get_hook_timings()
+
+    def cancel_actions(self):
+        """
+        Cancels the action currently being executed, if any. The hook is stopped
+        the next time it reports progress: the publish being loaded finishes
+        loading, the remaining ones are skipped.
+        """
+        if self._action_pipeline:
+            self._app.log_debug("Cancelling the current action.")
+            self._action_pipeline.cancel()
+
+    def invalidate_action_cache(self):
+        """
+        Discards all cached action definitions, so that the next request for
+        actions calls out to the hooks again, and recompiles the action mappings.
+        This should be called whenever the configuration or the hooks may have changed.
+        """
+        self._action_defs_cache = {}
+        self._action_mappings = ActionMappings.from_settings(self._app)
+        self._action_defs_context = self._app.context
+        self._actions_hook = None
+
+    def _get_action_mappings(self):
+        """
+        Returns the action mappings for the current context.
+
+        :returns: :class:`ActionMappings` instance.
+        """
+        # settings and actions depend on the context, so start over whenever it changes
+        if self._app.context != self._action_defs_context:
+            self.invalidate_action_cache()
+        return self._action_mappings
+
     def _get_actions_for_publish(self, sg_data, ui_area):
         """
         Retrieves the list of actions for a given publish.
@@ -57,52 +126,139 @@ class LoaderActionManager(ActionManager):
                         Currently one of UI_AREA_MAIN, UI_AREA_DETAILS and UI_AREA_HISTORY
         :return: List of actions.
         """
+        return self._get_actions_for_publish_list([sg_data], [ui_area])[0]
 
-        # Figure out the type of the publish
-        publish_type_dict = sg_data.get(self._publish_type_field)
-        if publish_type_dict is None:
-            # this publish does not have a type
-            publish_type = "undefined"
-        else:
-            publish_type = publish_type_dict["name"]
+    def _get_actions_for_publish_list(self, sg_data_list, ui_areas):
+        """
+        Retrieves the list of actions for each publish of a list.
 
-        # check if we have logic configured to handle this publish type.
-        mappings = self._app.get_setting("action_mappings")
-        # returns a structure on the form
-        # { "Maya Scene": ["reference", "import"] }
-        actions = mappings.get(publish_type, [])
+        Publishes sharing the same publish type and ui area are handed
+        to the actions hook in a single call.
 
-        if len(actions) == 0:
-            return []
+        :param sg_data_list: Publishes to retrieve actions for
+        :param ui_areas: List with, for each publish, the part of the UI the request
+                         is coming from. Currently one of UI_AREA_MAIN, UI_AREA_DETAILS
+                         and UI_AREA_HISTORY
+        :return: List with the list of actions of each publish.
+        """
+        # check if we have logic configured to handle the publish types.
+        mappings = self._get_action_mappings()
 
-        # cool so we have one or more actions for this publish type.
-        # resolve UI area
-        if ui_area == LoaderActionManager.UI_AREA_DETAILS:
-            ui_area_str = "details"
-        elif ui_area == LoaderActionManager.UI_AREA_HISTORY:
-            ui_area_str = "history"
-        elif ui_area == LoaderActionManager.UI_AREA_MAIN:
-            ui_area_str = "main"
-        else:
-            raise TankError("Unsupported UI_AREA. Contact support.")
+        action_defs_list = [[] for _ in sg_data_list]
+        # (publish type, ui area) -> list of (index, cache key, sg_data) of the
+        # publishes we need to call the hook for.
+        requests_per_type = {}
 
-        # convert created_at unix time stamp to shotgun time stamp
-        self._fix_timestamp(sg_data)
+        for (index, sg_data) in enumerate(sg_data_list):
 
-        action_defs = []
+            publish_type = self._get_publish_type(sg_data)
+            actions = mappings.get_publish_actions(publish_type)
+
+            if len(actions) == 0:
+                continue
+
+            # cool so we have one or more actions for this publish type.
+            ui_area_str = self._get_ui_area_name(ui_areas[index])
+
+            # convert created_at unix time stamp to shotgun time stamp
+            self._fix_timestamp(sg_data)
+
+            # the action mappings are part of the key so that a change in the
+            # configuration is picked up without having to invalidate the cache.
+            cache_key = (
+                publish_type,
+                actions,
+                ui_area_str,
+                sg_data.get("type"),
+                sg_data.get("id"),
+                sg_data.get("version_number"),
+            )
+            action_defs = self._action_defs_cache.get(cache_key)
+            if action_defs is not None:
+                action_defs_list[index] = list(action_defs)
+                continue
+
+            requests_per_type.setdefault((publish_type, ui_area_str), []).append(
+                (index, cache_key, sg_data)
+            )
+
+        for ((publish_type, ui_area_str), requests) in requests_per_type.items():
+
+            generated_action_defs = self._generate_actions(
+                publish_type,
+                [sg_data for (_, _, sg_data) in requests],
+                mappings.get_publish_actions(publish_type),
+                ui_area_str,
+            )
+            if generated_action_defs is None:
+                # don't cache failures, the hook may succeed next time around
+                continue
+
+            for ((index, cache_key, _), action_defs) in zip(
+                requests, generated_action_defs
+            ):
+                if len(self._action_defs_cache) >= self._MAX_CACHED_ACTION_DEFS:
+                    self._action_defs_cache = {}
+                self._action_defs_cache[cache_key] = list(action_defs)
+                action_defs_list[index] = action_defs
+
+        return action_defs_list
+
+    def _generate_actions(self, publish_type, sg_data_list, actions, ui_area_str):
+        """
+        Calls out to the actions hook to get the action definitions for publishes
+        which all share the same publish type.
+
+        :param publish_type: Name of the publish type of the publishes
+        :param sg_data_list: Publishes to retrieve actions for
+        :param actions: Tuple of action names configured for the publish type
+        :param ui_area_str: Name of the ui area, e.g. "main"
+        :returns: List with the list of action definitions of each publish,
+                  or None if the hook failed.
+        """
         try:
-            # call out to hook to give us the specifics.
-            action_defs = self._app.execute_hook_method(
-                "actions_hook",
-                "generate_actions",
-                sg_publish_data=sg_data,
-                actions=actions,
-                ui_area=ui_area_str,
+            if self._actions_hook is None:
+                self._actions_hook = action_generation.get_actions_hook(self._app)
+            return action_generation.generate_actions(
+                self._app,
+                publish_type,
+                sg_data_list,
+                actions,
+                ui_area_str,
+                self._actions_hook,
             )
         except Exception:
             self._app.log_exception("Could not execute generate_actions hook.")
+            return None
 
-        return action_defs
+    def _get_publish_type(self, sg_data):
+        """
+        Returns the name of the publish type of a publish.
+
+        :param sg_data: Shotgun data for a publish
+        :returns: Publish type name or "undefined" if the publish has no type.
+        """
+        publish_type_dict = sg_data.get(self._publish_type_field)
+        if publish_type_dict is None:
+            # this publish does not have a type
+            return "undefined"
+        return publish_type_dict["name"]
+
+    def _get_ui_area_name(self, ui_area):
+        """
+        Returns the name of a ui area, as passed to the actions hook.
+
+        :param ui_area: One of UI_AREA_MAIN, UI_AREA_DETAILS and UI_AREA_HISTORY
+        :returns: One of "main", "details" and "history"
+        """
+        if ui_area == LoaderActionManager.UI_AREA_DETAILS:
+            return "details"
+        elif ui_area == LoaderActionManager.UI_AREA_HISTORY:
+            return "history"
+        elif ui_area == LoaderActionManager.UI_AREA_MAIN:
+            return "main"
+        else:
+            raise TankError("Unsupported UI_AREA. Contact support.")
 
     def get_actions_for_publishes(self, sg_data_list, ui_area):
         """
@@ -145,6 +301,14 @@ class LoaderActionManager(ActionManager):
         # the first item to initialize the intersection...
         first_entity_actions = self._get_actions_for_publish(sg_data_list[0], ui_area)
 
+        # The actions of the rest of the selection are retrieved in one go, so that
+        # the hook can process all the publishes of a given type at once.
+        other_entity_actions = []
+        if first_entity_actions and len(sg_data_list) > 1:
+            other_entity_actions = self._get_actions_for_publish_list(
+                sg_data_list[1:], [self.UI_AREA_DETAILS] * (len(sg_data_list) - 1)
+            )
+
         # Dictionary of all actions that are common to all publishes in the selection.
         # The key is the action name, the value is the a list of data pairs. Each data pair
         # holds the Shotgun Item the action is for and the action description.
@@ -158,12 +322,7 @@ class LoaderActionManager(ActionManager):
         # ... and then we'll remove actions from that set as we encounter entities without those actions.
 
         # So, for each publishes in the selection after the first one...
-        for sg_data in sg_data_list[1:]:
-
-            # Get all the actions for a publish.
-            publish_actions = self._get_actions_for_publish(
-                sg_data, self.UI_AREA_DETAILS
-            )
+        for (sg_data, publish_actions) in zip(sg_data_list[1:], other_entity_actions):
 
             # Turn the list of actions into a dictionary of actions using the key
             # as the name.
@@ -174,7 +333,7 @@ class LoaderActionManager(ActionManager):
             # Check if the actions from the intersection are available for this publish
             #
             # Get a copy of the keys because we're about to remove items as they are visited.
-            for name in intersection_actions_per_name:
+            for name in list(intersection_actions_per_name):
                 # If the action is available for that publish, add the publish's action to the intersection
                 publish_action = publish_actions.get(name)
                 if publish_action:
@@ -270,13 +429,7 @@ class LoaderActionManager(ActionManager):
         :param publish_type: A Shotgun publish type (e.g. 'Maya Render')
         :returns: True if the current actions setup knows how to handle this.
         """
-        mappings = self._app.get_setting("action_mappings")
-
-        # returns a structure on the form
-        # { "Maya Scene": ["reference", "import"] }
-        my_mappings = mappings.get(publish_type, [])
-
-        return len(my_mappings) > 0
+        return self._get_action_mappings().has_publish_actions(publish_type)
 
     def _get_actions_for_folder(self, sg_data):
         """
@@ -289,11 +442,7 @@ class LoaderActionManager(ActionManager):
         publish_type = sg_data.get("type", None)
 
         # check if we have logic configured to handle this publish type.
-        mappings = self._app.get_setting("entity_mappings")
-
-        # returns a structure on the form
-        # { "Shot": ["reference", "import"] }
-        actions = mappings.get(publish_type, [])
+        actions = self._get_action_mappings().get_entity_actions(publish_type)
 
         if len(actions) == 0:
             return []
@@ -304,13 +453,14 @@ class LoaderActionManager(ActionManager):
         action_defs = []
         try:
             # call out to hook to give us the specifics.
-            action_defs = self._app.execute_hook_method(
-                "actions_hook",
-                "generate_actions",
-                sg_publish_data=sg_data,
-                actions=actions,
-                ui_area="main",
-            )  # folder options only found in main ui area
+            with self._hook_timings.span("generate_actions", publish_type):
+                action_defs = self._app.execute_hook_method(
+                    "actions_hook",
+                    "generate_actions",
+                    sg_publish_data=sg_data,
+                    actions=list(actions),
+                    ui_area="main",
+                )  # folder options only found in main ui area
         except Exception:
             self._app.log_exception("Could not execute generate_actions hook.")
 
@@ -406,13 +556,27 @@ class LoaderActionManager(ActionManager):
         """
         callback - executes a hook
         """
+        if self._action_pipeline:
+            # events are processed while an action runs, so the user could
+            # trigger another one. Don't run actions on top of each other.
+            self._app.log_warning(
+                "Action '%s' ignored, an action is already running." % qt_action.text()
+            )
+            return
+
         self._app.log_debug("Calling scene load hook.")
 
         self.pre_execute_action.emit(qt_action)
 
+        self._action_pipeline = ActionPipeline(self._app, actions)
+        # route the progress reported by the hook to the pipeline
+        self._app.set_action_progress_handler(self._action_pipeline.report_progress)
+        self._last_progress_events_time = 0
         try:
-            self._app.execute_hook_method(
-                "actions_hook", "execute_multiple_actions", actions=actions
+            self._action_pipeline.run(
+                self._execute_actions,
+                self._on_action_progress,
+                QtGui.QApplication.processEvents,
             )
         except Exception as e:
             self._app.log_exception("Could not execute execute_action hook: %s" % e)
@@ -421,52 +585,63 @@ class LoaderActionManager(ActionManager):
             )
         else:
 
-            # Logging the "Loaded Published File" toolkit metric
-            #
-            # We're deliberately not making any checks or verification in the
-            # code below, as we don't want to be logging exception or debug
-            # messages relating to metrics.
-            #
-            # On any failure relating to metric logging we just silently
-            # catch and continue normal execution.
-            try:
-                from sgtk.util.metrics import EventMetric
-
-                action = actions[0]
-                action_title = action.get("name")
-                publish_type = (
-                    action.get("sg_publish_data").get("published_file_type").get("name")
-                )
-                creator_id = (
-                    action.get("sg_publish_data").get("created_by", dict()).get("id")
-                )
-                current_user = login.get_current_user(self._app.sgtk)
-
-                # The creator_generated property doesn't match the natural
-                # language format of the other properties, but it does match
-                # the form of the same property in other metrics being logged
-                # elsewhere. Inconsistency here means consistency where it's
-                # best to have it.
-                properties = {
-                    "Publish Type": publish_type,
-                    "Action Title": action_title,
-                    "creator_generated": current_user.get("id") == creator_id,
-                }
-
-                EventMetric.log(
-                    EventMetric.GROUP_TOOLKIT,
-                    "Loaded Published File",
-                    properties=properties,
-                    bundle=self._app,
-                )
-
-            except:
-                # ignore all errors. ex: using a core that doesn't support metrics
-                pass
+            # Logging the "Loaded Published File" toolkit metric. This only
+            # queues the event, it is logged from a background thread.
+            action = actions[0]
+            self._metrics_logger.log_loaded_publish(
+                action.get("name"), action.get("sg_publish_data")
+            )
 
         finally:
+            failures = [
+                (action["sg_publish_data"].get("name") or "Unnamed", reason)
+                for (action, reason) in self._action_pipeline.failures
+            ]
+            self._action_pipeline = None
+            self._app.set_action_progress_handler(None)
+            # the actions offered by the hooks can depend on the scene, e.g. on
+            # what is already loaded, so they are generated again after a load.
+            self._action_defs_cache = {}
+            for (name, reason) in failures:
+                self._app.log_warning("Skipped loading %s. %s" % (name, reason))
+            if failures:
+                self.action_failures.emit(failures)
             self.post_execute_action.emit(qt_action)
 
+    def _execute_actions(self, actions):
+        """
+        Runs a batch of actions through the actions hook.
+
+        :param actions: List of action dictionaries.
+        """
+        with self._hook_timings.span("execute_multiple_actions", actions[0]["name"]):
+            self._app.execute_hook_method(
+                "actions_hook", "execute_multiple_actions", actions=actions
+            )
+
+    def _on_action_progress(self, processed, total, item_name):
+        """
+        Called by the action pipeline as actions are being run.
+
+        :param processed: Number of actions processed so far.
+        :param total: Total number of actions.
+        :param item_name: Name of the item being processed, None when done.
+        """
+        if total <= 1:
+            # the banner shown before the action ran says it all
+            return
+        self.action_progress.emit(processed, total, item_name or "")
+
+        # give the ui a chance to repaint and to let the user cancel, but not
+        # so often that processing events slows down the actions themselves.
+        now = time.time()
+        if item_name is None or (
+            now - self._last_progress_events_time
+            >= constants.ACTION_PROGRESS_EVENTS_INTERVAL
+        ):
+            self._last_progress_events_time = now
+            QtGui.QApplication.processEvents()
+
     def _show_in_sg(self, entity):
         """
         Callback - Shows a shotgun entity in the web browser
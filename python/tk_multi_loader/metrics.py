@@ -0,0 +1,139 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Background logging of the toolkit metrics emitted by the loader.
+"""
+
+import threading
+
+from tank_vendor.six.moves import queue
+from sgtk.util import login
+
+
+class MetricsLogger(object):
+    """
+    Logs toolkit metrics from a background thread.
+
+    Events are queued by the main thread and picked up in batches by a daemon
+    thread, which takes care of looking up the current user, once per session,
+    and of handing the events over to the core metrics system. Queuing an event
+    is therefore all the main thread ever pays for metrics.
+
+    We're deliberately not making any checks or verification when logging
+    metrics, as we don't want to be logging exception or debug messages
+    relating to metrics. On any failure relating to metric logging we just
+    silently catch and continue normal execution.
+    """
+
+    # maximum number of events logged in one go by the background thread
+    _BATCH_SIZE = 50
+
+    def __init__(self, app):
+        """
+        :param app: The loader app instance.
+        """
+        self._app = app
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        # current user, looked up the first time it is needed
+        self._current_user = None
+        self._current_user_fetched = False
+
+    def log_loaded_publish(self, action_title, sg_publish_data):
+        """
+        Queues a "Loaded Published File" metric.
+
+        :param str action_title: Name of the action which was executed.
+        :param dict sg_publish_data: Shotgun data of the publish the action ran on.
+        """
+        try:
+            publish_type = (sg_publish_data.get("published_file_type") or {}).get(
+                "name"
+            )
+            creator_id = (sg_publish_data.get("created_by") or {}).get("id")
+            self._queue.put((action_title, publish_type, creator_id))
+            self._ensure_thread()
+        except Exception:
+            pass
+
+    def _ensure_thread(self):
+        """
+        Starts the background thread if it isn't running yet.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="LoaderMetricsLogger"
+                )
+                # never hold the DCC back on exit because of metrics
+                self._thread.daemon = True
+                self._thread.start()
+
+    def _run(self):
+        """
+        Main loop of the background thread.
+        """
+        while True:
+            # wait for an event and then grab whatever else is pending
+            events = [self._queue.get()]
+            try:
+                while len(events) < self._BATCH_SIZE:
+                    events.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            try:
+                self._log_events(events)
+            except Exception:
+                # ignore all errors. ex: using a core that doesn't support metrics
+                pass
+
+    def _log_events(self, events):
+        """
+        Hands a batch of events over to the core metrics system.
+
+        :param list events: List of (action title, publish type, creator id) tuples.
+        """
+        from sgtk.util.metrics import EventMetric
+
+        current_user = self._get_current_user() or {}
+
+        for (action_title, publish_type, creator_id) in events:
+            # The creator_generated property doesn't match the natural
+            # language format of the other properties, but it does match
+            # the form of the same property in other metrics being logged
+            # elsewhere. Inconsistency here means consistency where it's
+            # best to have it.
+            properties = {
+                "Publish Type": publish_type,
+                "Action Title": action_title,
+                "creator_generated": current_user.get("id") == creator_id,
+            }
+
+            EventMetric.log(
+                EventMetric.GROUP_TOOLKIT,
+                "Loaded Published File",
+                properties=properties,
+                bundle=self._app,
+            )
+
+    def _get_current_user(self):
+        """
+        Returns the current user. The user is only looked up once per
+        session, since this may require a round trip to the server.
+
+        :returns: Shotgun entity dictionary or None.
+        """
+        if not self._current_user_fetched:
+            self._current_user_fetched = True
+            self._current_user = login.get_current_user(self._app.sgtk)
+        return self._current_user
@@ -9,7 +9,8 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import sgtk
-from sgtk.platform.qt import QtCore, QtGui
+
+from . import resource_cache
 
 # import the shotgun_model module from the shotgun utils framework
 shotgun_model = sgtk.platform.import_framework(
@@ -29,43 +30,26 @@ class SgEntityModel(ShotgunModel):
         Constructor
         """
         # folder icon
-        self._default_icon = QtGui.QIcon(QtGui.QPixmap(":/res/icon_Folder.png"))
+        self._default_icon = resource_cache.get_icon(":/res/icon_Folder.png")
 
         # shotgun entity icons
         self._entity_icons = {}
-        self._entity_icons["Shot"] = QtGui.QIcon(
-            QtGui.QPixmap(":/res/icon_Shot_dark.png")
-        )
-        self._entity_icons["Asset"] = QtGui.QIcon(
-            QtGui.QPixmap(":/res/icon_Asset_dark.png")
-        )
-        self._entity_icons["EventLogEntry"] = QtGui.QIcon(
-            QtGui.QPixmap(":/res/icon_EventLogEntry_dark.png")
-        )
-        self._entity_icons["Group"] = QtGui.QIcon(
-            QtGui.QPixmap(":/res/icon_Group_dark.png")
-        )
-        self._entity_icons["HumanUser"] = QtGui.QIcon(
-            QtGui.QPixmap(":/res/icon_HumanUser_dark.png")
-        )
-        self._entity_icons["Note"] = QtGui.QIcon(
-            QtGui.QPixmap(":/res/icon_Note_dark.png")
-        )
-        self._entity_icons["Project"] = QtGui.QIcon(
-            QtGui.QPixmap(":/res/icon_Project_dark.png")
-        )
-        self._entity_icons["Sequence"] = QtGui.QIcon(
-            QtGui.QPixmap(":/res/icon_Sequence_dark.png")
-        )
-        self._entity_icons["Task"] = QtGui.QIcon(
-            QtGui.QPixmap(":/res/icon_Task_dark.png")
-        )
-        self._entity_icons["Ticket"] = QtGui.QIcon(
-            QtGui.QPixmap(":/res/icon_Ticket_dark.png")
-        )
-        self._entity_icons["Version"] = QtGui.QIcon(
-            QtGui.QPixmap(":/res/icon_Version_dark.png")
-        )
+        for entity_type in [
+            "Shot",
+            "Asset",
+            "EventLogEntry",
+            "Group",
+            "HumanUser",
+            "Note",
+            "Project",
+            "Sequence",
+            "Task",
+            "Ticket",
+            "Version",
+        ]:
+            self._entity_icons[entity_type] = resource_cache.get_icon(
+                ":/res/icon_%s_dark.png" % entity_type
+            )
 
         ShotgunModel.__init__(
             self,
@@ -8,13 +8,17 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from sgtk.platform.qt import QtCore, QtGui
 
 import sgtk
 import datetime
+import time
 from . import utils, constants
+from . import publish_query
 from . import model_item_data
+from . import thumbnail_cache
+from . import resource_cache
 
 # import the shotgun_model module from the shotgun utils framework
 shotgun_model = sgtk.platform.import_framework(
@@ -29,7 +33,8 @@ class SgLatestPublishModel(ShotgunModel):
     Model which handles the main spreadsheet view which displays the latest version of all
     publishes.
 
-    All images returned by this model will be 512x400 pixels.
+    All images returned by this model will be 512x400 pixels. Views should use
+    :meth:`get_thumbnail` to retrieve them at the size they are drawn at.
     """
 
     TYPE_ID_ROLE = QtCore.Qt.UserRole + 101
@@ -37,18 +42,42 @@ class SgLatestPublishModel(ShotgunModel):
     ASSOCIATED_TREE_VIEW_ITEM_ROLE = QtCore.Qt.UserRole + 103
     PUBLISH_TYPE_NAME_ROLE = QtCore.Qt.UserRole + 104
     SEARCHABLE_NAME = QtCore.Qt.UserRole + 105
+    THUMBNAIL_PATH_ROLE = QtCore.Qt.UserRole + 106
+    THUMBNAIL_LEVEL_ROLE = QtCore.Qt.UserRole + 107
 
     def __init__(self, parent, publish_type_model, bg_task_manager):
         """
         Model which represents the latest publishes for an entity
         """
         self._publish_type_model = publish_type_model
-        self._folder_icon = QtGui.QIcon(QtGui.QPixmap(":/res/folder_512x400.png"))
-        self._loading_icon = QtGui.QIcon(QtGui.QPixmap(":/res/loading_512x400.png"))
+        self._folder_icon = resource_cache.get_pyramid_icon(":/res/folder_512x400.png")
+        self._loading_icon = resource_cache.get_pyramid_icon(
+            ":/res/loading_512x400.png"
+        )
         self._associated_items = {}
+        self._thumbnail_cache = thumbnail_cache.get_thumbnail_cache()
+        # the pyramid level of the thumbnails kept in memory
+        self._thumbnail_level = constants.THUMBNAIL_PYRAMID_LEVELS[-1]
+
+        # thumbnail requests are held back until the items become visible.
+        # id(item) -> (item, field, url, entity_type, entity_id)
+        self._pending_thumbnails = {}
+        # id(item) -> (item, time of request)
+        self._thumbnails_in_flight = {}
+        # ids of the visible items, in the order their thumbnails should be requested
+        self._thumbnail_priorities = []
+        self._prioritized_thumbnails = set()
 
         app = sgtk.platform.current_bundle()
 
+        # decoded thumbnails, in least recently displayed order.
+        # id(item) -> (item, size in bytes)
+        self._resident_thumbnails = OrderedDict()
+        self._resident_thumbnails_size = 0
+        self._thumbnail_memory_budget = (
+            app.get_setting("thumbnail_memory_budget") * 1024 * 1024
+        )
+
         # init base class
         ShotgunModel.__init__(
             self,
@@ -59,9 +88,36 @@ class SgLatestPublishModel(ShotgunModel):
             bg_task_manager=bg_task_manager,
         )
 
+        # make sure requests which never complete don't hold back the queue forever
+        self._thumbnail_timeout_timer = QtCore.QTimer(self)
+        self._thumbnail_timeout_timer.setSingleShot(True)
+        self._thumbnail_timeout_timer.timeout.connect(self._submit_thumbnail_requests)
+
+        # the thumbnail bookkeeping holds references to items, forget about items
+        # as soon as they are removed from the model.
+        self.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        self.modelReset.connect(self._forget_thumbnails)
+
     ############################################################################################
     # public interface
 
+    def set_thumbnail_priorities(self, indexes):
+        """
+        Specifies which items are currently visible, or about to become visible,
+        in the view. Thumbnails are only requested for these items, in the given
+        order and with a limited number of concurrent requests. Requests for
+        other items are held back until they become visible.
+
+        :param indexes: List of QModelIndex for items in this model.
+        """
+        self._thumbnail_priorities = []
+        for index in indexes:
+            item = self.itemFromIndex(index)
+            if item is not None:
+                self._thumbnail_priorities.append(id(item))
+        self._prioritized_thumbnails = set(self._thumbnail_priorities)
+        self._submit_thumbnail_requests()
+
     def get_associated_tree_view_item(self, item):
         """
         Returns the entity tree view item associated with a publish folder item.
@@ -71,6 +127,69 @@ class SgLatestPublishModel(ShotgunModel):
         entity_item_hash = item.data(self.ASSOCIATED_TREE_VIEW_ITEM_ROLE)
         return self._associated_items.get(entity_item_hash)
 
+    def set_thumbnail_width(self, width):
+        """
+        Specifies the width at which thumbnails are currently being displayed.
+        Items only keep the thumbnail pyramid level matching this width in memory.
+
+        :param width: Width in pixels.
+        """
+        self._thumbnail_level = thumbnail_cache.get_pyramid_level(width)
+
+    def get_thumbnail(self, index, width, keep=True):
+        """
+        Returns the thumbnail for an item, using the pyramid level best suited
+        for the given width. Levels which are not in memory are loaded from the
+        composited thumbnail cache.
+
+        :param index: QModelIndex of an item in this model.
+        :param width: Width in pixels at which the thumbnail will be drawn.
+        :param keep: If True, the level loaded replaces the one the item keeps in
+                     memory, so it doesn't have to be loaded again the next time
+                     the item is drawn. Pass False for one-off requests.
+        :returns: QPixmap or None if the item doesn't have a thumbnail.
+        """
+        item = self.itemFromIndex(index)
+        if item is None:
+            return None
+
+        level = thumbnail_cache.get_pyramid_level(width)
+        if (
+            item.data(SgLatestPublishModel.THUMBNAIL_PATH_ROLE)
+            and item.data(SgLatestPublishModel.THUMBNAIL_LEVEL_ROLE) != level
+        ):
+            pixmap = self._get_thumbnail_level(item, level)
+            if pixmap is None:
+                # the thumbnail was released from memory and is no longer in the
+                # disk cache either. Request it again, it will show up through
+                # _populate_thumbnail_image once it has been downloaded.
+                self._request_thumbnail_again(item)
+            else:
+                if keep:
+                    # this is the level currently displayed by the view, keep it
+                    # around instead of the previous one. This typically happens
+                    # during painting, so don't broadcast the change.
+                    self._thumbnail_level = level
+                    self.blockSignals(True)
+                    try:
+                        self._set_thumbnail(item, pixmap, level)
+                    finally:
+                        self.blockSignals(False)
+                return pixmap
+
+        # mark the thumbnail as recently displayed
+        key = id(item)
+        if key in self._resident_thumbnails:
+            self._resident_thumbnails[key] = self._resident_thumbnails.pop(key)
+
+        icon = item.icon()
+        if icon.isNull():
+            return None
+        (level_width, level_height) = thumbnail_cache.get_level_size(
+            constants.PUBLISH_THUMBNAIL_SIZE, level
+        )
+        return icon.pixmap(QtCore.QSize(level_width, level_height))
+
     def load_data(self, item, child_folders, show_sub_items, additional_sg_filters):
         """
         Clears the model and sets it up for a particular entity.
@@ -258,6 +377,164 @@ class SgLatestPublishModel(ShotgunModel):
     ############################################################################################
     # private methods
 
+    def _get_thumbnail_level(self, item, level, image=None):
+        """
+        Returns a pyramid level of the composited thumbnail for an item.
+
+        :param item: Item to get the thumbnail for.
+        :param level: Pyramid level to return.
+        :param image: Source QImage used to composite the thumbnail if it is not
+                      cached yet. If None, only cached thumbnails are returned.
+        :returns: QPixmap or None
+        """
+        if item.data(SgLatestPublishModel.IS_FOLDER_ROLE):
+            # composite the thumbnail nicely on top of the folder icon
+            kind = "folder"
+            create_thumbnail = utils.create_overlayed_folder_thumbnail
+        else:
+            kind = "publish"
+            create_thumbnail = utils.create_overlayed_publish_thumbnail
+
+        return self._thumbnail_cache.get_level(
+            kind,
+            [item.data(SgLatestPublishModel.THUMBNAIL_PATH_ROLE)],
+            constants.PUBLISH_THUMBNAIL_SIZE,
+            level,
+            (lambda: create_thumbnail(image)) if image is not None else None,
+        )
+
+    def _set_thumbnail(self, item, pixmap, level):
+        """
+        Sets the thumbnail of an item and accounts for its memory usage.
+        Thumbnails displayed the longest time ago are released when the
+        memory budget is exceeded.
+
+        :param item: Item to set the thumbnail for.
+        :param pixmap: QPixmap with the composited thumbnail.
+        :param level: Pyramid level of the pixmap.
+        """
+        key = id(item)
+        self._release_thumbnail_memory(key)
+
+        item.setIcon(QtGui.QIcon(pixmap))
+        item.setData(level, SgLatestPublishModel.THUMBNAIL_LEVEL_ROLE)
+
+        size = pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+        self._resident_thumbnails[key] = (item, size)
+        self._resident_thumbnails_size += size
+
+        # evict the least recently displayed thumbnails, but never the one just set.
+        while (
+            self._resident_thumbnails_size > self._thumbnail_memory_budget
+            and len(self._resident_thumbnails) > 1
+        ):
+            (evicted_key, (evicted_item, _)) = next(
+                iter(self._resident_thumbnails.items())
+            )
+            self._release_thumbnail_memory(evicted_key)
+            # fall back on the shared placeholder, the thumbnail will be
+            # reloaded from the disk cache next time the item is displayed.
+            self.blockSignals(True)
+            try:
+                evicted_item.setIcon(self._loading_icon)
+                evicted_item.setData(None, SgLatestPublishModel.THUMBNAIL_LEVEL_ROLE)
+            finally:
+                self.blockSignals(False)
+
+    def _release_thumbnail_memory(self, key):
+        """
+        Stops accounting for the memory used by an item's thumbnail.
+
+        :param key: Key of the item, as returned by id(item)
+        """
+        if key in self._resident_thumbnails:
+            (_, size) = self._resident_thumbnails.pop(key)
+            self._resident_thumbnails_size -= size
+
+    def _forget_thumbnails(self):
+        """
+        Forgets about the thumbnails of all the items of the model.
+        """
+        self._pending_thumbnails = {}
+        self._thumbnails_in_flight = {}
+        self._thumbnail_priorities = []
+        self._prioritized_thumbnails = set()
+        self._resident_thumbnails = OrderedDict()
+        self._resident_thumbnails_size = 0
+
+    def _on_rows_about_to_be_removed(self, parent, first, last):
+        """
+        Forgets about the thumbnails of items which are about to be removed from
+        the model, along with their children, so that no reference to a deleted
+        item is kept around.
+
+        :param parent: QModelIndex of the parent of the rows.
+        :param first: First row being removed.
+        :param last: Last row being removed.
+        """
+        keys = set()
+        indexes = [self.index(row, 0, parent) for row in range(first, last + 1)]
+        while indexes:
+            index = indexes.pop()
+            item = self.itemFromIndex(index)
+            if item is not None:
+                keys.add(id(item))
+            indexes.extend(
+                self.index(row, 0, index) for row in range(self.rowCount(index))
+            )
+
+        for key in keys:
+            self._pending_thumbnails.pop(key, None)
+            self._thumbnails_in_flight.pop(key, None)
+            self._release_thumbnail_memory(key)
+        if keys & self._prioritized_thumbnails:
+            self._prioritized_thumbnails -= keys
+            self._thumbnail_priorities = [
+                key for key in self._thumbnail_priorities if key not in keys
+            ]
+
+    def _request_thumbnail_again(self, item):
+        """
+        Queues a new thumbnail request for an item whose composited
+        thumbnail can no longer be found in the disk cache.
+
+        :param item: Item to request the thumbnail for.
+        """
+        item.setData(None, SgLatestPublishModel.THUMBNAIL_PATH_ROLE)
+        sg_data = item.data(SgLatestPublishModel.SG_DATA_ROLE)
+        if sg_data and sg_data.get("image"):
+            self._request_thumbnail_download(
+                item, "image", sg_data["image"], sg_data["type"], sg_data["id"]
+            )
+
+    def _submit_thumbnail_requests(self):
+        """
+        Sends the pending thumbnail requests for visible items, up to the
+        maximum number of concurrent requests.
+        """
+        # requests which haven't completed after a while have most likely failed
+        now = time.time()
+        for (key, (_, request_time)) in list(self._thumbnails_in_flight.items()):
+            if now - request_time > constants.THUMBNAIL_REQUEST_TIMEOUT:
+                del self._thumbnails_in_flight[key]
+
+        for key in self._thumbnail_priorities:
+            if (
+                len(self._thumbnails_in_flight)
+                >= constants.MAX_CONCURRENT_THUMBNAIL_REQUESTS
+            ):
+                break
+            request = self._pending_thumbnails.pop(key, None)
+            if request is None:
+                continue
+            self._thumbnails_in_flight[key] = (request[0], now)
+            ShotgunModel._request_thumbnail_download(self, *request)
+
+        if self._thumbnails_in_flight:
+            self._thumbnail_timeout_timer.start(
+                constants.THUMBNAIL_REQUEST_TIMEOUT * 1000
+            )
+
     def _do_load_data(self, sg_filters, treeview_folder_items):
         """
         Load and refresh data.
@@ -323,6 +600,9 @@ class SgLatestPublishModel(ShotgunModel):
         self._folder_items = []
         self._associated_items = {}
 
+        # the model is rebuilt from scratch, forget about thumbnails for the previous items
+        self._forget_thumbnails()
+
         for tree_view_item in self._treeview_folder_items:
 
             # compute and store a hash for the tree view item so that we can access it later
@@ -380,6 +660,28 @@ class SgLatestPublishModel(ShotgunModel):
             # store original item, allowing us to do a reverse lookup
             self._associated_items[tree_view_item_hash] = tree_view_item
 
+    def _request_thumbnail_download(self, item, field, url, entity_type, entity_id):
+        """
+        Requests a thumbnail for an item. Rather than downloading thumbnails for
+        all items as soon as they are created, requests are queued up and sent
+        once the view reports the item as visible. See :meth:`set_thumbnail_priorities`.
+
+        :param item: Item to request the thumbnail for.
+        :param field: Field containing the thumbnail url.
+        :param url: Url of the thumbnail.
+        :param entity_type: Type of the entity the thumbnail belongs to.
+        :param entity_id: Id of the entity the thumbnail belongs to.
+        """
+        if field != "image":
+            # other thumbnails (in particular created_by.HumanUser.image) are
+            # never displayed by this model, so don't bother downloading them.
+            return
+
+        key = id(item)
+        self._pending_thumbnails[key] = (item, field, url, entity_type, entity_id)
+        if key in self._prioritized_thumbnails:
+            self._submit_thumbnail_requests()
+
     def _populate_item(self, item, sg_data):
         """
         Whenever an item is constructed, this methods is called. It allows subclasses to intercept
@@ -427,7 +729,10 @@ class SgLatestPublishModel(ShotgunModel):
         """
 
         # set up publishes with a "thumbnail loading" icon
+        self._release_thumbnail_memory(id(item))
         item.setIcon(self._loading_icon)
+        item.setData(None, SgLatestPublishModel.THUMBNAIL_PATH_ROLE)
+        item.setData(None, SgLatestPublishModel.THUMBNAIL_LEVEL_ROLE)
 
     def _populate_thumbnail_image(self, item, field, image, path):
         """
@@ -458,15 +763,17 @@ class SgLatestPublishModel(ShotgunModel):
             # ignore and not display.
             return
 
+        # this request has completed, make room for the next one
+        if self._thumbnails_in_flight.pop(id(item), None):
+            self._submit_thumbnail_requests()
+
         # pass the thumbnail through out special image compositing methods
-        # before associating it with the model
-        is_folder = item.data(SgLatestPublishModel.IS_FOLDER_ROLE)
-        if is_folder:
-            # composite the thumbnail nicely on top of the folder icon
-            thumb = utils.create_overlayed_folder_thumbnail(image)
-        else:
-            thumb = utils.create_overlayed_publish_thumbnail(image)
-        item.setIcon(QtGui.QIcon(thumb))
+        # before associating it with the model. The composited images are
+        # cached on disk so that we only pay the compositing cost once per thumbnail,
+        # and only the pyramid level currently displayed is kept in memory.
+        item.setData(path, SgLatestPublishModel.THUMBNAIL_PATH_ROLE)
+        thumb = self._get_thumbnail_level(item, self._thumbnail_level, image)
+        self._set_thumbnail(item, thumb, self._thumbnail_level)
 
     def _before_data_processing(self, sg_data_list):
         """
@@ -482,7 +789,7 @@ class SgLatestPublishModel(ShotgunModel):
 
         # First, let the filter_publishes hook have a chance to filter the list
         # of publishes:
-        sg_data_list = utils.filter_publishes(app, sg_data_list)
+        sg_data_list = publish_query.filter_publishes(app, sg_data_list)
 
         # filter the shotgun data so that we only return the latest publish for each file.
         # also perform aggregate computations and push those summaries into the associated
@@ -500,81 +807,17 @@ class SgLatestPublishModel(ShotgunModel):
         # count the number of times each type is used
         type_id_aggregates = defaultdict(int)
 
-        # FIRST PASS!
-        # get a dict with only the latest versions, grouped by type and task
+        # only keep the latest versions, grouped by name, type and task.
         # rely on the fact that versions are returned in asc order from sg.
         # (see filter query above)
-        #
-        # for example, if there are these publishes:
-        # name FOO, version 1, task ANIM, type XXX
-        # name FOO, version 2, task ANIM, type XXX
-        # name FOO, version 3, task ANIM, type XXX
-        # name FOO, version 1, task ANIM, type YYY
-        # name FOO, version 2, task ANIM, type YYY
-        # name FOO, version 5, task LAY,  type YYY
-        # name FOO, version 6, task LAY,  type YYY
-        # name FOO, version 7, task LAY,  type YYY
-        #
-        # three items should show up:
-        # - Foo v3 (type XXX)
-        # - Foo v2 (type YYY, task ANIM)
-        # - Foo v7 (type YYY, task LAY)
-
-        # also, if there are cases where there are two items with the same name and the same type,
-        # but with different tasks, indicate this with a special boolean flag
-
-        unique_data = {}
-        name_type_aggregates = defaultdict(int)
-
-        for sg_item in sg_data_list:
-
-            # get the associated type
-            type_id = None
-            type_link = sg_item[self._publish_type_field]
-            if type_link:
-                type_id = type_link["id"]
-
-            # also get the associated task
-            task_id = None
-            task_link = sg_item["task"]
-            if task_link:
-                task_id = task_link["id"]
-
-            # key publishes in dict by type and name
-            unique_data[(sg_item["name"], type_id, task_id)] = {
-                "sg_item": sg_item,
-                "type_id": type_id,
-            }
-
-            # count how many items of this type we have
-            name_type_aggregates[(sg_item["name"], type_id)] += 1
-
-        # SECOND PASS
-        # We now have the latest versions only
-        # Go ahead count types for the aggregate
-        # and assemble filtered sg data set
-        new_sg_data = []
-        for second_pass_data in unique_data.values():
-
-            # get the shotgun data for this guy
-            sg_item = second_pass_data["sg_item"]
-
-            # now add a flag to indicate if this item is "task unique" or not
-            # e.g. if there are other items in the listing with the same name
-            # and same type but with a different task
-            if name_type_aggregates[(sg_item["name"], second_pass_data["type_id"])] > 1:
-                # there are more than one item with this same name/type combo!
-                sg_item["task_uniqueness"] = False
-            else:
-                # no other item with this task/name/type combo
-                sg_item["task_uniqueness"] = True
-
-            # append to new sg data
-            new_sg_data.append(sg_item)
+        new_sg_data = publish_query.get_latest_publishes(
+            sg_data_list, self._publish_type_field
+        )
 
-            # update our aggregate counts for the publish type view
-            type_id = second_pass_data["type_id"]
-            type_id_aggregates[type_id] += 1
+        # update our aggregate counts for the publish type view
+        for sg_item in new_sg_data:
+            type_link = sg_item[self._publish_type_field]
+            type_id_aggregates[type_link["id"] if type_link else None] += 1
 
         # tell the type model to reshuffle and reformat itself
         # based on the types contained in this search
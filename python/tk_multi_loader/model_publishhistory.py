@@ -12,6 +12,9 @@ import sgtk
 from sgtk.platform.qt import QtCore, QtGui
 
 from . import utils, constants
+from . import publish_query
+from . import thumbnail_cache
+from . import resource_cache
 
 # import the shotgun_model module from the shotgun utils framework
 shotgun_model = sgtk.platform.import_framework(
@@ -25,15 +28,20 @@ class SgPublishHistoryModel(ShotgunModel):
     This model represents the version history for a publish.
     """
 
-    USER_THUMB_ROLE = QtCore.Qt.UserRole + 101
-    PUBLISH_THUMB_ROLE = QtCore.Qt.UserRole + 102
+    USER_THUMB_PATH_ROLE = QtCore.Qt.UserRole + 103
+    PUBLISH_THUMB_PATH_ROLE = QtCore.Qt.UserRole + 104
 
     def __init__(self, parent, bg_task_manager):
         """
         Constructor
         """
         # folder icon
-        self._loading_icon = QtGui.QPixmap(":/res/loading_100x100.png")
+        self._loading_icon = resource_cache.get_pixmap(":/res/loading_100x100.png")
+        # all items share the same icon until their thumbnails arrive
+        self._default_icon = QtGui.QIcon(
+            utils.create_overlayed_user_publish_thumbnail(self._loading_icon, None)
+        )
+        self._thumbnail_cache = thumbnail_cache.get_thumbnail_cache()
         app = sgtk.platform.current_bundle()
         ShotgunModel.__init__(
             self,
@@ -149,7 +157,7 @@ class SgPublishHistoryModel(ShotgunModel):
         """
         app = sgtk.platform.current_bundle()
 
-        return utils.filter_publishes(app, sg_data_list)
+        return publish_query.filter_publishes(app, sg_data_list)
 
     def _populate_default_thumbnail(self, item):
         """
@@ -160,11 +168,7 @@ class SgPublishHistoryModel(ShotgunModel):
         can populate the real image.
         """
         # set up publishes with a "thumbnail loading" icon
-        item.setData(self._loading_icon, SgPublishHistoryModel.PUBLISH_THUMB_ROLE)
-        thumb = utils.create_overlayed_user_publish_thumbnail(
-            item.data(SgPublishHistoryModel.PUBLISH_THUMB_ROLE), None
-        )
-        item.setIcon(QtGui.QIcon(thumb))
+        item.setIcon(self._default_icon)
 
     def _populate_thumbnail_image(self, item, field, image, path):
         """
@@ -188,16 +192,42 @@ class SgPublishHistoryModel(ShotgunModel):
         :param field: The Shotgun field which the thumbnail is associated with.
         :param path: A path on disk to the thumbnail. This is a file in jpeg format.
         """
+        # only keep track of where the source thumbnails are on disk rather than
+        # holding on to the decoded images, they are only needed for compositing.
         if field == "image":
-            thumb = QtGui.QPixmap.fromImage(image)
-            item.setData(thumb, SgPublishHistoryModel.PUBLISH_THUMB_ROLE)
+            item.setData(path, SgPublishHistoryModel.PUBLISH_THUMB_PATH_ROLE)
         else:
-            thumb = QtGui.QPixmap.fromImage(image)
-            item.setData(thumb, SgPublishHistoryModel.USER_THUMB_ROLE)
+            item.setData(path, SgPublishHistoryModel.USER_THUMB_PATH_ROLE)
+
+        publish_path = item.data(SgPublishHistoryModel.PUBLISH_THUMB_PATH_ROLE)
+        user_path = item.data(SgPublishHistoryModel.USER_THUMB_PATH_ROLE)
+
+        def create_thumbnail():
+            # use the image we were just handed and load the other one from disk
+            if field == "image":
+                publish_pixmap = QtGui.QPixmap.fromImage(image)
+            elif publish_path:
+                publish_pixmap = QtGui.QPixmap(publish_path)
+            else:
+                publish_pixmap = self._loading_icon
+
+            if field != "image":
+                user_pixmap = QtGui.QPixmap.fromImage(image)
+            elif user_path:
+                user_pixmap = QtGui.QPixmap(user_path)
+            else:
+                user_pixmap = None
+
+            return utils.create_overlayed_user_publish_thumbnail(
+                publish_pixmap, user_pixmap
+            )
 
-        # composite the user thumbnail and the publish thumb into a single image
-        thumb = utils.create_overlayed_user_publish_thumbnail(
-            item.data(SgPublishHistoryModel.PUBLISH_THUMB_ROLE),
-            item.data(SgPublishHistoryModel.USER_THUMB_ROLE),
+        # composite the user thumbnail and the publish thumb into a single image.
+        # the composite depends on both source images, so key the cache on both.
+        thumb = self._thumbnail_cache.get_or_create(
+            "history",
+            [publish_path, user_path],
+            constants.HISTORY_THUMBNAIL_SIZE,
+            create_thumbnail,
         )
         item.setIcon(QtGui.QIcon(thumb))
@@ -15,6 +15,7 @@ loader UI.
 
 from sgtk.platform.qt import QtCore, QtGui
 from .action_manager import ActionManager
+from .action_mappings import ActionMappings
 
 
 class OpenPublishActionManager(ActionManager):
@@ -37,7 +38,10 @@ class OpenPublishActionManager(ActionManager):
         """
         ActionManager.__init__(self)
 
-        self.__publish_types = publish_types
+        # the only action available for the publish types is to open them
+        self.__action_mappings = ActionMappings(
+            dict((publish_type, ["open"]) for publish_type in publish_types or [])
+        )
 
     def has_actions(self, publish_type):
         """
@@ -49,7 +53,11 @@ class OpenPublishActionManager(ActionManager):
         :returns:               True if the current actions setup knows how to
                                 handle this.
         """
-        return not self.__publish_types or publish_type in self.__publish_types
+        # all publish types can be opened when no types were specified
+        return (
+            not self.__action_mappings.publish_types
+            or self.__action_mappings.has_publish_actions(publish_type)
+        )
 
     def get_default_action_for_publish(self, sg_data, ui_area):
         """
@@ -0,0 +1,203 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Retrieval of the publishes displayed by the loader.
+
+This module doesn't depend on Qt, so that publishes can be queried and
+filtered the same way by the loader UI and by the headless batch loading.
+"""
+
+from collections import defaultdict
+
+import sgtk
+
+from . import constants
+from . import hook_timing
+
+
+def get_publish_type_field(app):
+    """
+    Returns the field holding the publish type of publishes.
+
+    :param app: The loader app instance.
+    :returns: "published_file_type" or, for older sites, "tank_type".
+    """
+    publish_entity_type = sgtk.util.get_published_file_entity_type(app.sgtk)
+    if publish_entity_type == "PublishedFile":
+        return "published_file_type"
+    return "tank_type"
+
+
+def get_entity_filters(entity):
+    """
+    Returns the Shotgun filters matching the publishes linked to an entity.
+    Tasks and versions are linked via the task and version fields rather than
+    the standard entity link field.
+
+    :param dict entity: Shotgun entity dictionary with keys type and id.
+    :returns: List of Shotgun filters.
+    """
+    link = {"type": entity["type"], "id": entity["id"]}
+    if entity["type"] == "Task":
+        return [["task", "is", link]]
+    elif entity["type"] == "Version":
+        return [["version", "is", link]]
+    return [["entity", "is", link]]
+
+
+def find_publishes(app, entity, publish_types=None, filters=None):
+    """
+    Retrieves the publishes linked to an entity, with the fields the loader
+    displays. The ``publish_filters`` setting is applied on top of the given
+    filters.
+
+    :param app: The loader app instance.
+    :param dict entity: Shotgun entity dictionary with keys type and id.
+    :param publish_types: Optional list of publish type names, e.g. ["Maya Scene"].
+                          All publish types are returned if not specified.
+    :param filters: Optional list of additional Shotgun filters.
+    :returns: List of Shotgun publish dictionaries, oldest first.
+    """
+    publish_entity_type = sgtk.util.get_published_file_entity_type(app.sgtk)
+    publish_type_field = get_publish_type_field(app)
+
+    sg_filters = get_entity_filters(entity)
+    sg_filters.extend(app.get_setting("publish_filters", []))
+    sg_filters.extend(filters or [])
+
+    if publish_types:
+        if publish_type_field == "published_file_type":
+            code_field = "published_file_type.PublishedFileType.code"
+        else:
+            code_field = "tank_type.TankType.code"
+        sg_filters.append([code_field, "in", list(publish_types)])
+
+    return app.shotgun.find(
+        publish_entity_type,
+        sg_filters,
+        [publish_type_field] + constants.PUBLISHED_FILES_FIELDS,
+        order=[{"field_name": "created_at", "direction": "asc"}],
+    )
+
+
+def filter_publishes(app, sg_data_list):
+    """
+    Filters a list of shotgun published files based on the filter_publishes
+    hook.
+
+    :param app:           app that has the hook.
+    :param sg_data_list:  list of shotgun dictionaries, as returned by the
+                          find() call.
+    :returns:             list of filtered shotgun dictionaries, same form as
+                          the input.
+    """
+    try:
+        # Constructing a wrapper dictionary so that it's future proof to
+        # support returning additional information from the hook
+        hook_publish_list = [{"sg_publish": sg_data} for sg_data in sg_data_list]
+
+        with hook_timing.get_hook_timings().span("filter_publishes"):
+            hook_publish_list = app.execute_hook(
+                "filter_publishes_hook", publishes=hook_publish_list
+            )
+        if not isinstance(hook_publish_list, list):
+            app.log_error(
+                "hook_filter_publishes returned an unexpected result type \
+                '%s' - ignoring!"
+                % type(hook_publish_list).__name__
+            )
+            hook_publish_list = []
+
+        # split back out publishes:
+        sg_data_list = []
+        for item in hook_publish_list:
+            sg_data = item.get("sg_publish")
+            if sg_data:
+                sg_data_list.append(sg_data)
+
+    except:
+        app.log_exception("Failed to execute 'filter_publishes_hook'!")
+        sg_data_list = []
+
+    return sg_data_list
+
+
+def get_latest_publishes(sg_data_list, publish_type_field):
+    """
+    Only keeps the latest version of each publish, grouped by name, type and task.
+    This relies on the publishes being sorted oldest first, as returned by
+    :func:`find_publishes`.
+
+    For example, if there are these publishes::
+
+        name FOO, version 1, task ANIM, type XXX
+        name FOO, version 2, task ANIM, type XXX
+        name FOO, version 3, task ANIM, type XXX
+        name FOO, version 1, task ANIM, type YYY
+        name FOO, version 2, task ANIM, type YYY
+        name FOO, version 5, task LAY,  type YYY
+        name FOO, version 6, task LAY,  type YYY
+        name FOO, version 7, task LAY,  type YYY
+
+    three items are kept:
+
+        - Foo v3 (type XXX)
+        - Foo v2 (type YYY, task ANIM)
+        - Foo v7 (type YYY, task LAY)
+
+    A ``task_uniqueness`` flag is also set on the publishes kept, which is False
+    if there are other publishes with the same name and type but a different task.
+
+    :param sg_data_list: List of Shotgun publish dictionaries.
+    :param publish_type_field: Field holding the publish type, see
+                               :func:`get_publish_type_field`.
+    :returns: List of the latest Shotgun publish dictionaries.
+    """
+    # FIRST PASS!
+    # get a dict with only the latest versions, grouped by type and task
+    unique_data = {}
+    name_type_aggregates = defaultdict(int)
+
+    for sg_item in sg_data_list:
+
+        # get the associated type
+        type_id = None
+        type_link = sg_item[publish_type_field]
+        if type_link:
+            type_id = type_link["id"]
+
+        # also get the associated task
+        task_id = None
+        task_link = sg_item["task"]
+        if task_link:
+            task_id = task_link["id"]
+
+        # key publishes in dict by type and name
+        unique_data[(sg_item["name"], type_id, task_id)] = (sg_item, type_id)
+
+        # count how many items of this type we have
+        name_type_aggregates[(sg_item["name"], type_id)] += 1
+
+    # SECOND PASS
+    # We now have the latest versions only, flag the ones which are not
+    # "task unique", e.g. if there are other items in the listing with the
+    # same name and same type but with a different task
+    latest_sg_data = []
+    for (sg_item, type_id) in unique_data.values():
+        if name_type_aggregates[(sg_item["name"], type_id)] > 1:
+            # there are more than one item with this same name/type combo!
+            sg_item["task_uniqueness"] = False
+        else:
+            # no other item with this task/name/type combo
+            sg_item["task_uniqueness"] = True
+        latest_sg_data.append(sg_item)
+
+    return latest_sg_data
@@ -0,0 +1,97 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Process wide cache of the pixmaps and icons built from the loader's resources.
+
+Resources are decoded the first time they are requested and then shared by all
+dialogs, models and delegates for the rest of the session. Qt pixmaps are
+implicitly shared, so handing out the same instance is cheap. Code which paints
+on top of a cached pixmap must work on a ``copy()`` of it.
+"""
+
+from sgtk.platform.qt import QtCore, QtGui
+
+from . import constants
+
+# resource path -> QPixmap
+_pixmaps = {}
+# resource path -> QIcon
+_icons = {}
+# resource path -> QIcon with all the thumbnail pyramid levels
+_pyramid_icons = {}
+
+
+def get_pixmap(path):
+    """
+    Returns the pixmap for a resource.
+
+    :param path: Resource path, e.g. ":/res/folder_512x400.png"
+    :returns: QPixmap
+    """
+    pixmap = _pixmaps.get(path)
+    if pixmap is None:
+        pixmap = QtGui.QPixmap(path)
+        _pixmaps[path] = pixmap
+    return pixmap
+
+
+def get_icon(path):
+    """
+    Returns an icon for a resource.
+
+    :param path: Resource path, e.g. ":/res/icon_Shot_dark.png"
+    :returns: QIcon
+    """
+    icon = _icons.get(path)
+    if icon is None:
+        icon = QtGui.QIcon(get_pixmap(path))
+        _icons[path] = icon
+    return icon
+
+
+def get_pyramid_icon(path):
+    """
+    Returns an icon for a resource holding the image at each of the
+    thumbnail pyramid levels, so that ``QIcon.pixmap()`` can return a level
+    close to the requested size without having to scale the full size image.
+
+    :param path: Resource path, e.g. ":/res/loading_512x400.png"
+    :returns: QIcon
+    """
+    icon = _pyramid_icons.get(path)
+    if icon is None:
+        icon = _create_pyramid_icon(get_pixmap(path))
+        _pyramid_icons[path] = icon
+    return icon
+
+
+def _create_pyramid_icon(pixmap):
+    """
+    Creates an icon holding a pixmap at each of the thumbnail pyramid levels.
+
+    :param pixmap: Full size QPixmap
+    :returns: QIcon
+    """
+    icon = QtGui.QIcon()
+    for level in constants.THUMBNAIL_PYRAMID_LEVELS:
+        height = int(round(pixmap.height() * float(level) / pixmap.width()))
+        if level >= pixmap.width():
+            icon.addPixmap(pixmap)
+            break
+        icon.addPixmap(
+            pixmap.scaled(
+                level,
+                height,
+                QtCore.Qt.IgnoreAspectRatio,
+                QtCore.Qt.SmoothTransformation,
+            )
+        )
+    return icon
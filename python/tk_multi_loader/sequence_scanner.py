@@ -0,0 +1,292 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Detection of image sequences and UDIM textures on disk, shared by the actions hooks.
+
+Paths are expected to contain a frame token in their file name, e.g.
+``render.%04d.exr``, ``render.####.exr``, ``render.@@@@.exr``, ``render.$F4.exr``,
+``texture.<UDIM>.tif``, ``texture.{UDIM}.tif`` or ``render.[1001-1100].exr``.
+
+Each folder is listed once and all the sequences it contains are indexed in
+the same pass. The index is cached until the modification time of the folder
+changes, so loading many publishes from the same folder only hits the disk once.
+
+Hooks access this module through the app, e.g.::
+
+    sequence_scanner = self.parent.import_module("tk_multi_loader").sequence_scanner
+    frame_range = sequence_scanner.get_frame_range(path)
+
+This module doesn't depend on Qt.
+"""
+
+import os
+import re
+import threading
+
+try:
+    from os import scandir as _scandir
+except ImportError:
+    # python 2
+    _scandir = None
+
+# matches a frame token in a file name. Only one of the groups is set.
+_FRAME_TOKEN_REGEX = re.compile(
+    r"%0?(?P<printf>\d*)d"
+    r"|(?P<hashes>#+)"
+    r"|(?P<ats>@+)"
+    r"|\$F(?P<houdini>\d*)"
+    r"|(?P<udim><UDIM>|\{UDIM\})"
+    r"|\[(?P<first>\d+)-(?P<last>\d+)\]"
+)
+
+# matches the runs of digits in a file name
+_DIGITS_REGEX = re.compile(r"\d+")
+
+
+class FramePattern(object):
+    """
+    Description of the frame token found in a file name.
+    """
+
+    def __init__(self, prefix, suffix, padding, first=None, last=None):
+        """
+        :param str prefix: Part of the file name before the frame token.
+        :param str suffix: Part of the file name after the frame token.
+        :param int padding: Number of digits of frame numbers, 0 if unknown.
+        :param int first: First frame allowed by the token, if it specifies a range.
+        :param int last: Last frame allowed by the token, if it specifies a range.
+        """
+        self.prefix = prefix
+        self.suffix = suffix
+        self.padding = padding
+        self.first = first
+        self.last = last
+
+    def format(self, frame):
+        """
+        Builds the file name of a frame.
+
+        :param int frame: Frame number.
+        :returns: File name.
+        """
+        return "%s%0*d%s" % (self.prefix, self.padding, frame, self.suffix)
+
+    def accepts(self, frame_str):
+        """
+        Checks if a run of digits found in a file name is a frame of this pattern.
+
+        :param str frame_str: Digits found where the frame token is.
+        :returns: True if the digits match the padding and range of the pattern.
+        """
+        if self.padding and len(frame_str) != self.padding:
+            # frame numbers can overflow their padding, e.g. 10000 for %04d
+            if len(frame_str) < self.padding or frame_str.startswith("0"):
+                return False
+        frame = int(frame_str)
+        if self.first is not None and not (self.first <= frame <= self.last):
+            return False
+        return True
+
+
+def parse_pattern(file_name):
+    """
+    Finds the frame token in a file name.
+
+    :param str file_name: File name, without its folder.
+    :returns: :class:`FramePattern` or None if the name has no frame token.
+    """
+    match = None
+    for match in _FRAME_TOKEN_REGEX.finditer(file_name):
+        pass
+    if match is None:
+        return None
+
+    prefix = file_name[: match.start()]
+    suffix = file_name[match.end() :]
+
+    if match.group("printf") is not None:
+        padding = int(match.group("printf") or 0)
+        return FramePattern(prefix, suffix, padding)
+    if match.group("hashes"):
+        return FramePattern(prefix, suffix, len(match.group("hashes")))
+    if match.group("ats"):
+        return FramePattern(prefix, suffix, len(match.group("ats")))
+    if match.group("houdini") is not None:
+        return FramePattern(prefix, suffix, int(match.group("houdini") or 0))
+    if match.group("udim"):
+        return FramePattern(prefix, suffix, 4)
+    first = match.group("first")
+    return FramePattern(
+        prefix, suffix, len(first), int(first), int(match.group("last"))
+    )
+
+
+class SequenceScanner(object):
+    """
+    Cache of the sequences found in folders on disk.
+    """
+
+    def __init__(self):
+        # folder -> (mtime, set of file names, {(prefix, suffix): [frame strings]})
+        self._folders = {}
+        # hooks may check paths from several threads at once
+        self._lock = threading.Lock()
+
+    def list_files(self, folder):
+        """
+        Returns the names of the files in a folder.
+
+        :param str folder: Path to a folder.
+        :returns: Frozen set of file names, empty if the folder can't be read.
+        """
+        return self._get_folder(folder)[0]
+
+    def find_frames(self, path):
+        """
+        Finds the frames of a sequence on disk.
+
+        :param str path: Path with a frame token in its file name.
+        :returns: Sorted list of (frame number, file path) tuples.
+                  Empty if the path has no frame token or no frames exist.
+        """
+        (folder, file_name) = os.path.split(path)
+        pattern = parse_pattern(file_name)
+        if pattern is None:
+            return []
+
+        sequences = self._get_folder(folder)[1]
+        frames = [
+            (
+                int(frame_str),
+                os.path.join(folder, pattern.prefix + frame_str + pattern.suffix),
+            )
+            for frame_str in sequences.get((pattern.prefix, pattern.suffix), [])
+            if pattern.accepts(frame_str)
+        ]
+        frames.sort()
+        return frames
+
+    def get_frame_range(self, path):
+        """
+        Determines the frame range of a sequence on disk.
+
+        :param str path: Path with a frame token in its file name.
+        :returns: (first, last) tuple or None if no frames exist.
+        """
+        frames = self.find_frames(path)
+        if not frames:
+            return None
+        return (frames[0][0], frames[-1][0])
+
+    def exists(self, path):
+        """
+        Checks if a path exists on disk, either as is or, if it has a frame
+        token, as a sequence with at least one frame.
+
+        :param str path: Path to check.
+        :returns: True if the file or at least one frame exists.
+        """
+        (folder, file_name) = os.path.split(path)
+        if file_name in self.list_files(folder):
+            return True
+        if parse_pattern(file_name) is None:
+            # folders and other paths the listing doesn't know about
+            return os.path.exists(path)
+        return len(self.find_frames(path)) > 0
+
+    def clear(self):
+        """
+        Discards all cached folder listings.
+        """
+        with self._lock:
+            self._folders = {}
+
+    def _get_folder(self, folder):
+        """
+        Returns the listing and sequence index of a folder,
+        scanning it if it isn't cached or has changed.
+
+        :param str folder: Path to a folder.
+        :returns: (file names, sequences) tuple.
+        """
+        try:
+            mtime = os.stat(folder).st_mtime
+        except OSError:
+            return (frozenset(), {})
+
+        with self._lock:
+            cached = self._folders.get(folder)
+        if cached is not None and cached[0] == mtime:
+            return cached[1:]
+
+        file_names = frozenset(self._scan(folder))
+
+        # index every run of digits of every file as a potential frame number, so
+        # that any sequence in the folder can be looked up without rescanning it.
+        sequences = {}
+        for file_name in file_names:
+            for match in _DIGITS_REGEX.finditer(file_name):
+                key = (file_name[: match.start()], file_name[match.end() :])
+                sequences.setdefault(key, []).append(match.group())
+
+        with self._lock:
+            self._folders[folder] = (mtime, file_names, sequences)
+        return (file_names, sequences)
+
+    @staticmethod
+    def _scan(folder):
+        """
+        Lists the files of a folder in a single pass.
+
+        :param str folder: Path to a folder.
+        :returns: List of file names.
+        """
+        try:
+            if _scandir is not None:
+                return [entry.name for entry in _scandir(folder) if entry.is_file()]
+            return [
+                name
+                for name in os.listdir(folder)
+                if os.path.isfile(os.path.join(folder, name))
+            ]
+        except OSError:
+            return []
+
+
+_scanner = SequenceScanner()
+
+
+def list_files(folder):
+    """
+    Returns the names of the files in a folder, see :meth:`SequenceScanner.list_files`.
+    """
+    return _scanner.list_files(folder)
+
+
+def find_frames(path):
+    """
+    Finds the frames of a sequence on disk, see :meth:`SequenceScanner.find_frames`.
+    """
+    return _scanner.find_frames(path)
+
+
+def get_frame_range(path):
+    """
+    Determines the frame range of a sequence, see :meth:`SequenceScanner.get_frame_range`.
+    """
+    return _scanner.get_frame_range(path)
+
+
+def exists(path):
+    """
+    Checks if a file or sequence exists, see :meth:`SequenceScanner.exists`.
+    """
+    return _scanner.exists(path)
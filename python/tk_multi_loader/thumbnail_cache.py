@@ -0,0 +1,332 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import hashlib
+
+import sgtk
+from sgtk.platform.qt import QtCore, QtGui
+
+from . import constants
+
+
+class CompositedThumbnailCache(object):
+    """
+    On-disk cache for composited thumbnails.
+
+    The raw thumbnails are cached by the shotgun utils framework, but the images
+    the loader builds on top of them (folder inlays, rounded publish canvases,
+    user avatar overlays) would otherwise have to be recomposited every time a
+    model is populated. This cache stores the final images as png files, keyed
+    by the kind of composite, its size and a content hash of the source
+    thumbnail(s), so a thumbnail that changes in Shotgun naturally gets a new
+    cache entry.
+
+    Whenever the total size of the cache grows past its limit, the least
+    recently used entries are removed until the cache fits again.
+    """
+
+    def __init__(self, cache_root, max_size):
+        """
+        :param cache_root: Folder where the composited images are stored.
+        :param max_size: Maximum total size of the cache, in bytes.
+        """
+        self._cache_root = cache_root
+        self._max_size = max_size
+        # (path, mtime, size) -> content hash of the source file
+        self._source_hashes = {}
+        # total size of the cache in bytes, computed on first write
+        self._total_size = None
+
+    def get_or_create(self, kind, source_paths, size, create_fn):
+        """
+        Returns a composited thumbnail, either from the cache or by calling
+        create_fn and storing its result in the cache.
+
+        :param kind: String identifying the type of composite, e.g. "folder".
+        :param source_paths: List of source thumbnail paths the composite is built from.
+                             Entries can be None for missing sources.
+        :param size: (width, height) tuple describing the size of the composite.
+        :param create_fn: Callable returning a QPixmap with the composited image.
+        :returns: QPixmap
+        """
+        cache_path = self._get_cache_path(kind, source_paths, size)
+
+        if cache_path:
+            pixmap = self._load(cache_path)
+            if pixmap is not None:
+                return pixmap
+
+        pixmap = create_fn()
+
+        if cache_path:
+            self._store(cache_path, pixmap)
+
+        return pixmap
+
+    def get_level(self, kind, source_paths, size, level, create_fn=None):
+        """
+        Returns a level of the pyramid of a composited thumbnail.
+
+        Every composited thumbnail is stored in the cache at each of the
+        sizes in ``constants.THUMBNAIL_PYRAMID_LEVELS``, so that views can
+        pick an image close to the size they draw at rather than scaling
+        the full size image down on every paint.
+
+        :param kind: String identifying the type of composite, e.g. "folder".
+        :param source_paths: List of source thumbnail paths the composite is built from.
+        :param size: (width, height) tuple describing the full size of the composite.
+        :param level: Pyramid level to return, as returned by :meth:`get_pyramid_level`.
+        :param create_fn: Callable returning a QPixmap with the full size composited
+                          image. If None, only cached images will be returned.
+        :returns: QPixmap or None if the image isn't cached and create_fn is None.
+        """
+        level_size = get_level_size(size, level)
+        cache_path = self._get_cache_path(kind, source_paths, level_size)
+        if cache_path:
+            pixmap = self._load(cache_path)
+            if pixmap is not None:
+                return pixmap
+
+        # the level is missing - build the entire pyramid from the full size composite
+        full_size_path = self._get_cache_path(kind, source_paths, size)
+        pixmap = self._load(full_size_path) if full_size_path else None
+        if pixmap is None:
+            if create_fn is None:
+                return None
+            pixmap = create_fn()
+            if full_size_path:
+                self._store(full_size_path, pixmap)
+
+        requested_pixmap = pixmap
+        for pyramid_level in constants.THUMBNAIL_PYRAMID_LEVELS:
+            (width, height) = get_level_size(size, pyramid_level)
+            if (width, height) == tuple(size):
+                # the full size image is already stored
+                level_pixmap = pixmap
+            else:
+                level_pixmap = pixmap.scaled(
+                    width,
+                    height,
+                    QtCore.Qt.IgnoreAspectRatio,
+                    QtCore.Qt.SmoothTransformation,
+                )
+                if full_size_path:
+                    self._store(
+                        self._get_cache_path(kind, source_paths, (width, height)),
+                        level_pixmap,
+                    )
+            if pyramid_level == level:
+                requested_pixmap = level_pixmap
+
+        return requested_pixmap
+
+    ############################################################################################
+    # private methods
+
+    def _get_cache_path(self, kind, source_paths, size):
+        """
+        Computes the location in the cache of a composited thumbnail.
+
+        :param kind: String identifying the type of composite.
+        :param source_paths: List of source thumbnail paths.
+        :param size: (width, height) tuple.
+        :returns: Path to the png file or None if the sources can't be hashed.
+        """
+        hashes = []
+        for source_path in source_paths:
+            if source_path is None:
+                hashes.append("none")
+                continue
+            source_hash = self._get_source_hash(source_path)
+            if source_hash is None:
+                return None
+            hashes.append(source_hash)
+
+        key = hashlib.sha1("_".join(hashes).encode("utf-8")).hexdigest()
+        file_name = "%s_%dx%d_%s.png" % (kind, size[0], size[1], key)
+
+        # spread entries across sub folders to keep directory listings small
+        return os.path.join(self._cache_root, key[:2], file_name)
+
+    def _get_source_hash(self, path):
+        """
+        Returns a content hash for a source thumbnail. Results are memoized
+        for as long as the file's modification time and size don't change.
+
+        :param path: Path to a source thumbnail.
+        :returns: Hex digest string or None if the file can't be read.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        memo_key = (path, stat.st_mtime, stat.st_size)
+        source_hash = self._source_hashes.get(memo_key)
+        if source_hash is None:
+            try:
+                with open(path, "rb") as fh:
+                    source_hash = hashlib.sha1(fh.read()).hexdigest()
+            except (IOError, OSError):
+                return None
+            self._source_hashes[memo_key] = source_hash
+
+        return source_hash
+
+    def _load(self, cache_path):
+        """
+        Loads a composited thumbnail from the cache.
+
+        :param cache_path: Path to the cached png file.
+        :returns: QPixmap or None if the entry doesn't exist or can't be read.
+        """
+        if not os.path.exists(cache_path):
+            return None
+
+        pixmap = QtGui.QPixmap(cache_path)
+        if pixmap.isNull():
+            return None
+
+        # bump the access time so that the eviction keeps recently used entries
+        try:
+            os.utime(cache_path, None)
+        except OSError:
+            pass
+
+        return pixmap
+
+    def _store(self, cache_path, pixmap):
+        """
+        Writes a composited thumbnail to the cache and evicts old entries
+        if the cache has grown past its limit.
+
+        :param cache_path: Path to the png file to write.
+        :param pixmap: QPixmap to store.
+        """
+        app = sgtk.platform.current_bundle()
+
+        folder = os.path.dirname(cache_path)
+        # write to a temp file first so that other sessions sharing
+        # the cache never pick up a half written image.
+        temp_path = "%s.%d.tmp" % (cache_path, os.getpid())
+        try:
+            if not os.path.exists(folder):
+                os.makedirs(folder)
+            if not pixmap.save(temp_path, "PNG"):
+                raise IOError("Could not write '%s'" % temp_path)
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            os.rename(temp_path, cache_path)
+            file_size = os.path.getsize(cache_path)
+        except (IOError, OSError) as e:
+            app.log_debug("Could not cache composited thumbnail: %s" % e)
+            return
+
+        if self._total_size is None:
+            self._total_size = self._compute_total_size()
+        else:
+            self._total_size += file_size
+
+        if self._total_size > self._max_size:
+            self._evict()
+
+    def _list_entries(self):
+        """
+        Lists all entries in the cache.
+
+        :returns: List of (atime, size, path) tuples.
+        """
+        entries = []
+        for folder, _, file_names in os.walk(self._cache_root):
+            for file_name in file_names:
+                path = os.path.join(folder, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((max(stat.st_atime, stat.st_mtime), stat.st_size, path))
+        return entries
+
+    def _compute_total_size(self):
+        """
+        :returns: Total size of the cache in bytes.
+        """
+        return sum(size for (_, size, _) in self._list_entries())
+
+    def _evict(self):
+        """
+        Removes the least recently used entries until the cache is back
+        under its limit, leaving some headroom so that we don't evict on
+        every single write.
+        """
+        app = sgtk.platform.current_bundle()
+
+        target_size = self._max_size * 0.8
+        entries = sorted(self._list_entries())
+        total_size = sum(size for (_, size, _) in entries)
+
+        for (_, size, path) in entries:
+            if total_size <= target_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+
+        app.log_debug(
+            "Evicted composited thumbnails, cache is now %d bytes." % total_size
+        )
+        self._total_size = total_size
+
+
+def get_pyramid_level(width):
+    """
+    Returns the pyramid level best suited for drawing a thumbnail at a given width,
+    e.g. the smallest level which is at least as wide as the requested width.
+
+    :param width: Width in pixels the thumbnail is drawn at.
+    :returns: Pyramid level, in pixels.
+    """
+    for level in constants.THUMBNAIL_PYRAMID_LEVELS:
+        if level >= width:
+            return level
+    return constants.THUMBNAIL_PYRAMID_LEVELS[-1]
+
+
+def get_level_size(size, level):
+    """
+    Computes the size of a pyramid level for a given full size image.
+
+    :param size: (width, height) tuple of the full size image.
+    :param level: Pyramid level, in pixels.
+    :returns: (width, height) tuple.
+    """
+    return (level, int(round(size[1] * float(level) / size[0])))
+
+
+_thumbnail_cache = None
+
+
+def get_thumbnail_cache():
+    """
+    Returns the composited thumbnail cache shared by all models in this session.
+
+    :returns: :class:`CompositedThumbnailCache` instance.
+    """
+    global _thumbnail_cache
+    if _thumbnail_cache is None:
+        app = sgtk.platform.current_bundle()
+        _thumbnail_cache = CompositedThumbnailCache(
+            os.path.join(app.cache_location, "composited_thumbnails"),
+            constants.COMPOSITED_THUMBNAIL_CACHE_SIZE,
+        )
+    return _thumbnail_cache
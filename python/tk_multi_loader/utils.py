@@ -11,6 +11,8 @@
 import sgtk
 from sgtk.platform.qt import QtCore, QtGui
 
+from . import resource_cache
+
 
 class ResizeEventFilter(QtCore.QObject):
     """
@@ -60,6 +62,146 @@ class ResizeEventFilter(QtCore.QObject):
         return False
 
 
+class VisibleRowsTracker(QtCore.QObject):
+    """
+    Utility and helper.
+
+    Keeps track of which rows of a list view are visible, or close
+    to being visible, and emits a visible_indexes_changed signal with
+    the corresponding indexes whenever this changes, e.g. when the view
+    is scrolled, resized or its contents change.
+
+    Indexes are emitted in priority order: first the rows which are
+    visible, then the rows below and finally the rows above the viewport,
+    within the given prefetch margin. If the view is backed by proxy
+    models, the indexes are translated into indexes of the source model.
+
+    You use it like this:
+
+    tracker = VisibleRowsTracker(self.ui.publish_view, 1.0, self)
+    tracker.visible_indexes_changed.connect(self.__on_visible_indexes_changed)
+    """
+
+    visible_indexes_changed = QtCore.Signal(object)
+
+    # delay in milliseconds used to coalesce updates while scrolling
+    _UPDATE_DELAY = 50
+
+    def __init__(self, view, prefetch_margin, parent):
+        """
+        :param view: QListView to track. Its model needs to be set.
+        :param prefetch_margin: Area above and below the viewport which is considered
+                                visible, expressed as a number of viewport heights.
+        :param parent: QT parent object
+        """
+        QtCore.QObject.__init__(self, parent)
+        self._view = view
+        self._prefetch_margin = prefetch_margin
+
+        self._update_timer = QtCore.QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(self._UPDATE_DELAY)
+        self._update_timer.timeout.connect(self._update)
+
+        scroll_bar = self._view.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self.schedule_update)
+        scroll_bar.rangeChanged.connect(self.schedule_update)
+
+        model = self._view.model()
+        model.rowsInserted.connect(self.schedule_update)
+        model.rowsRemoved.connect(self.schedule_update)
+        model.modelReset.connect(self.schedule_update)
+        model.layoutChanged.connect(self.schedule_update)
+
+        self._view.viewport().installEventFilter(self)
+
+    def schedule_update(self, *args):
+        """
+        Requests the visible rows to be recomputed. Calls are coalesced.
+        """
+        self._update_timer.start()
+
+    def eventFilter(self, obj, event):
+        """
+        Event filter implementation.
+        For information, see the QT docs:
+        http://doc.qt.io/qt-4.8/qobject.html#eventFilter
+
+        Schedules an update whenever the viewport is resized.
+
+        :param obj: The object that is being watched for events
+        :param event: Event object that the object has emitted
+        :returns: Always returns False to indicate that no events
+                  should ever be discarded by the filter.
+        """
+        if event.type() == QtCore.QEvent.Resize:
+            self.schedule_update()
+        return False
+
+    def _find_row(self, model, row_count, y, first):
+        """
+        Binary searches the rows of the view, relying on rows being
+        laid out from top to bottom in row order.
+
+        :param model: Model of the view.
+        :param row_count: Number of rows in the model.
+        :param y: Vertical position in viewport coordinates.
+        :param first: If True, returns the first row whose bottom edge is below y,
+                      otherwise returns the last row whose top edge is above y.
+        :returns: Row number.
+        """
+        low = 0
+        high = row_count - 1
+        while low < high:
+            if first:
+                middle = (low + high) // 2
+                rect = self._view.visualRect(model.index(middle, 0))
+                if rect.bottom() < y:
+                    low = middle + 1
+                else:
+                    high = middle
+            else:
+                middle = (low + high + 1) // 2
+                rect = self._view.visualRect(model.index(middle, 0))
+                if rect.top() > y:
+                    high = middle - 1
+                else:
+                    low = middle
+        return low
+
+    def _update(self):
+        """
+        Computes the visible rows and emits them.
+        """
+        model = self._view.model()
+        row_count = model.rowCount()
+        if row_count == 0:
+            self.visible_indexes_changed.emit([])
+            return
+
+        height = self._view.viewport().height()
+        margin = int(height * self._prefetch_margin)
+
+        first_visible = self._find_row(model, row_count, 0, True)
+        last_visible = self._find_row(model, row_count, height, False)
+        first_prefetch = self._find_row(model, row_count, -margin, True)
+        last_prefetch = self._find_row(model, row_count, height + margin, False)
+
+        rows = list(range(first_visible, last_visible + 1))
+        rows.extend(range(last_visible + 1, last_prefetch + 1))
+        rows.extend(range(first_visible - 1, first_prefetch - 1, -1))
+
+        indexes = []
+        for row in rows:
+            index = model.index(row, 0)
+            # translate into an index of the underlying model
+            while hasattr(index.model(), "mapToSource"):
+                index = index.model().mapToSource(index)
+            indexes.append(index)
+
+        self.visible_indexes_changed.emit(indexes)
+
+
 def create_overlayed_user_publish_thumbnail(publish_pixmap, user_pixmap):
     """
     Creates a sqaure 75x75 thumbnail with an optional overlayed pixmap.
@@ -131,7 +273,7 @@ def create_overlayed_folder_thumbnail(image):
     # looks like there are some pyside related memory issues here relating to
     # referencing a resource and then operating on it. Just to be sure, make
     # make a full copy of the resource before starting to manipulate.
-    base_image = QtGui.QPixmap(":/res/folder_512x400.png")
+    base_image = resource_cache.get_pixmap(":/res/folder_512x400.png").copy()
 
     # now attempt to load the image
     # pixmap will be a null pixmap if load fails
@@ -246,47 +388,6 @@ def create_overlayed_publish_thumbnail(image):
     return base_image
 
 
-def filter_publishes(app, sg_data_list):
-    """
-    Filters a list of shotgun published files based on the filter_publishes
-    hook.
-
-    :param app:           app that has the hook.
-    :param sg_data_list:  list of shotgun dictionaries, as returned by the
-                          find() call.
-    :returns:             list of filtered shotgun dictionaries, same form as
-                          the input.
-    """
-    try:
-        # Constructing a wrapper dictionary so that it's future proof to
-        # support returning additional information from the hook
-        hook_publish_list = [{"sg_publish": sg_data} for sg_data in sg_data_list]
-
-        hook_publish_list = app.execute_hook(
-            "filter_publishes_hook", publishes=hook_publish_list
-        )
-        if not isinstance(hook_publish_list, list):
-            app.log_error(
-                "hook_filter_publishes returned an unexpected result type \
-                '%s' - ignoring!"
-                % type(hook_publish_list).__name__
-            )
-            hook_publish_list = []
-
-        # split back out publishes:
-        sg_data_list = []
-        for item in hook_publish_list:
-            sg_data = item.get("sg_publish")
-            if sg_data:
-                sg_data_list.append(sg_data)
-
-    except:
-        app.log_exception("Failed to execute 'filter_publishes_hook'!")
-        sg_data_list = []
-
-    return sg_data_list
-
-
 def resolve_filters(filters):
     """
     When passed a list of filters, it will resolve strings found in the filters using the context.
@@ -0,0 +1,77 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+STUBS_DIR = os.path.join(TESTS_DIR, "stubs")
+HOOKS_DIR = os.path.join(os.path.dirname(TESTS_DIR), "hooks")
+PYTHON_DIR = os.path.join(os.path.dirname(TESTS_DIR), "python")
+
+
+@pytest.fixture
+def load_hook(monkeypatch):
+    """
+    Returns a function loading an actions hook module against the stand-in
+    modules of the stubs folder, e.g. ``load_hook("tk-maya_actions")``.
+
+    The modules the stubs stand in for are restored once the test is done.
+    """
+    stub_names = set(
+        os.path.splitext(name)[0]
+        for name in os.listdir(STUBS_DIR)
+        if not name.startswith(("_", "."))
+    )
+
+    def is_stubbed(module_name):
+        return module_name.split(".")[0] in stub_names
+
+    saved_modules = dict(
+        (name, module) for (name, module) in sys.modules.items() if is_stubbed(name)
+    )
+    for name in saved_modules:
+        del sys.modules[name]
+    monkeypatch.syspath_prepend(STUBS_DIR)
+
+    def load(hook_name):
+        spec = importlib.util.spec_from_file_location(
+            hook_name.replace("-", "_"), os.path.join(HOOKS_DIR, "%s.py" % hook_name)
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    yield load
+
+    for name in list(sys.modules):
+        if is_stubbed(name):
+            del sys.modules[name]
+    sys.modules.update(saved_modules)
+
+
+@pytest.fixture
+def loader(load_hook, monkeypatch):
+    """
+    Returns the tk_multi_loader package, imported against the stand-in modules of
+    the stubs folder. Its modules are imported afresh for every test, so that
+    module level state such as the hook timings doesn't leak between tests.
+    """
+    monkeypatch.syspath_prepend(PYTHON_DIR)
+    package = importlib.import_module("tk_multi_loader")
+
+    yield package
+
+    for name in list(sys.modules):
+        if name.split(".")[0] == "tk_multi_loader":
+            del sys.modules[name]
@@ -0,0 +1,191 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for the parts of the hou module used by the Houdini actions hook.
+
+The changes made to the scene are recorded in ``calls`` as (name, args) tuples,
+e.g. ("pressButton", ("/obj/body/body", "reload")). The pane tabs returned by
+``ui.paneTabs()`` are the ones listed in ``ui.pane_tabs``.
+"""
+
+import contextlib
+
+calls = []
+
+
+class OperationFailed(Exception):
+    pass
+
+
+class _NodeType(object):
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+
+class Parm(object):
+    def __init__(self, node, name):
+        self._node = node
+        self._name = name
+
+    def set(self, value):
+        self._node.parm_values[self._name] = value
+        calls.append(("set", (self._node.path(), self._name, value)))
+
+    def pressButton(self):
+        calls.append(("pressButton", (self._node.path(), self._name)))
+
+
+class Node(object):
+    def __init__(self, parent, node_type, name):
+        self._parent = parent
+        self._type = _NodeType(node_type)
+        self._name = name
+        self._children = []
+        self.parm_values = {}
+
+    def path(self):
+        if self._parent is None:
+            return "/" + self._name if self._name else "/"
+        return "%s/%s" % (self._parent.path().rstrip("/"), self._name)
+
+    def parent(self):
+        return self._parent
+
+    def type(self):
+        return self._type
+
+    def children(self):
+        return list(self._children)
+
+    def createNode(self, node_type, name):
+        node = Node(self, node_type, name)
+        self._children.append(node)
+        calls.append(("createNode", (node.path(),)))
+        if node_type == "geo":
+            # Houdini creates a default file sop in new geo nodes
+            Node(node, "file", "file1")._register()
+        return node
+
+    def _register(self):
+        self._parent._children.append(self)
+
+    def destroy(self):
+        self._parent._children.remove(self)
+
+    def parm(self, name):
+        return Parm(self, name)
+
+    def layoutChildren(self, items=()):
+        calls.append(("layoutChildren", (self.path(), [n.path() for n in items])))
+
+    def setSelected(self, on, clear_all_selected=False):
+        calls.append(("setSelected", (self.path(), on, clear_all_selected)))
+
+
+_root = None
+
+
+def node(path):
+    """
+    :param str path: Path of a node, e.g. "/obj/geo1".
+    :returns: The node at that path, None if there's none.
+    """
+    current = _root
+    for name in [name for name in path.split("/") if name]:
+        children = [c for c in current.children() if c._name == name]
+        if not children:
+            return None
+        current = children[0]
+    return current
+
+
+class undos(object):
+    @staticmethod
+    @contextlib.contextmanager
+    def group(label):
+        calls.append(("undos.group", (label,)))
+        yield
+        calls.append(("undos.group.end", (label,)))
+
+
+class updateMode(object):
+    AutoUpdate = "AutoUpdate"
+    Manual = "Manual"
+
+
+_update_mode = updateMode.AutoUpdate
+
+
+def updateModeSetting():
+    return _update_mode
+
+
+def setUpdateMode(mode):
+    global _update_mode
+    _update_mode = mode
+    calls.append(("setUpdateMode", (mode,)))
+
+
+class hipFile(object):
+    @staticmethod
+    def merge(path, **kwargs):
+        calls.append(("hipFile.merge", (path,)))
+
+
+class NetworkEditor(object):
+    """
+    Stand-in network pane tab, recording the network it is asked to show.
+    """
+
+    def __init__(self, pwd, current=True):
+        self._pwd = pwd
+        self._current = current
+
+    def pwd(self):
+        return self._pwd
+
+    def isCurrentTab(self):
+        return self._current
+
+    def cd(self, path):
+        self._pwd = node(path)
+        calls.append(("cd", (path,)))
+
+    def frameSelection(self):
+        calls.append(("frameSelection", (self._pwd.path(),)))
+
+
+class ui(object):
+    pane_tabs = []
+
+    @staticmethod
+    def paneTabs():
+        return list(ui.pane_tabs)
+
+
+def reset():
+    """
+    Creates an empty scene with the /obj and /img networks and forgets the
+    recorded calls and pane tabs.
+    """
+    global _root, _update_mode
+    _root = Node(None, "root", "")
+    Node(_root, "obj", "obj")._register()
+    Node(_root, "img", "img")._register()
+    _update_mode = updateMode.AutoUpdate
+    ui.pane_tabs = []
+    del calls[:]
+
+
+reset()
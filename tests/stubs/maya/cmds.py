@@ -0,0 +1,37 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for the maya.cmds module. Every command is recorded in ``calls`` as a
+(name, args, kwargs) tuple and returns the value registered in ``results``
+for its name, None by default.
+"""
+
+calls = []
+results = {}
+
+
+def __getattr__(name):
+    if name.startswith("__"):
+        raise AttributeError(name)
+
+    def command(*args, **kwargs):
+        calls.append((name, args, kwargs))
+        return results.get(name)
+
+    return command
+
+
+def reset():
+    """
+    Forgets the recorded calls and registered results.
+    """
+    del calls[:]
+    results.clear()
@@ -0,0 +1,104 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for the pymel.core module, with a minimal scene graph. The calls
+changing the scene are recorded in ``calls``.
+"""
+
+calls = []
+# path -> list of the nodes created when that path is referenced
+reference_nodes = {}
+
+
+class PyNode(object):
+    """
+    Stand-in for a pymel node.
+    """
+
+    def __init__(self, name, node_type="transform"):
+        """
+        :param name: Name of the node.
+        :param node_type: Maya type of the node.
+        """
+        self._name = name
+        self._node_type = node_type
+        self._parent = None
+
+    def __repr__(self):
+        return "<PyNode %s>" % self._name
+
+    def name(self):
+        return self._name
+
+    def nodeType(self):
+        return self._node_type
+
+    def getParent(self):
+        return self._parent
+
+    def setParent(self, parent):
+        calls.append(("setParent", self, parent))
+        self._parent = parent
+
+
+class FileReference(object):
+    """
+    Stand-in for a pymel file reference, created unloaded.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Path of the referenced file.
+        """
+        self.path = path
+        self.loaded = False
+
+    def load(self, **kwargs):
+        calls.append(("load", self.path, kwargs))
+        self.loaded = True
+
+    def nodes(self):
+        return list(reference_nodes.get(self.path, [])) if self.loaded else []
+
+
+def createReference(path, **kwargs):
+    """
+    Returns the nodes registered for the path in ``reference_nodes`` if
+    returnNewNodes is set, a :class:`FileReference` otherwise.
+    """
+    calls.append(("createReference", path, kwargs))
+    if kwargs.get("returnNewNodes"):
+        return list(reference_nodes.get(path, []))
+    file_reference = FileReference(path)
+    if kwargs.get("loadReferenceDepth") != "none":
+        file_reference.loaded = True
+    return file_reference
+
+
+def group(name, empty=False):
+    node = PyNode(name)
+    calls.append(("group", node))
+    return node
+
+
+def parent(nodes, parent_node):
+    nodes = list(nodes)
+    calls.append(("parent", nodes, parent_node))
+    for node in nodes:
+        node._parent = parent_node
+
+
+def reset():
+    """
+    Forgets the recorded calls and registered references.
+    """
+    del calls[:]
+    reference_nodes.clear()
@@ -0,0 +1,54 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for the parts of the Toolkit core API used by the actions hooks and the
+Qt-free loader modules, so that they can be exercised without a Toolkit installation.
+"""
+
+from . import platform
+from . import util
+
+
+class TankError(Exception):
+    pass
+
+
+class Hook(object):
+    """
+    Stand-in for the base class of all hooks.
+    """
+
+    def __init__(self, parent):
+        """
+        :param parent: The app the hook belongs to.
+        """
+        self.parent = parent
+
+    def load_framework(self, framework_instance_name):
+        """
+        :param framework_instance_name: Name of the framework.
+        :returns: The framework registered under that name on the parent app.
+        """
+        return self.parent.frameworks[framework_instance_name]
+
+    def get_publish_path(self, sg_publish_data):
+        """
+        :param sg_publish_data: Shotgun data dictionary of a publish.
+        :returns: The local path of the publish.
+        """
+        return sg_publish_data["path"]["local_path"]
+
+
+def get_hook_baseclass():
+    """
+    :returns: The base class of the hook being loaded.
+    """
+    return Hook
@@ -0,0 +1,50 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for the sgtk.platform module.
+"""
+
+_current_engine = None
+_current_bundle = None
+
+
+def current_engine():
+    """
+    :returns: The engine set through :func:`set_current_engine`.
+    """
+    return _current_engine
+
+
+def set_current_engine(engine):
+    """
+    Sets the engine returned by :func:`current_engine`.
+
+    :param engine: Engine stand-in, or None.
+    """
+    global _current_engine
+    _current_engine = engine
+
+
+def current_bundle():
+    """
+    :returns: The app set through :func:`set_current_bundle`.
+    """
+    return _current_bundle
+
+
+def set_current_bundle(bundle):
+    """
+    Sets the app returned by :func:`current_bundle`.
+
+    :param bundle: App stand-in, or None.
+    """
+    global _current_bundle
+    _current_bundle = bundle
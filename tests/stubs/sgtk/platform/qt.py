@@ -0,0 +1,67 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for the parts of Qt used by the composited thumbnail cache.
+
+Pixmaps don't hold any pixels, only their size. They are saved to disk as
+a "<width>x<height>" text file, so that cached images can be told apart.
+"""
+
+
+class QtCore(object):
+    class Qt(object):
+        IgnoreAspectRatio = "IgnoreAspectRatio"
+        SmoothTransformation = "SmoothTransformation"
+
+
+class QPixmap(object):
+    """
+    Stand-in pixmap. Every pixmap loaded from disk is recorded in ``loaded``.
+    """
+
+    loaded = []
+
+    def __init__(self, *args):
+        """
+        Creates a pixmap from a file, QPixmap(path), or of a given size,
+        QPixmap(width, height).
+        """
+        self._size = None
+        if len(args) == 2:
+            self._size = tuple(args)
+        elif args:
+            QPixmap.loaded.append(args[0])
+            try:
+                with open(args[0]) as fh:
+                    self._size = tuple(int(v) for v in fh.read().split("x"))
+            except (IOError, OSError, ValueError):
+                pass
+
+    def isNull(self):
+        return self._size is None
+
+    def width(self):
+        return self._size[0]
+
+    def height(self):
+        return self._size[1]
+
+    def scaled(self, width, height, aspect_ratio_mode, transform_mode):
+        return QPixmap(width, height)
+
+    def save(self, path, file_format):
+        with open(path, "w") as fh:
+            fh.write("%dx%d" % self._size)
+        return True
+
+
+class QtGui(object):
+    QPixmap = QPixmap
@@ -0,0 +1,30 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for the sgtk.util module.
+"""
+
+
+def resolve_publish_path(tk, sg_publish_data):
+    """
+    :param tk: Toolkit instance, unused.
+    :param sg_publish_data: Shotgun data dictionary of a publish.
+    :returns: The local path of the publish.
+    """
+    return sg_publish_data["path"]["local_path"]
+
+
+def get_published_file_entity_type(tk):
+    """
+    :param tk: Toolkit instance, unused.
+    :returns: "PublishedFile"
+    """
+    return "PublishedFile"
@@ -0,0 +1,28 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for the six module vendored by Toolkit, for Python 3 only.
+"""
+
+
+def ensure_str(s, encoding="utf-8", errors="strict"):
+    if isinstance(s, bytes):
+        return s.decode(encoding, errors)
+    return s
+
+
+ensure_text = ensure_str
+
+
+def ensure_binary(s, encoding="utf-8", errors="strict"):
+    if isinstance(s, str):
+        return s.encode(encoding, errors)
+    return s
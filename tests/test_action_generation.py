@@ -0,0 +1,190 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Tests of the generation of action definitions through the actions hook.
+"""
+
+import importlib
+
+import pytest
+
+
+class ActionsHook(object):
+    """
+    Actions hook offering the actions it is given, except "import" for
+    publishes without any file.
+    """
+
+    def generate_actions(self, sg_publish_data, actions, ui_area):
+        return [
+            {"name": name, "params": sg_publish_data["name"]}
+            for name in actions
+            if name != "import" or sg_publish_data.get("path")
+        ]
+
+
+class MultipleActionsHook(ActionsHook):
+    """
+    Actions hook generating the actions of all publishes at once.
+    """
+
+    def generate_actions_multiple(self, sg_publish_data_list, actions, ui_area):
+        return [
+            self.generate_actions(sg_data, actions, ui_area)
+            for sg_data in sg_publish_data_list
+        ]
+
+
+class FakeApp(object):
+    """
+    Stand-in for the loader app, running the actions hook and recording the
+    hook methods called.
+    """
+
+    def __init__(self, hook):
+        self.hook = hook
+        self.calls = []
+
+    def get_setting(self, name):
+        return {"actions_hook": "actions_hook", "slow_hook_threshold": 0}[name]
+
+    def create_hook_instance(self, hook_expression):
+        return self.hook
+
+    def execute_hook_method(self, hook_name, method_name, **kwargs):
+        self.calls.append((method_name, kwargs))
+        return getattr(self.hook, method_name)(**kwargs)
+
+
+@pytest.fixture
+def sgtk(loader):
+    return importlib.import_module("sgtk")
+
+
+@pytest.fixture
+def action_generation(loader):
+    return loader.action_generation
+
+
+@pytest.fixture
+def make_app(sgtk):
+    """
+    Returns a function creating an app running a given hook, which is set as
+    the current bundle for the hook timings.
+    """
+
+    def make(hook):
+        app = FakeApp(hook)
+        sgtk.platform.set_current_bundle(app)
+        return app
+
+    return make
+
+
+def _publishes():
+    return [
+        {"name": "body", "path": {"local_path": "/caches/body.abc"}},
+        {"name": "notes", "path": None},
+        {"name": "head", "path": {"local_path": "/caches/head.abc"}},
+    ]
+
+
+def test_generate_actions_of_each_publish(make_app, action_generation):
+    """
+    Hooks without generate_actions_multiple are called once per publish, so
+    that each publish gets its own actions.
+    """
+    app = make_app(ActionsHook())
+    sg_data_list = _publishes()
+
+    action_defs_list = action_generation.generate_actions(
+        app, "Alembic Cache", sg_data_list, ("reference", "import"), "main"
+    )
+
+    assert action_defs_list == [
+        [
+            {"name": "reference", "params": "body"},
+            {"name": "import", "params": "body"},
+        ],
+        [{"name": "reference", "params": "notes"}],
+        [
+            {"name": "reference", "params": "head"},
+            {"name": "import", "params": "head"},
+        ],
+    ]
+    assert [
+        (method_name, kwargs["sg_publish_data"]["name"])
+        for (method_name, kwargs) in app.calls
+    ] == [
+        ("generate_actions", "body"),
+        ("generate_actions", "notes"),
+        ("generate_actions", "head"),
+    ]
+
+
+def test_generate_actions_multiple(make_app, action_generation):
+    """
+    Hooks implementing generate_actions_multiple get all the publishes at once.
+    """
+    hook = MultipleActionsHook()
+    app = make_app(hook)
+    sg_data_list = _publishes()
+
+    action_defs_list = action_generation.generate_actions(
+        app, "Alembic Cache", sg_data_list, ("reference", "import"), "main", hook
+    )
+
+    assert action_defs_list == [
+        hook.generate_actions(sg_data, ("reference", "import"), "main")
+        for sg_data in sg_data_list
+    ]
+    assert app.calls == [
+        (
+            "generate_actions_multiple",
+            {
+                "sg_publish_data_list": sg_data_list,
+                "actions": ["reference", "import"],
+                "ui_area": "main",
+            },
+        )
+    ]
+
+
+def test_generate_actions_multiple_result_mismatch(sgtk, make_app, action_generation):
+    class BrokenHook(MultipleActionsHook):
+        def generate_actions_multiple(self, sg_publish_data_list, actions, ui_area):
+            return [[]]
+
+    app = make_app(BrokenHook())
+
+    with pytest.raises(sgtk.TankError):
+        action_generation.generate_actions(
+            app, "Alembic Cache", _publishes(), ("reference",), "main"
+        )
+
+
+def test_generate_actions_without_publishes(make_app, action_generation):
+    app = make_app(ActionsHook())
+    assert (
+        action_generation.generate_actions(app, "Alembic Cache", [], (), "main") == []
+    )
+    assert app.calls == []
+
+
+def test_generate_actions_records_timings(loader, make_app, action_generation):
+    app = make_app(ActionsHook())
+
+    action_generation.generate_actions(
+        app, "Alembic Cache", _publishes(), ("reference",), "main"
+    )
+
+    summary = loader.hook_timing.get_hook_timings().get_summary()
+    assert summary.startswith("generate_actions (Alembic Cache): 3 calls")
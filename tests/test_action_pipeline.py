@@ -0,0 +1,289 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Tests of the pipeline running the actions triggered from the loader.
+"""
+
+import os
+
+import pytest
+
+
+class FakeApp(object):
+    """
+    Stand-in for the loader app, recording the exceptions it logs.
+    """
+
+    sgtk = None
+
+    def __init__(self):
+        self.exceptions = []
+
+    def log_debug(self, msg):
+        pass
+
+    def log_exception(self, msg):
+        self.exceptions.append(msg)
+
+
+@pytest.fixture
+def action_pipeline(loader):
+    return loader.action_pipeline
+
+
+def _action(name, path=None):
+    sg_data = {"name": name, "path": {"local_path": path} if path else None}
+    return {"name": "import", "sg_publish_data": sg_data, "params": None}
+
+
+def _names(actions):
+    return [action["sg_publish_data"]["name"] for action in actions]
+
+
+def _existing_file(tmpdir, file_name):
+    path = os.path.join(str(tmpdir), file_name)
+    open(path, "w").close()
+    return path
+
+
+def test_missing_files_are_skipped(action_pipeline, tmpdir):
+    """
+    Actions on publishes whose file is missing are skipped, while sequences,
+    stereo and udim paths, which never exist on disk as is, are kept.
+    """
+    folder = str(tmpdir)
+    actions = [
+        _action("scene", _existing_file(tmpdir, "scene.ma")),
+        _action("missing", os.path.join(folder, "missing.ma")),
+        _action("render", os.path.join(folder, "render.%04d.exr")),
+        _action("hashes", os.path.join(folder, "render.####.exr")),
+        _action("stereo", os.path.join(folder, "render_%V.%04d.exr")),
+        _action("stereo_lower", os.path.join(folder, "render_%v.exr")),
+        _action("udim", os.path.join(folder, "texture.<UDIM>.tif")),
+        _action("mari_udim", os.path.join(folder, "texture.{UDIM}.tif")),
+        _action("uvtile", os.path.join(folder, "texture.<UVTILE>.tif")),
+        _action("houdini", os.path.join(folder, "render.$F4.exr")),
+        _action("folder"),
+    ]
+    executed = []
+
+    pipeline = action_pipeline.ActionPipeline(FakeApp(), actions, num_threads=4)
+    assert pipeline.run(executed.extend) == len(actions) - 1
+
+    assert _names(executed) == [
+        "scene",
+        "render",
+        "hashes",
+        "stereo",
+        "stereo_lower",
+        "udim",
+        "mari_udim",
+        "uvtile",
+        "houdini",
+        "folder",
+    ]
+    assert [
+        (action["sg_publish_data"]["name"], reason)
+        for (action, reason) in pipeline.failures
+    ] == [("missing", "File not found: %s" % os.path.join(folder, "missing.ma"))]
+    # the resolved paths are handed to the hook
+    assert executed[0]["path"] == os.path.join(folder, "scene.ma")
+    assert "path" not in executed[-1]
+
+
+def test_single_action_is_not_checked(action_pipeline, tmpdir):
+    """
+    A single action is handed to the hook as is, so that it reports any issue itself.
+    """
+    actions = [_action("missing", os.path.join(str(tmpdir), "missing.ma"))]
+    executed = []
+
+    pipeline = action_pipeline.ActionPipeline(FakeApp(), actions)
+    assert pipeline.run(executed.extend) == 1
+
+    assert executed == actions
+    assert pipeline.failures == []
+
+
+def test_run_in_batches(action_pipeline, tmpdir):
+    """
+    Actions are handed to the hook in batches and the progress reported by the
+    hook within a batch is reported for all the actions, skipped ones included.
+    """
+    actions = [_action("missing", os.path.join(str(tmpdir), "missing.ma"))] + [
+        _action(name, _existing_file(tmpdir, "%s.ma" % name))
+        for name in ("a", "b", "c", "d", "e")
+    ]
+    batches = []
+    progress = []
+    pipeline = action_pipeline.ActionPipeline(FakeApp(), actions, batch_size=2)
+
+    def execute(batch):
+        batches.append(_names(batch))
+        for index in range(len(batch)):
+            pipeline.report_progress(index, len(batch))
+
+    executed = pipeline.run(execute, lambda *args: progress.append(args))
+
+    assert executed == 5
+    assert batches == [["a", "b"], ["c", "d"], ["e"]]
+    assert progress == [
+        (1, 6, "a"),
+        (1, 6, "a"),
+        (2, 6, "b"),
+        (3, 6, "c"),
+        (3, 6, "c"),
+        (4, 6, "d"),
+        (5, 6, "e"),
+        (5, 6, "e"),
+        (6, 6, None),
+    ]
+
+
+def test_progress_in_hook_units(action_pipeline):
+    """
+    Progress reported by hooks in their own units is scaled to the batch.
+    """
+    actions = [_action(name) for name in ("a", "b", "c", "d")]
+    progress = []
+    pipeline = action_pipeline.ActionPipeline(FakeApp(), actions)
+
+    def execute(batch):
+        pipeline.report_progress(50, 100, "half way")
+
+    pipeline.run(execute, lambda *args: progress.append(args))
+
+    assert progress == [(0, 4, "a"), (2, 4, "half way"), (4, 4, None)]
+
+
+def test_cancel_stops_the_hook(action_pipeline):
+    """
+    Once cancelled, the hook is stopped the next time it reports progress and
+    the remaining batches are skipped, even with a single batch.
+    """
+    actions = [_action(name) for name in ("a", "b", "c", "d", "e")]
+    loaded = []
+    pipeline = action_pipeline.ActionPipeline(FakeApp(), actions)
+
+    def execute(batch):
+        for (index, action) in enumerate(batch):
+            pipeline.report_progress(index, len(batch))
+            loaded.append(action["sg_publish_data"]["name"])
+            if len(loaded) == 2:
+                pipeline.cancel()
+
+    assert pipeline.run(execute) == 2
+    assert loaded == ["a", "b"]
+    assert pipeline.cancelled
+
+
+def test_cancel_from_progress_callback(action_pipeline):
+    actions = [_action(name) for name in ("a", "b", "c", "d")]
+    batches = []
+    pipeline = action_pipeline.ActionPipeline(FakeApp(), actions, batch_size=2)
+
+    def progress(processed, total, item_name):
+        if processed == 2:
+            pipeline.cancel()
+
+    def execute(batch):
+        batches.append(_names(batch))
+        pipeline.report_progress(len(batch), len(batch))
+
+    assert pipeline.run(execute, progress) == 2
+    assert batches == [["a", "b"]]
+
+
+def test_iter_run(action_pipeline, tmpdir):
+    """
+    The outcome of each action is yielded, missing files included, and a
+    failing batch doesn't stop the next ones. The actions the hook reported as
+    processed before failing are considered loaded.
+    """
+    folder = str(tmpdir)
+    actions = [
+        _action("a", _existing_file(tmpdir, "a.ma")),
+        _action("missing", os.path.join(folder, "missing.ma")),
+        _action("b", _existing_file(tmpdir, "b.ma")),
+        _action("broken", _existing_file(tmpdir, "broken.ma")),
+        _action("c", _existing_file(tmpdir, "c.ma")),
+        _action("d", os.path.join(folder, "texture.<UDIM>.tif")),
+        _action("e", os.path.join(folder, "render_%V.exr")),
+    ]
+    app = FakeApp()
+    pipeline = action_pipeline.ActionPipeline(app, actions, batch_size=4)
+
+    def execute(batch):
+        for (index, action) in enumerate(batch):
+            if action["sg_publish_data"]["name"] == "broken":
+                raise Exception("Broken publish")
+            pipeline.report_progress(index + 1, len(batch))
+
+    results = [
+        (action["sg_publish_data"]["name"], error)
+        for (action, error) in pipeline.iter_run(execute)
+    ]
+
+    assert results == [
+        ("missing", "File not found: %s" % os.path.join(folder, "missing.ma")),
+        ("a", None),
+        ("b", None),
+        ("broken", "Broken publish"),
+        ("c", None),
+        ("d", None),
+        ("e", None),
+    ]
+    assert [
+        (action["sg_publish_data"]["name"], reason)
+        for (action, reason) in pipeline.failures
+    ] == [results[0], results[3]]
+    assert len(app.exceptions) == 1
+
+
+def test_iter_run_without_progress(action_pipeline):
+    """
+    If the hook fails without reporting any progress, the error is reported
+    for all the actions of the batch.
+    """
+    actions = [_action(name) for name in ("a", "b")]
+
+    def execute(batch):
+        raise Exception("Hook error")
+
+    pipeline = action_pipeline.ActionPipeline(FakeApp(), actions)
+    assert [error for (_, error) in pipeline.iter_run(execute)] == [
+        "Hook error",
+        "Hook error",
+    ]
+
+
+def test_iter_run_cancel(action_pipeline):
+    actions = [_action(name) for name in ("a", "b", "c", "d", "e")]
+    pipeline = action_pipeline.ActionPipeline(FakeApp(), actions, batch_size=3)
+
+    def execute(batch):
+        for index in range(len(batch)):
+            pipeline.report_progress(index, len(batch))
+            if index == 0:
+                pipeline.cancel()
+
+    results = [
+        (action["sg_publish_data"]["name"], error)
+        for (action, error) in pipeline.iter_run(execute)
+    ]
+
+    # the hook was stopped when reporting the progress of the second action,
+    # and the second batch was skipped
+    assert results == [
+        ("a", None),
+        ("b", "The actions were cancelled."),
+        ("c", "The actions were cancelled."),
+    ]
@@ -0,0 +1,279 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Tests of the loading of publishes without any UI.
+"""
+
+import importlib
+import os
+
+import pytest
+
+PUBLISH_TYPE_IDS = {"Alembic Cache": 1, "Image": 2, "Text": 3}
+
+
+class ActionsHook(object):
+    """
+    Actions hook offering the configured actions and recording the publishes
+    it loads. Loading a publish named "broken" fails.
+    """
+
+    def __init__(self, app):
+        self.parent = app
+        self.loaded = []
+
+    def generate_actions(self, sg_publish_data, actions, ui_area):
+        return [{"name": name, "params": None} for name in actions]
+
+    def execute_multiple_actions(self, actions):
+        for (index, action) in enumerate(actions):
+            self.parent.report_action_progress(index, len(actions))
+            sg_data = action["sg_publish_data"]
+            if sg_data["name"] == "broken":
+                raise Exception("Broken publish")
+            self.loaded.append((action["name"], sg_data["name"], action.get("path")))
+
+
+class FakeShotgun(object):
+    """
+    Stand-in Shotgun connection returning the same publishes for any query.
+    """
+
+    def __init__(self, publishes):
+        self.publishes = publishes
+        self.queries = []
+
+    def find(self, entity_type, filters, fields, order=None):
+        self.queries.append((entity_type, filters))
+        return [dict(sg_data) for sg_data in self.publishes]
+
+
+class FakeApp(object):
+    """
+    Stand-in for the loader app, running its hooks in process.
+    """
+
+    sgtk = None
+
+    def __init__(self, publishes, action_mappings):
+        self.shotgun = FakeShotgun(publishes)
+        self.settings = {
+            "action_mappings": action_mappings,
+            "entity_mappings": {},
+            "publish_filters": [["sg_status_list", "is_not", "omt"]],
+            "slow_hook_threshold": 0,
+            "actions_hook": "actions_hook",
+        }
+        self.hook = ActionsHook(self)
+        self.progress_handler = None
+
+    def get_setting(self, name, default=None):
+        return self.settings.get(name, default)
+
+    def execute_hook(self, hook_name, publishes):
+        return publishes
+
+    def create_hook_instance(self, hook_expression):
+        return self.hook
+
+    def execute_hook_method(self, hook_name, method_name, **kwargs):
+        return getattr(self.hook, method_name)(**kwargs)
+
+    def set_action_progress_handler(self, handler):
+        self.progress_handler = handler
+
+    def report_action_progress(self, processed, total, item_name=None):
+        if self.progress_handler:
+            self.progress_handler(processed, total, item_name)
+
+    def log_debug(self, msg):
+        pass
+
+    def log_exception(self, msg):
+        pass
+
+
+@pytest.fixture
+def batch_load(loader):
+    return loader.batch_load
+
+
+@pytest.fixture
+def make_app(loader):
+    """
+    Returns a function creating an app returning the given publishes, which is
+    set as the current bundle for the hook timings.
+    """
+    sgtk = importlib.import_module("sgtk")
+
+    def make(publishes, action_mappings):
+        app = FakeApp(publishes, action_mappings)
+        sgtk.platform.set_current_bundle(app)
+        return app
+
+    return make
+
+
+def _publish(name, publish_type, version_number=1, path=None):
+    return {
+        "name": name,
+        "version_number": version_number,
+        "published_file_type": {
+            "id": PUBLISH_TYPE_IDS[publish_type],
+            "name": publish_type,
+        },
+        "task": None,
+        "path": {"local_path": path} if path else None,
+    }
+
+
+def _existing_file(tmpdir, file_name):
+    path = os.path.join(str(tmpdir), file_name)
+    open(path, "w").close()
+    return path
+
+
+def _results(results):
+    return [(sg_data["name"], error) for (sg_data, error) in results]
+
+
+def test_load_latest_publishes(batch_load, make_app, tmpdir):
+    """
+    The latest version of each publish is loaded with the first action
+    configured for its type, and publishes which can't be loaded are reported.
+    """
+    folder = str(tmpdir)
+    body_v2 = _existing_file(tmpdir, "body.v002.abc")
+    plate = os.path.join(folder, "plate.%04d.exr")
+    missing = os.path.join(folder, "missing.abc")
+    app = make_app(
+        [
+            _publish("body", "Alembic Cache", 1, _existing_file(tmpdir, "body.abc")),
+            _publish("plate", "Image", 1, plate),
+            _publish("notes", "Text", 1),
+            _publish("body", "Alembic Cache", 2, body_v2),
+            _publish("missing", "Alembic Cache", 1, missing),
+        ],
+        {"Alembic Cache": ["reference", "import"], "Image": ["read_node"]},
+    )
+
+    results = list(
+        batch_load.load_latest_publishes(
+            app, {"type": "Shot", "id": 1234}, filters=[["code", "is", "foo"]]
+        )
+    )
+
+    assert _results(results) == [
+        ("notes", "No action configured for Text publishes."),
+        ("missing", "File not found: %s" % missing),
+        ("body", None),
+        ("plate", None),
+    ]
+    assert results[2][0]["version_number"] == 2
+    assert app.hook.loaded == [
+        ("reference", "body", body_v2),
+        ("read_node", "plate", plate),
+    ]
+    assert app.shotgun.queries == [
+        (
+            "PublishedFile",
+            [
+                ["entity", "is", {"type": "Shot", "id": 1234}],
+                ["sg_status_list", "is_not", "omt"],
+                ["code", "is", "foo"],
+            ],
+        )
+    ]
+    assert app.progress_handler is None
+
+
+def test_load_with_action_name(batch_load, make_app, tmpdir):
+    app = make_app(
+        [
+            _publish("body", "Alembic Cache", 1, _existing_file(tmpdir, "body.abc")),
+            _publish("plate", "Image", 1, _existing_file(tmpdir, "plate.exr")),
+        ],
+        {"Alembic Cache": ["reference", "import"], "Image": ["read_node"]},
+    )
+
+    results = list(
+        batch_load.load_latest_publishes(
+            app, {"type": "Task", "id": 1}, ["Alembic Cache", "Image"], "import"
+        )
+    )
+
+    assert _results(results) == [
+        ("plate", "No action configured for Image publishes."),
+        ("body", None),
+    ]
+    assert [name for (name, _, _) in app.hook.loaded] == ["import"]
+    assert app.shotgun.queries[0][1] == [
+        ["task", "is", {"type": "Task", "id": 1}],
+        ["sg_status_list", "is_not", "omt"],
+        [
+            "published_file_type.PublishedFileType.code",
+            "in",
+            ["Alembic Cache", "Image"],
+        ],
+    ]
+
+
+def test_hook_failing_midway(batch_load, make_app):
+    """
+    The publishes the hook loaded before failing are reported as loaded, the
+    error is reported for the other ones and the next batches are still loaded.
+    """
+    app = make_app(
+        [
+            _publish(name, "Alembic Cache")
+            for name in ("body", "head", "broken", "arms", "legs")
+        ],
+        {"Alembic Cache": ["reference"]},
+    )
+
+    results = batch_load.load_latest_publishes(
+        app, {"type": "Shot", "id": 1}, batch_size=4
+    )
+
+    assert _results(results) == [
+        ("body", None),
+        ("head", None),
+        ("broken", "Broken publish"),
+        ("arms", "Broken publish"),
+        ("legs", None),
+    ]
+    assert [name for (_, name, _) in app.hook.loaded] == ["body", "head", "legs"]
+    assert app.progress_handler is None
+
+
+def test_generate_actions_failing(batch_load, make_app):
+    """
+    If the actions of a publish type can't be generated, the error is reported
+    for its publishes and the publishes of the other types are still loaded.
+    """
+    app = make_app(
+        [_publish("body", "Alembic Cache"), _publish("plate", "Image")],
+        {"Alembic Cache": ["reference"], "Image": ["read_node"]},
+    )
+
+    def generate_actions(sg_publish_data, actions, ui_area):
+        if "read_node" in actions:
+            raise Exception("Unknown action")
+        return [{"name": name, "params": None} for name in actions]
+
+    app.hook.generate_actions = generate_actions
+
+    results = batch_load.load_latest_publishes(app, {"type": "Shot", "id": 1})
+
+    assert _results(results) == [
+        ("plate", "Could not retrieve the actions: Unknown action"),
+        ("body", None),
+    ]
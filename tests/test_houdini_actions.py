@@ -0,0 +1,188 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Tests of the Houdini actions hook, run against the stand-in hou and sgtk
+modules of the stubs folder.
+"""
+
+import importlib
+
+import pytest
+
+
+class FakeApp(object):
+    """
+    Stand-in for the loader app, recording the progress reported by the hook.
+    """
+
+    def __init__(self):
+        self.progress = []
+
+    def report_action_progress(self, processed, total, item_name=None):
+        self.progress.append((processed, total))
+
+    def log_debug(self, msg):
+        pass
+
+
+@pytest.fixture
+def houdini_hook(load_hook):
+    """
+    Returns the Houdini actions hook module, loaded against the stubs, with the
+    stand-in hou module as its ``hou`` attribute since the hook imports it
+    within its functions.
+    """
+    module = load_hook("tk-houdini_actions")
+    module.hou = importlib.import_module("hou")
+    module.hou.reset()
+    return module
+
+
+def _publish(name, path):
+    return {"name": name, "path": {"local_path": path}}
+
+
+def _call_names(hou):
+    return [name for (name, _) in hou.calls]
+
+
+def test_load_several_publishes(houdini_hook):
+    """
+    Actions run through execute_action in the order they were given, in one
+    undo group with cooking held, and the new nodes are laid out and reloaded
+    once they have all been created.
+    """
+    hou = houdini_hook.hou
+    executed = []
+
+    class RecordingActions(houdini_hook.HoudiniActions):
+        def execute_action(self, name, params, sg_publish_data):
+            executed.append((name, sg_publish_data["name"]))
+            return super(RecordingActions, self).execute_action(
+                name, params, sg_publish_data
+            )
+
+    app = FakeApp()
+    hook = RecordingActions(app)
+    hook.execute_multiple_actions(
+        [
+            {
+                "name": "import",
+                "sg_publish_data": _publish("body", "/caches/body.abc"),
+                "params": None,
+            },
+            {
+                "name": "file_cop",
+                "sg_publish_data": _publish("plate", "/plates/plate.%04d.exr"),
+                "params": None,
+            },
+            {
+                "name": "import",
+                "sg_publish_data": _publish("head", "/caches/head.abc"),
+                "params": None,
+            },
+        ]
+    )
+
+    assert executed == [("import", "body"), ("file_cop", "plate"), ("import", "head")]
+    assert app.progress == [(0, 3), (1, 3), (2, 3)]
+
+    call_names = _call_names(hou)
+    assert call_names.count("undos.group") == 1
+    assert [args for (name, args) in hou.calls if name == "setUpdateMode"] == [
+        ("Manual",),
+        ("AutoUpdate",),
+    ]
+
+    # each network is laid out once, with all its new nodes
+    assert [args for (name, args) in hou.calls if name == "layoutChildren"] == [
+        ("/obj", ["/obj/body", "/obj/head"]),
+        ("/img", ["/img/plate"]),
+    ]
+
+    # every node is reloaded once, after all of them were created
+    reloads = [args for (name, args) in hou.calls if name == "pressButton"]
+    assert reloads == [
+        ("/obj/body/body", "reload"),
+        ("/img/plate", "reload"),
+        ("/obj/head/head", "reload"),
+    ]
+    first_reload = call_names.index("pressButton")
+    assert first_reload > max(
+        index for (index, name) in enumerate(call_names) if name == "createNode"
+    )
+    # and once cooking is resumed
+    assert first_reload > max(
+        index for (index, name) in enumerate(call_names) if name == "setUpdateMode"
+    )
+    assert hook._deferred_nodes is None
+
+
+def test_failing_action_still_updates_created_nodes(houdini_hook):
+    """
+    If an action raises midway, cooking is resumed and the nodes created so
+    far are still laid out and reloaded.
+    """
+    hou = houdini_hook.hou
+
+    class FailingActions(houdini_hook.HoudiniActions):
+        def execute_action(self, name, params, sg_publish_data):
+            if sg_publish_data["name"] == "broken":
+                raise Exception("Broken publish")
+            return super(FailingActions, self).execute_action(
+                name, params, sg_publish_data
+            )
+
+    hook = FailingActions(FakeApp())
+    with pytest.raises(Exception, match="Broken publish"):
+        hook.execute_multiple_actions(
+            [
+                {
+                    "name": "import",
+                    "sg_publish_data": _publish(name, "/caches/%s.abc" % name),
+                    "params": None,
+                }
+                for name in ("body", "broken", "head")
+            ]
+        )
+
+    assert hou.updateModeSetting() == hou.updateMode.AutoUpdate
+    assert [args for (name, args) in hou.calls if name == "layoutChildren"] == [
+        ("/obj", ["/obj/body"]),
+    ]
+    assert [args for (name, args) in hou.calls if name == "pressButton"] == [
+        ("/obj/body/body", "reload"),
+    ]
+    assert hook._deferred_nodes is None
+
+
+def test_show_nodes_of_framed_network(houdini_hook):
+    """
+    Only the nodes of the network shown in the network pane are selected.
+    """
+    hou = houdini_hook.hou
+    img = hou.node("/img")
+    comp1 = img.createNode("img", "comp1")
+    comp2 = img.createNode("img", "comp2")
+    first = comp1.createNode("file", "first")
+    second = comp2.createNode("file", "second")
+    third = comp2.createNode("file", "third")
+    hou.ui.pane_tabs = [hou.NetworkEditor(comp1)]
+    del hou.calls[:]
+
+    houdini_hook._show_nodes([first, second, third])
+
+    assert [args for (name, args) in hou.calls if name == "setSelected"] == [
+        ("/img/comp2/second", True, True),
+        ("/img/comp2/third", True, False),
+    ]
+    assert [args for (name, args) in hou.calls if name == "cd"] == [("/img/comp2",)]
+    assert _call_names(hou)[-1] == "frameSelection"
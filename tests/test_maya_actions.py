@@ -0,0 +1,294 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Tests of the Maya actions hook, run against the stand-in maya, pymel and
+sgtk modules of the stubs folder.
+"""
+
+import platform
+
+import pytest
+
+PROJECT = {"type": "Project", "id": 1}
+OTHER_PROJECT = {"type": "Project", "id": 2}
+NODE_ENTITY_TYPE = "CustomEntity05"
+UPSTREAM_FIELD = "custom_entity05_sg_upstream_node_dependency_custom_entity05s"
+PATH_FIELD = "local_path_%s" % platform.system().lower()
+
+
+class FakeShotgun(object):
+    """
+    Stand-in Shotgun connection answering find() from a list of entities.
+    Only the "is" and "in" filter operators are supported.
+    """
+
+    def __init__(self, entities):
+        """
+        :param entities: Dictionary of entity type -> list of entity dictionaries.
+        """
+        self._entities = entities
+        self.find_calls = []
+
+    def find(self, entity_type, filters, fields=None, order=None):
+        self.find_calls.append((entity_type, filters))
+        return [
+            entity
+            for entity in self._entities.get(entity_type, [])
+            if all(self._matches(entity, f) for f in filters)
+        ]
+
+    @staticmethod
+    def _matches(entity, sg_filter):
+        (field, operator, value) = sg_filter
+        values = value if operator == "in" else [value]
+        return any(_same_value(entity.get(field), v) for v in values)
+
+
+def _same_value(a, b):
+    if isinstance(a, dict) and isinstance(b, dict):
+        return (a.get("type"), a.get("id")) == (b.get("type"), b.get("id"))
+    return a == b
+
+
+class FakeContext(object):
+    def __init__(self, step_name="Lighting"):
+        self.project = PROJECT
+        self.entity = {"type": "Shot", "id": 100}
+        self.step = {"type": "Step", "id": 7, "name": step_name}
+
+
+class FakeEngine(object):
+    def __init__(self, shotgun, context):
+        self.shotgun = shotgun
+        self.context = context
+
+
+class FakeApp(object):
+    """
+    Stand-in for the loader app, recording the progress reported by the hook.
+    """
+
+    def __init__(self, frameworks=None):
+        self.frameworks = frameworks or {}
+        self.progress = []
+        self.logger = self
+
+    def report_action_progress(self, processed, total, item_name=None):
+        self.progress.append((processed, total))
+
+    def log_debug(self, msg):
+        pass
+
+    def warning(self, msg):
+        pass
+
+
+class FakeAttribute(object):
+    def __init__(self, value):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+
+class FakeShaderIter(object):
+    """
+    Stand-in for the shader iterator of the consulado utils framework,
+    recording the shaders it was asked to apply.
+    """
+
+    applied = []
+
+    def __init__(self, local_data):
+        self._local_data = local_data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def apply(self):
+        FakeShaderIter.applied.append(self._local_data)
+
+
+class FakeConsuladoUtils(object):
+    """
+    Stand-in for the consulado utils framework.
+    """
+
+    class shotgun_globals(object):
+        @staticmethod
+        def get_custom_entity_by_alias(alias):
+            return NODE_ENTITY_TYPE
+
+    class maya_utils(object):
+        MayaAsset = list
+        ShaderIter = FakeShaderIter
+
+    def import_module(self, name):
+        return getattr(self, name)
+
+
+@pytest.fixture
+def maya_hook(load_hook):
+    """
+    Returns the Maya actions hook module, loaded against the stubs.
+    """
+    module = load_hook("tk-maya_actions")
+    FakeShaderIter.applied = []
+    yield module
+    module.sgtk.platform.set_current_engine(None)
+
+
+def _geo_node(pm, name, node_id):
+    node = pm.PyNode(name)
+    node.cNodeId = FakeAttribute(node_id)
+    return node
+
+
+def _shader_publish(publish_id, entity_id, version_number, path, project=PROJECT):
+    return {
+        "type": "PublishedFile",
+        "id": publish_id,
+        "project": project,
+        "entity": {"type": "Asset", "id": entity_id},
+        "published_file_type": {"type": "PublishedFileType", "id": 135},
+        "version_number": version_number,
+        "path": {PATH_FIELD: path},
+    }
+
+
+def test_import_shaders_in_bulk(maya_hook):
+    """
+    Shader nodes and publishes are fetched with one query each, only from the
+    current project, and the latest shader of each upstream node is applied.
+    """
+    pm = maya_hook.pm
+    body = _geo_node(pm, "body", 1)
+    head = _geo_node(pm, "head", 2)
+    hat = _geo_node(pm, "hat", 2)
+    shape = pm.PyNode("bodyShape", "mesh")
+
+    shotgun = FakeShotgun(
+        {
+            NODE_ENTITY_TYPE: [
+                {
+                    "type": NODE_ENTITY_TYPE,
+                    "id": 1,
+                    UPSTREAM_FIELD: [{"type": "Asset", "id": 10}],
+                },
+                {
+                    "type": NODE_ENTITY_TYPE,
+                    "id": 2,
+                    UPSTREAM_FIELD: [{"type": "Asset", "id": 20}],
+                },
+            ],
+            "PublishedFile": [
+                _shader_publish(101, 10, 1, "/shaders/body_v001"),
+                _shader_publish(102, 10, 2, "/shaders/body_v002"),
+                _shader_publish(201, 20, 1, "/shaders/head_v001"),
+                # a more recent shader published in another project is ignored
+                _shader_publish(202, 20, 5, "/other/head_v005", OTHER_PROJECT),
+            ],
+        }
+    )
+    maya_hook.sgtk.platform.set_current_engine(FakeEngine(shotgun, FakeContext()))
+    hook = maya_hook.MayaActions(
+        FakeApp({"tk-framework-consuladoutils_v0.x.x": FakeConsuladoUtils()})
+    )
+
+    hook._check_and_import_shaders({"reference": [[body, shape], [head, hat]]})
+
+    assert [entity_type for (entity_type, _) in shotgun.find_calls] == [
+        NODE_ENTITY_TYPE,
+        "PublishedFile",
+    ]
+    (_, publish_filters) = shotgun.find_calls[1]
+    assert ["project", "is", PROJECT] in publish_filters
+
+    assert FakeShaderIter.applied == [
+        {"/shaders/body_v002.ma": [body], "/shaders/head_v001.ma": [head, hat],}
+    ]
+
+
+def test_reference_several_publishes(maya_hook, tmp_path):
+    """
+    Actions run through execute_action in the order they were given, with the
+    viewport refresh suspended. The references are created unloaded, then loaded
+    in one pass and grouped for the lighting step.
+    """
+    pm = maya_hook.pm
+    cmds = maya_hook.cmds
+    pm.reset()
+    cmds.reset()
+
+    publishes = []
+    for name in ("body", "texture", "head"):
+        path = tmp_path / ("%s.ma" % name)
+        path.write_text(u"")
+        publishes.append({"name": name, "path": {"local_path": str(path)}})
+    (body, texture, head) = publishes
+    body_geo = _geo_node(pm, "body_geo", None)
+    head_geo = _geo_node(pm, "head_geo", None)
+    pm.reference_nodes[body["path"]["local_path"]] = [body_geo]
+    pm.reference_nodes[head["path"]["local_path"]] = [head_geo]
+
+    maya_hook.sgtk.platform.set_current_engine(
+        FakeEngine(FakeShotgun({}), FakeContext())
+    )
+    executed = []
+
+    class RecordingActions(maya_hook.MayaActions):
+        def execute_action(self, name, params, sg_publish_data):
+            executed.append((name, sg_publish_data["name"]))
+            return super(RecordingActions, self).execute_action(
+                name, params, sg_publish_data
+            )
+
+    app = FakeApp({"tk-framework-consuladoutils_v0.x.x": FakeConsuladoUtils()})
+    hook = RecordingActions(app)
+    hook.execute_multiple_actions(
+        [
+            {"name": "reference", "sg_publish_data": body, "params": None},
+            {"name": "texture_node", "sg_publish_data": texture, "params": None},
+            {"name": "reference", "sg_publish_data": head, "params": None},
+        ]
+    )
+
+    assert executed == [
+        ("reference", "body"),
+        ("texture_node", "texture"),
+        ("reference", "head"),
+    ]
+    assert app.progress == [(0, 3), (1, 3), (2, 3)]
+
+    refresh_calls = [kwargs for (name, _, kwargs) in cmds.calls if name == "refresh"]
+    assert refresh_calls == [{"suspend": True}, {"suspend": False}]
+
+    # both references were created unloaded, then loaded before any group
+    created = [call for call in pm.calls if call[0] == "createReference"]
+    assert [kwargs["loadReferenceDepth"] for (_, _, kwargs) in created] == [
+        "none",
+        "none",
+    ]
+    call_names = [call[0] for call in pm.calls]
+    last_created = max(
+        index for (index, name) in enumerate(call_names) if name == "createReference"
+    )
+    loads = [index for (index, name) in enumerate(call_names) if name == "load"]
+    assert len(loads) == 2
+    assert last_created < min(loads)
+    assert call_names.index("group") > max(loads)
+    assert body_geo.getParent().name() == "render"
+    assert head_geo.getParent().name() == "render"
+    assert body_geo.getParent() is not head_geo.getParent()
+    assert hook._deferred_references is None
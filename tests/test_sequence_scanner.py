@@ -0,0 +1,150 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Tests of the detection of image sequences and UDIM textures on disk.
+"""
+
+import os
+
+import pytest
+
+
+@pytest.fixture
+def scanner(loader):
+    """
+    Returns a new sequence scanner, so that no folder listing is cached.
+    """
+    return loader.sequence_scanner.SequenceScanner()
+
+
+def _touch(folder, *file_names):
+    for file_name in file_names:
+        open(os.path.join(str(folder), file_name), "w").close()
+
+
+def _frames(frames):
+    return [frame for (frame, _) in frames]
+
+
+@pytest.mark.parametrize(
+    "file_name,prefix,suffix,padding,frame_range",
+    [
+        ("render.%04d.exr", "render.", ".exr", 4, (None, None)),
+        ("render.%d.exr", "render.", ".exr", 0, (None, None)),
+        ("render.####.exr", "render.", ".exr", 4, (None, None)),
+        ("render.@@@.exr", "render.", ".exr", 3, (None, None)),
+        ("render.$F4.exr", "render.", ".exr", 4, (None, None)),
+        ("texture.<UDIM>.tif", "texture.", ".tif", 4, (None, None)),
+        ("texture.{UDIM}.tif", "texture.", ".tif", 4, (None, None)),
+        ("render.[1001-1100].exr", "render.", ".exr", 4, (1001, 1100)),
+        # only the last token of the name is the frame token
+        ("v%03d_render.%04d.exr", "v%03d_render.", ".exr", 4, (None, None)),
+    ],
+)
+def test_parse_pattern(loader, file_name, prefix, suffix, padding, frame_range):
+    pattern = loader.sequence_scanner.parse_pattern(file_name)
+    assert (pattern.prefix, pattern.suffix, pattern.padding) == (
+        prefix,
+        suffix,
+        padding,
+    )
+    assert (pattern.first, pattern.last) == frame_range
+
+
+def test_parse_pattern_without_token(loader):
+    assert loader.sequence_scanner.parse_pattern("render.1001.exr") is None
+
+
+def test_find_frames(scanner, tmpdir):
+    """
+    Only the files matching the prefix, suffix and padding of the pattern are
+    frames of the sequence, and frame numbers can overflow their padding.
+    """
+    _touch(
+        tmpdir,
+        "render.1002.exr",
+        "render.1001.exr",
+        "render.10000.exr",
+        "render.001.exr",
+        "render.1001.jpg",
+        "other.1001.exr",
+    )
+    path = os.path.join(str(tmpdir), "render.%04d.exr")
+
+    frames = scanner.find_frames(path)
+
+    assert frames == [
+        (1001, os.path.join(str(tmpdir), "render.1001.exr")),
+        (1002, os.path.join(str(tmpdir), "render.1002.exr")),
+        (10000, os.path.join(str(tmpdir), "render.10000.exr")),
+    ]
+    assert scanner.get_frame_range(path) == (1001, 10000)
+
+
+def test_find_frames_of_frame_range_token(scanner, tmpdir):
+    _touch(tmpdir, "render.0999.exr", "render.1001.exr", "render.1101.exr")
+    path = os.path.join(str(tmpdir), "render.[1001-1100].exr")
+    assert _frames(scanner.find_frames(path)) == [1001]
+
+
+def test_find_udim_tiles(scanner, tmpdir):
+    _touch(tmpdir, "texture.1001.tif", "texture.1012.tif", "texture.1001.tx")
+    path = os.path.join(str(tmpdir), "texture.<UDIM>.tif")
+    assert _frames(scanner.find_frames(path)) == [1001, 1012]
+
+
+def test_missing_sequence(scanner, tmpdir):
+    path = os.path.join(str(tmpdir), "render.####.exr")
+    assert scanner.find_frames(path) == []
+    assert scanner.get_frame_range(path) is None
+    # folders which don't exist
+    path = os.path.join(str(tmpdir), "missing", "render.####.exr")
+    assert scanner.find_frames(path) == []
+
+
+def test_exists(scanner, tmpdir):
+    _touch(tmpdir, "scene.ma", "render.1001.exr")
+    folder = str(tmpdir)
+
+    assert scanner.exists(os.path.join(folder, "scene.ma"))
+    assert not scanner.exists(os.path.join(folder, "missing.ma"))
+    assert scanner.exists(os.path.join(folder, "render.%04d.exr"))
+    assert not scanner.exists(os.path.join(folder, "render.%04d.jpg"))
+    # folders aren't part of the listing but do exist
+    tmpdir.mkdir("textures")
+    assert scanner.exists(os.path.join(folder, "textures"))
+
+
+def test_listing_is_cached_until_the_folder_changes(scanner, tmpdir):
+    """
+    Folders are listed once, and listed again when their modification time changes.
+    """
+    _touch(tmpdir, "render.1001.exr")
+    folder = str(tmpdir)
+    path = os.path.join(folder, "render.%04d.exr")
+    os.utime(folder, (1000, 1000))
+
+    assert scanner.get_frame_range(path) == (1001, 1001)
+    assert scanner.list_files(folder) == frozenset(["render.1001.exr"])
+
+    # a file added without the modification time changing isn't seen
+    _touch(tmpdir, "render.1002.exr")
+    os.utime(folder, (1000, 1000))
+    assert scanner.get_frame_range(path) == (1001, 1001)
+
+    os.utime(folder, (2000, 2000))
+    assert scanner.get_frame_range(path) == (1001, 1002)
+
+    # clearing the cache forces a new listing
+    _touch(tmpdir, "render.1003.exr")
+    os.utime(folder, (2000, 2000))
+    scanner.clear()
+    assert scanner.get_frame_range(path) == (1001, 1003)
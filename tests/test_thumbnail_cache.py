@@ -0,0 +1,211 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Tests of the on-disk cache of composited thumbnails, run against the stand-in
+Qt module of the stubs folder.
+"""
+
+import importlib
+import os
+
+import pytest
+
+
+class FakeApp(object):
+    """
+    Stand-in for the loader app.
+    """
+
+    def __init__(self, cache_location):
+        self.cache_location = cache_location
+
+    def log_debug(self, msg):
+        pass
+
+
+@pytest.fixture
+def thumbnail_cache(loader, tmpdir):
+    """
+    Returns the thumbnail cache module, with an app caching into a temporary
+    folder set as the current bundle.
+    """
+    sgtk = importlib.import_module("sgtk")
+    sgtk.platform.set_current_bundle(FakeApp(str(tmpdir.mkdir("cache"))))
+    return importlib.import_module("tk_multi_loader.thumbnail_cache")
+
+
+@pytest.fixture
+def qt(thumbnail_cache):
+    return importlib.import_module("sgtk.platform.qt")
+
+
+class Compositor(object):
+    """
+    Callable creating composited thumbnails of a given size, counting how
+    many were created.
+    """
+
+    def __init__(self, qt, size):
+        self._qt = qt
+        self._size = size
+        self.count = 0
+
+    def __call__(self):
+        self.count += 1
+        return self._qt.QtGui.QPixmap(*self._size)
+
+
+def _source(tmpdir, file_name, content):
+    path = os.path.join(str(tmpdir), file_name)
+    with open(path, "w") as fh:
+        fh.write(content)
+    return path
+
+
+def _cached_files(cache_root):
+    return sorted(
+        file_name
+        for (_, _, file_names) in os.walk(cache_root)
+        for file_name in file_names
+    )
+
+
+@pytest.mark.parametrize(
+    "width,level", [(1, 64), (64, 64), (65, 128), (300, 512), (2048, 512)]
+)
+def test_get_pyramid_level(thumbnail_cache, width, level):
+    assert thumbnail_cache.get_pyramid_level(width) == level
+
+
+def test_get_level_size(thumbnail_cache):
+    assert thumbnail_cache.get_level_size((512, 400), 128) == (128, 100)
+    assert thumbnail_cache.get_level_size((512, 400), 512) == (512, 400)
+    assert thumbnail_cache.get_level_size((300, 100), 64) == (64, 21)
+
+
+def test_get_or_create(thumbnail_cache, qt, tmpdir):
+    """
+    Composited thumbnails are created once and read back from disk afterwards,
+    also by other sessions.
+    """
+    cache_root = str(tmpdir.join("composited"))
+    source = _source(tmpdir, "thumb.png", "thumbnail")
+    create = Compositor(qt, (512, 400))
+
+    cache = thumbnail_cache.CompositedThumbnailCache(cache_root, 1024)
+    pixmap = cache.get_or_create("folder", [source, None], (512, 400), create)
+    assert (pixmap.width(), pixmap.height()) == (512, 400)
+    assert create.count == 1
+    assert len(_cached_files(cache_root)) == 1
+
+    pixmap = cache.get_or_create("folder", [source, None], (512, 400), create)
+    other_session_cache = thumbnail_cache.CompositedThumbnailCache(cache_root, 1024)
+    other_pixmap = other_session_cache.get_or_create(
+        "folder", [source, None], (512, 400), create
+    )
+    assert create.count == 1
+    assert (other_pixmap.width(), other_pixmap.height()) == (512, 400)
+    assert len(qt.QPixmap.loaded) == 2
+
+    # other kinds of composites and sizes are cached separately
+    cache.get_or_create("publish", [source, None], (512, 400), create)
+    cache.get_or_create("folder", [source, None], (256, 200), create)
+    assert create.count == 3
+    assert len(_cached_files(cache_root)) == 3
+
+
+def test_source_change(thumbnail_cache, qt, tmpdir):
+    """
+    A source thumbnail changing gets a new cache entry, while unreadable
+    sources are never cached.
+    """
+    cache_root = str(tmpdir.join("composited"))
+    source = _source(tmpdir, "thumb.png", "thumbnail")
+    create = Compositor(qt, (512, 400))
+    cache = thumbnail_cache.CompositedThumbnailCache(cache_root, 1024)
+
+    cache.get_or_create("folder", [source], (512, 400), create)
+    _source(tmpdir, "thumb.png", "new thumbnail")
+    cache.get_or_create("folder", [source], (512, 400), create)
+    cache.get_or_create("folder", [source], (512, 400), create)
+    assert create.count == 2
+    assert len(_cached_files(cache_root)) == 2
+
+    missing = os.path.join(str(tmpdir), "missing.png")
+    cache.get_or_create("folder", [missing], (512, 400), create)
+    cache.get_or_create("folder", [missing], (512, 400), create)
+    assert create.count == 4
+    assert len(_cached_files(cache_root)) == 2
+
+
+def test_get_level(thumbnail_cache, qt, tmpdir):
+    """
+    Requesting a level stores the whole pyramid, so that all the levels can
+    then be read back without compositing the image again.
+    """
+    cache_root = str(tmpdir.join("composited"))
+    source = _source(tmpdir, "thumb.png", "thumbnail")
+    create = Compositor(qt, (512, 400))
+    cache = thumbnail_cache.CompositedThumbnailCache(cache_root, 1024 * 1024)
+
+    assert cache.get_level("folder", [source], (512, 400), 128) is None
+
+    pixmap = cache.get_level("folder", [source], (512, 400), 128, create)
+    assert (pixmap.width(), pixmap.height()) == (128, 100)
+    assert create.count == 1
+    assert len(_cached_files(cache_root)) == 4
+
+    for (level, size) in [(64, (64, 50)), (256, (256, 200)), (512, (512, 400))]:
+        pixmap = cache.get_level("folder", [source], (512, 400), level)
+        assert (pixmap.width(), pixmap.height()) == size
+
+    # the full size composite is reused if a level goes missing
+    os.remove(cache._get_cache_path("folder", [source], (64, 50)))
+    pixmap = cache.get_level("folder", [source], (512, 400), 64, create)
+    assert (pixmap.width(), pixmap.height()) == (64, 50)
+    assert create.count == 1
+
+
+def test_eviction(thumbnail_cache, qt, tmpdir):
+    """
+    The least recently used entries are removed when the cache grows past its limit.
+    """
+    cache_root = str(tmpdir.join("composited"))
+    sources = [
+        _source(tmpdir, "%s.png" % name, name) for name in ("old", "recent", "new")
+    ]
+    create = Compositor(qt, (512, 400))
+    # each entry takes 7 bytes, "512x400"
+    cache = thumbnail_cache.CompositedThumbnailCache(cache_root, 20)
+
+    cache_paths = []
+    for (index, source) in enumerate(sources):
+        cache.get_or_create("folder", [source], (512, 400), create)
+        cache_path = cache._get_cache_path("folder", [source], (512, 400))
+        cache_paths.append(cache_path)
+        os.utime(cache_path, (1000 * (index + 1), 1000 * (index + 1)))
+
+    assert [os.path.exists(path) for path in cache_paths] == [False, True, True]
+
+    # reading an entry makes it recent
+    os.utime(cache_paths[1], (1000, 1000))
+    cache.get_or_create("folder", [sources[1]], (512, 400), create)
+    cache.get_or_create("folder", [sources[0]], (512, 400), create)
+    assert [os.path.exists(path) for path in cache_paths] == [True, True, False]
+
+
+def test_get_thumbnail_cache(thumbnail_cache, qt, tmpdir):
+    cache = thumbnail_cache.get_thumbnail_cache()
+    assert cache is thumbnail_cache.get_thumbnail_cache()
+
+    source = _source(tmpdir, "thumb.png", "thumbnail")
+    cache.get_or_create("folder", [source], (512, 400), Compositor(qt, (512, 400)))
+    assert len(_cached_files(str(tmpdir.join("cache", "composited_thumbnails")))) == 1